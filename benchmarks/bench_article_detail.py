@@ -0,0 +1,38 @@
+# ABOUTME: Regression benchmark for article detail prev/next navigation.
+# ABOUTME: Usage: python benchmarks/bench_article_detail.py --articles 500000
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from common import build_database, run, time_routes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Article detail latency benchmark")
+    parser.add_argument("--articles", type=int, default=500_000)
+    parser.add_argument("--content-bytes", type=int, default=800)
+    parser.add_argument("--requests", type=int, default=30)
+    parser.add_argument("--db", type=Path, default=None, help="Reuse an existing database")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = args.db or Path(tmp) / "bench.db"
+        if args.db is None:
+            started = time.perf_counter()
+            build_database(db_path, args.articles, content_bytes=args.content_bytes)
+            print(f"built {args.articles} articles in {time.perf_counter() - started:.1f}s")
+
+        middle = args.articles // 2
+        routes = {
+            "article_detail": f"/article/{middle}",
+            "article_detail_high": f"/article/{middle}?tier=high",
+        }
+        results = run(time_routes(db_path, routes, args.requests))
+        print(json.dumps({"articles": args.articles, "routes": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
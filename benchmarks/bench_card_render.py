@@ -0,0 +1,81 @@
+# ABOUTME: Benchmark of feed card load + render cost: full ArticleView vs slim ArticleRow path.
+# ABOUTME: Usage: python benchmarks/bench_card_render.py --articles 20000 --per-page 50 200
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from common import build_database
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+
+
+async def _bench(db_path: Path, per_pages: list[int], repeats: int) -> dict:
+    os.environ["DB_PATH"] = str(db_path)
+    from feed_brain.config import get_settings
+
+    get_settings.cache_clear()
+    from feed_brain.db.models import Article
+    from feed_brain.db.queries import keyset_page
+    from feed_brain.db.session import close_db, get_read_session_factory, init_db
+    from feed_brain.web.app import create_app
+    from feed_brain.web.routes import _article_to_view, _feed_page_context
+
+    await init_db()
+    template = create_app().state.templates.get_template("partials/article_page.html")
+
+    async def full_views(per_page: int) -> str:
+        # The pre-ArticleRow path: whole ORM rows, then pydantic views
+        query = keyset_page(select(Article).options(joinedload(Article.source)), None, per_page)
+        async with get_read_session_factory()() as session:
+            rows = (await session.execute(query)).scalars().all()[:per_page]
+            articles = [_article_to_view(article) for article in rows]
+        return template.render(articles=articles, filter_query="", more_url=None)
+
+    async def slim_rows(per_page: int) -> str:
+        context = await _feed_page_context(None, None, None, per_page)
+        return template.render(**context)
+
+    results = {}
+    for per_page in per_pages:
+        for name, render in (("article_view", full_views), ("article_row", slim_rows)):
+            await render(per_page)  # warm up
+            timings = []
+            for _ in range(repeats):
+                started = time.perf_counter()
+                await render(per_page)
+                timings.append(time.perf_counter() - started)
+            tracemalloc.start()
+            await render(per_page)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            results[f"{name}_per_page_{per_page}"] = {
+                "p50_ms": round(statistics.median(timings) * 1000, 2),
+                "peak_kb": round(peak / 1024),
+            }
+    await close_db()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Feed card render benchmark")
+    parser.add_argument("--articles", type=int, default=20_000)
+    parser.add_argument("--per-page", type=int, nargs="+", default=[50, 200])
+    parser.add_argument("--repeats", type=int, default=30)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+        build_database(db_path, args.articles, content_bytes=2000)
+        results = asyncio.run(_bench(db_path, args.per_page, args.repeats))
+        print(json.dumps({"articles": args.articles, "render": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# ABOUTME: Benchmark for compressed article body storage: DB size, write throughput, read latency.
+# ABOUTME: Usage: python benchmarks/bench_content_storage.py --articles 50000 [--dictionary]
+
+import argparse
+import json
+import shutil
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from common import _paragraphs, build_database, run, time_routes
+
+from feed_brain.db import compression
+
+
+def _write_throughput(path: Path, bodies: list[str], compressed: bool) -> float:
+    """Bodies per second inserted into a scratch table, including compression."""
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE scratch (id INTEGER PRIMARY KEY, content BLOB)")
+    started = time.perf_counter()
+    conn.executemany(
+        "INSERT INTO scratch (id, content) VALUES (?, ?)",
+        [(i, compression.compress(body) if compressed else body) for i, body in enumerate(bodies)],
+    )
+    conn.commit()
+    elapsed = time.perf_counter() - started
+    conn.execute("DROP TABLE scratch")
+    conn.close()
+    return round(len(bodies) / elapsed)
+
+
+async def _compress(db_path: Path, dictionary: bool) -> None:
+    import os
+
+    os.environ["DB_PATH"] = str(db_path)
+    from feed_brain.config import get_settings
+
+    get_settings.cache_clear()
+    from feed_brain.db.session import close_db, get_engine, get_session_factory, init_db
+    from feed_brain.services.archive import vacuum
+    from feed_brain.services.content_compression import compress_existing, train_content_dictionary
+
+    await init_db()
+    async with get_session_factory()() as session:
+        if dictionary:
+            await train_content_dictionary(session)
+        await compress_existing(session)
+    await vacuum(get_engine(), full=True)
+    await close_db()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compressed content storage benchmark")
+    parser.add_argument("--articles", type=int, default=50_000)
+    parser.add_argument("--content-bytes", type=int, default=6000)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--dictionary", action="store_true", help="Train a zstd dictionary")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        plain_db = Path(tmp) / "plain.db"
+        compressed_db = Path(tmp) / "compressed.db"
+        build_database(plain_db, args.articles, content_bytes=args.content_bytes)
+        shutil.copy(plain_db, compressed_db)
+
+        started = time.perf_counter()
+        run(_compress(compressed_db, args.dictionary))
+        migration_s = round(time.perf_counter() - started, 1)
+
+        middle = args.articles // 2
+        routes = {"article_detail": f"/article/{middle}"}
+        plain_latency = run(time_routes(plain_db, routes, args.requests))
+        compressed_latency = run(time_routes(compressed_db, routes, args.requests))
+
+        import random
+
+        rng = random.Random(1)
+        bodies = [_paragraphs(rng, args.content_bytes) for _ in range(5000)]
+        report = {
+            "articles": args.articles,
+            "codec": "zstd" if compression.zstandard is not None else "zlib",
+            "dictionary": args.dictionary,
+            "migration_s": migration_s,
+            "db_mb": {
+                "plain": round(plain_db.stat().st_size / 1e6, 1),
+                "compressed": round(compressed_db.stat().st_size / 1e6, 1),
+            },
+            "writes_per_s": {
+                "plain": _write_throughput(Path(tmp) / "w1.db", bodies, compressed=False),
+                "compressed": _write_throughput(Path(tmp) / "w2.db", bodies, compressed=True),
+            },
+            "read_latency": {
+                "plain": plain_latency["article_detail"],
+                "compressed": compressed_latency["article_detail"],
+            },
+        }
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
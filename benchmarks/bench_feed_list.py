@@ -0,0 +1,53 @@
+# ABOUTME: Benchmark of feed list page latency on a large synthetic database.
+# ABOUTME: Usage: python benchmarks/bench_feed_list.py --articles 100000
+
+import argparse
+import json
+import sqlite3
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from common import build_database, run, time_routes
+
+from feed_brain.db.queries import encode_cursor
+
+
+def _cursor_at(db_path: Path, offset: int) -> str:
+    """Cursor positioned `offset` rows deep in the unfiltered feed."""
+    conn = sqlite3.connect(db_path)
+    fetched_at, article_id = conn.execute(
+        "SELECT fetched_at, id FROM articles ORDER BY fetched_at DESC, id DESC LIMIT 1 OFFSET ?",
+        (offset,),
+    ).fetchone()
+    conn.close()
+    return encode_cursor(datetime.fromisoformat(fetched_at), article_id)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Feed list latency benchmark")
+    parser.add_argument("--articles", type=int, default=100_000)
+    parser.add_argument("--requests", type=int, default=30)
+    parser.add_argument("--db", type=Path, default=None, help="Reuse an existing database")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = args.db or Path(tmp) / "bench.db"
+        if args.db is None:
+            started = time.perf_counter()
+            build_database(db_path, args.articles)
+            print(f"built {args.articles} articles in {time.perf_counter() - started:.1f}s")
+
+        routes = {
+            "feed_list": "/",
+            "feed_list_high": "/?tier=high",
+            "feed_list_per_page_200": "/?per_page=200",
+            "feed_list_25k_deep": f"/?cursor={_cursor_at(db_path, 25_000)}",
+        }
+        results = run(time_routes(db_path, routes, args.requests))
+        print(json.dumps({"articles": args.articles, "routes": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+# ABOUTME: Throughput benchmark for the HTML-to-Markdown converter and clipping rendering.
+# ABOUTME: Usage: python benchmarks/bench_markdown.py [--db feed_brain.db | --pages DIR]
+
+import argparse
+import json
+import random
+import sqlite3
+import statistics
+import time
+from pathlib import Path
+
+from common import WORDS
+
+from feed_brain.db.compression import decompress
+from feed_brain.db.models import Article
+from feed_brain.services.clipping import render_clipping
+from feed_brain.services.markdown import html_to_markdown
+
+
+def _sentence(rng: random.Random, low: int = 8, high: int = 24) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(low, high))).capitalize()
+
+
+def _synthetic_page(rng: random.Random, size: int) -> str:
+    """Sanitized-looking article HTML using every block type the extractor keeps."""
+    parts = []
+    length = 0
+    while length < size:
+        kind = rng.random()
+        if kind < 0.6:
+            word = rng.choice(WORDS)
+            part = (
+                f"<p>{_sentence(rng)} <a href='https://example.com/{word}'>{word}</a> "
+                f"<strong>{_sentence(rng, 1, 3)}</strong>, <em>{word}</em> <code>{word}()</code>."
+                f"</p>"
+            )
+        elif kind < 0.7:
+            part = f"<h2>{_sentence(rng, 2, 6)}</h2>"
+        elif kind < 0.82:
+            items = "".join(f"<li>{_sentence(rng, 4, 10)}</li>" for _ in range(rng.randint(2, 6)))
+            part = f"<ul>{items}</ul>"
+        elif kind < 0.9:
+            part = f"<blockquote><p>{_sentence(rng)}</p></blockquote>"
+        elif kind < 0.96:
+            lines = "\n".join(f"    {rng.choice(WORDS)} = {i}" for i in range(rng.randint(3, 12)))
+            part = f"<pre><code>def f():\n{lines}</code></pre>"
+        else:
+            rows = "".join(
+                f"<tr><td>{rng.choice(WORDS)}</td><td>{rng.randint(1, 999)}</td></tr>"
+                for _ in range(rng.randint(2, 8))
+            )
+            part = f"<table><thead><tr><th>Name</th><th>Value</th></tr></thead>{rows}</table>"
+        parts.append(part)
+        length += len(part)
+    return "".join(parts)
+
+
+def _load_corpus(args) -> tuple[str, list[str]]:
+    if args.db:
+        # Real extracted bodies from a feed-brain database (read-only)
+        conn = sqlite3.connect(f"file:{args.db}?mode=ro", uri=True)
+        rows = conn.execute(
+            "SELECT content FROM article_bodies WHERE content IS NOT NULL LIMIT ?", (args.limit,)
+        ).fetchall()
+        conn.close()
+        pages = [c if isinstance(c, str) else decompress(c) for (c,) in rows]
+        return f"db:{args.db}", [page for page in pages if page]
+    if args.pages:
+        # Saved article pages, cleaned the way the extractor does it
+        from readability import Document
+
+        from feed_brain.services.extractor import sanitize_html
+
+        files = sorted(Path(args.pages).glob("*.htm*"))[: args.limit]
+        pages = [
+            str(sanitize_html(Document(path.read_text(errors="replace")).summary()))
+            for path in files
+        ]
+        return f"pages:{args.pages}", [page for page in pages if len(page) > 500]
+    rng = random.Random(0)
+    return "synthetic", [_synthetic_page(rng, rng.randint(2000, 20000)) for _ in range(args.limit)]
+
+
+def _time(fn, items, repeats: int) -> list[float]:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        for item in items:
+            fn(item)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def _time_each(pages: list[str]) -> list[float]:
+    timings = []
+    for page in pages:
+        started = time.perf_counter()
+        html_to_markdown(page)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="HTML-to-Markdown throughput benchmark")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--db", type=Path, help="feed-brain database to read article bodies from")
+    source.add_argument("--pages", type=Path, help="directory of saved .html article pages")
+    parser.add_argument("--limit", type=int, default=500)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    corpus, pages = _load_corpus(args)
+    total_bytes = sum(len(page.encode()) for page in pages)
+
+    html_to_markdown(pages[0])  # warm up
+    convert = statistics.median(_time(html_to_markdown, pages, args.repeats))
+    per_page = sorted(_time_each(pages))
+
+    articles = [
+        Article(id=i, url=f"https://example.com/{i}", title=f"Article {i}", content=page)
+        for i, page in enumerate(pages)
+    ]
+    at_approval = statistics.median(_time(render_clipping, articles, args.repeats))
+    for article in articles:
+        article.markdown = html_to_markdown(article.content)
+    precomputed = statistics.median(_time(render_clipping, articles, args.repeats))
+
+    print(
+        json.dumps(
+            {
+                "corpus": corpus,
+                "pages": len(pages),
+                "html_mb": round(total_bytes / 1e6, 2),
+                "convert": {
+                    "mb_per_s": round(total_bytes / 1e6 / convert, 1),
+                    "pages_per_s": round(len(pages) / convert),
+                    "p50_ms": round(per_page[len(per_page) // 2] * 1000, 3),
+                    "p99_ms": round(per_page[int(len(per_page) * 0.99)] * 1000, 3),
+                },
+                "render_clipping_ms_per_page": {
+                    "convert_at_approval": round(at_approval / len(pages) * 1000, 3),
+                    "stored_markdown": round(precomputed / len(pages) * 1000, 3),
+                },
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+# ABOUTME: Shared helpers for feed-brain benchmark scripts.
+# ABOUTME: Builds synthetic SQLite databases and times requests against the web app.
+
+import asyncio
+import os
+import random
+import sqlite3
+import statistics
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import create_engine
+
+from feed_brain.db.models import Article, Base
+
+TIERS = ["high", "medium", "low", None]
+CATEGORIES = [
+    "ai_agents",
+    "claude_code",
+    "development",
+    "devops_cloud",
+    "engineering_management",
+    "politics_economics",
+]
+WORDS = [
+    "agent",
+    "context",
+    "model",
+    "latency",
+    "cache",
+    "index",
+    "query",
+    "kubernetes",
+    "terraform",
+    "pipeline",
+    "team",
+    "debt",
+    "review",
+    "python",
+    "golang",
+    "memory",
+    "schema",
+    "token",
+    "budget",
+    "prompt",
+    "observability",
+]
+
+
+def _sqlite_datetime(value: datetime) -> str:
+    """Format a datetime the way SQLAlchemy stores it in SQLite."""
+    return value.strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+def _paragraphs(rng: random.Random, size: int) -> str:
+    """Generate sanitized-looking HTML of roughly `size` characters."""
+    parts = []
+    length = 0
+    while length < size:
+        sentence = " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 20)))
+        paragraph = f"<p>{sentence.capitalize()}. <strong>{rng.choice(WORDS)}</strong></p>"
+        parts.append(paragraph)
+        length += len(paragraph)
+    return "".join(parts)
+
+
+def build_database(
+    path: Path, articles: int, sources: int = 50, content_bytes: int = 6000, seed: int = 0
+) -> None:
+    """Write a synthetic database using the schema of the checked-out code."""
+    rng = random.Random(seed)
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    engine.dispose()
+
+    split_bodies = "article_bodies" in Base.metadata.tables
+    inline_content = "content" in Article.__table__.c
+    bodies = [_paragraphs(rng, content_bytes) for _ in range(200)]
+    now = datetime.now(UTC)
+
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=OFF")
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.executemany(
+        "INSERT INTO feed_sources (id, name, url, feed_type, active, created_at) "
+        "VALUES (?, ?, ?, 'rss', 1, ?)",
+        [
+            (i, f"Source {i}", f"https://source-{i}.example.com/feed", _sqlite_datetime(now))
+            for i in range(1, sources + 1)
+        ],
+    )
+
+    columns = [
+        "id", "url", "title", "author", "source_id", "published_date", "summary", "tier",
+        "category", "reason", "confidence", "money_quote", "actionables", "feedback",
+        "clipping_created", "fetched_at", "classified_at",
+    ]  # fmt: skip
+    if inline_content:
+        columns.append("content")
+    article_sql = (
+        f"INSERT INTO articles ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+    )
+
+    batch, body_batch = [], []
+    for article_id in range(1, articles + 1):
+        fetched = now - timedelta(minutes=article_id)
+        tier = rng.choice(TIERS)
+        content = bodies[article_id % len(bodies)]
+        row = [
+            article_id,
+            f"https://source.example.com/post/{article_id}",
+            f"Synthetic article {article_id} about {rng.choice(WORDS)}",
+            "Bench Author",
+            rng.randint(1, sources),
+            _sqlite_datetime(fetched),
+            "A synthetic two sentence summary. It mentions " + rng.choice(WORDS) + ".",
+            tier,
+            rng.choice(CATEGORIES) if tier else None,
+            "Synthetic reason." if tier else None,
+            0.8 if tier else None,
+            "A memorable quote." if tier else None,
+            '["Try it"]' if tier else None,
+            None,
+            0,
+            _sqlite_datetime(fetched),
+            _sqlite_datetime(fetched) if tier else None,
+        ]
+        if inline_content:
+            row.append(content)
+        batch.append(row)
+        if split_bodies:
+            body_batch.append((article_id, content))
+        if len(batch) >= 5000:
+            conn.executemany(article_sql, batch)
+            if body_batch:
+                conn.executemany(
+                    "INSERT INTO article_bodies (article_id, content) VALUES (?, ?)", body_batch
+                )
+            batch, body_batch = [], []
+    if batch:
+        conn.executemany(article_sql, batch)
+    if body_batch:
+        conn.executemany(
+            "INSERT INTO article_bodies (article_id, content) VALUES (?, ?)", body_batch
+        )
+    conn.commit()
+    conn.close()
+
+
+def summarize(latencies: list[float]) -> dict[str, float]:
+    """Latency summary in milliseconds."""
+    ordered = sorted(latencies)
+    return {
+        "p50_ms": round(statistics.median(ordered) * 1000, 2),
+        "p95_ms": round(ordered[int(len(ordered) * 0.95) - 1] * 1000, 2),
+        "max_ms": round(ordered[-1] * 1000, 2),
+    }
+
+
+async def time_routes(db_path: Path, routes: dict[str, str], requests: int) -> dict:
+    """Time GET requests against the app for each named route."""
+    import httpx
+
+    os.environ["DB_PATH"] = str(db_path)
+    from feed_brain.config import get_settings
+
+    get_settings.cache_clear()
+    from feed_brain.db.session import close_db, init_db
+    from feed_brain.web.app import create_app
+
+    await init_db()
+    results = {}
+    transport = httpx.ASGITransport(app=create_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, path in routes.items():
+            await client.get(path)  # warm up caches and the connection pool
+            latencies = []
+            for _ in range(requests):
+                started = time.perf_counter()
+                response = await client.get(path)
+                latencies.append(time.perf_counter() - started)
+                response.raise_for_status()
+            results[name] = summarize(latencies)
+    await close_db()
+    return results
+
+
+def run(coro):
+    """Run a benchmark coroutine."""
+    return asyncio.run(coro)
@@ -1,14 +1,17 @@
 # ABOUTME: CLI entry point for feed-brain.
-# ABOUTME: Supports 'serve' and 'fetch' commands.
+# ABOUTME: Supports serve, fetch, fetch workers, reclassify, OPML import and maintenance commands.
 
 import argparse
 import sys
+from typing import TYPE_CHECKING
 
 import structlog
-import uvicorn
 
 from feed_brain.config import get_settings
 
+if TYPE_CHECKING:
+    from feed_brain.models import ClassificationBudget
+
 log = structlog.get_logger()
 
 
@@ -17,18 +20,40 @@ def cmd_serve(args: argparse.Namespace) -> None:
     settings = get_settings()
     host = args.host or settings.host
     port = args.port or settings.port
+    import uvicorn
+
     log.info("starting_server", host=host, port=port)
-    uvicorn.run("feed_brain.web.app:app", host=host, port=port, reload=args.reload)
+    uvicorn.run(
+        "feed_brain.web.app:create_app", factory=True, host=host, port=port, reload=args.reload
+    )
 
 
-def cmd_fetch(_args: argparse.Namespace) -> None:
+def cmd_fetch(args: argparse.Namespace) -> None:
     """Fetch and classify articles from all active feeds."""
     import asyncio
 
-    asyncio.run(_run_fetch())
+    asyncio.run(_run_fetch(_budget_from_args(args)))
+
 
+def _budget_from_args(args: argparse.Namespace) -> "ClassificationBudget":
+    """Build a classification budget, CLI flags overriding settings."""
+    from feed_brain.models import ClassificationBudget
+
+    settings = get_settings()
+    return ClassificationBudget(
+        max_articles=(
+            args.max_articles if args.max_articles is not None else settings.classify_max_articles
+        ),
+        max_seconds=(
+            args.max_seconds if args.max_seconds is not None else settings.classify_max_seconds
+        ),
+        max_cost_usd=(
+            args.max_cost if args.max_cost is not None else settings.classify_max_cost_usd
+        ),
+    )
 
-async def _run_fetch() -> None:
+
+async def _run_fetch(budget: "ClassificationBudget") -> None:
     """Async fetch pipeline: fetch feeds, extract content, classify."""
     from feed_brain.db.session import close_db, init_db
 
@@ -39,12 +64,362 @@ async def _run_fetch() -> None:
 
         new = await fetch_all_feeds()
         log.info("fetch_done", new_articles=new)
-        classified = await classify_unclassified()
+        classified = await classify_unclassified(budget)
         log.info("classify_done", classified=classified)
     finally:
         await close_db()
 
 
+def cmd_worker(args: argparse.Namespace) -> None:
+    """Run fetch worker processes that claim feed-poll and extract tasks from the database."""
+    import asyncio
+    import os
+
+    from feed_brain.services.worker import run_workers
+
+    if args.classify and not args.drain:
+        log.error("classify_needs_drain", hint="--classify runs once the queue is drained")
+        sys.exit(1)
+    asyncio.run(_prepare_worker_queue(args.enqueue))
+    concurrency = args.concurrency or os.cpu_count() or 1
+    log.info("workers_starting", processes=concurrency, drain=args.drain)
+    exit_codes = run_workers(concurrency, drain=args.drain)
+    if any(exit_codes):
+        log.error("workers_failed", exit_codes=exit_codes)
+        sys.exit(1)
+    asyncio.run(_finish_worker_run(args))
+
+
+async def _prepare_worker_queue(enqueue: bool) -> None:
+    """Bring the schema up to date before workers start, and queue feed polls if asked."""
+    from feed_brain.db.session import close_db, init_db
+    from feed_brain.services.worker import enqueue_feed_polls
+
+    await init_db()
+    try:
+        if enqueue:
+            await enqueue_feed_polls()
+    finally:
+        await close_db()
+
+
+async def _finish_worker_run(args: argparse.Namespace) -> None:
+    """Report what is left in the queue, then classify if asked."""
+    from feed_brain.db.session import close_db, get_session_factory, init_db
+    from feed_brain.services.task_queue import queue_counts
+
+    await init_db()
+    try:
+        async with get_session_factory()() as session:
+            log.info("workers_done", queue=await queue_counts(session))
+        if args.classify:
+            from feed_brain.services.classifier import classify_unclassified
+
+            classified = await classify_unclassified(_budget_from_args(args))
+            log.info("classify_done", classified=classified)
+    finally:
+        await close_db()
+
+
+def cmd_reclassify(args: argparse.Namespace) -> None:
+    """Reclassify articles classified under an older prompt/model version."""
+    import asyncio
+
+    asyncio.run(_run_reclassify(args))
+
+
+async def _run_reclassify(args: argparse.Namespace) -> None:
+    """Async reclassification of outdated articles."""
+    from datetime import UTC, datetime, timedelta
+
+    from feed_brain.db.session import close_db, init_db
+    from feed_brain.services.classifier import count_outdated, reclassify
+
+    since = None
+    if args.since_days is not None:
+        since = datetime.now(UTC) - timedelta(days=args.since_days)
+
+    await init_db()
+    try:
+        if args.dry_run:
+            outdated = await count_outdated(since=since, tiers=args.tier)
+            log.info("reclassify_dry_run", outdated=outdated)
+            return
+        reclassified = await reclassify(
+            since=since, tiers=args.tier, concurrency=args.concurrency, limit=args.limit
+        )
+        log.info("reclassify_done", reclassified=reclassified)
+    finally:
+        await close_db()
+
+
+def cmd_reindex_search(_args: argparse.Namespace) -> None:
+    """Rebuild the full-text search index from all stored articles."""
+    import asyncio
+
+    asyncio.run(_run_reindex_search())
+
+
+async def _run_reindex_search() -> None:
+    """Async full-text index rebuild."""
+    from feed_brain.db.session import close_db, get_session_factory, init_db
+    from feed_brain.services.search import rebuild_index
+
+    await init_db()
+    try:
+        async with get_session_factory()() as session:
+            indexed = await rebuild_index(session)
+        log.info("reindex_search_done", indexed=indexed)
+    finally:
+        await close_db()
+
+
+def cmd_repair_stats(_args: argparse.Namespace) -> None:
+    """Recompute dashboard counters from the articles table."""
+    import asyncio
+
+    asyncio.run(_run_repair_stats())
+
+
+async def _run_repair_stats() -> None:
+    """Async stats consistency repair."""
+    from feed_brain.db.session import close_db, get_session_factory, init_db
+    from feed_brain.services.stats import repair_stats
+
+    await init_db()
+    try:
+        async with get_session_factory()() as session:
+            drifted = await repair_stats(session)
+        log.info("repair_stats_done", drifted=drifted)
+    finally:
+        await close_db()
+
+
+def cmd_retention(args: argparse.Namespace) -> None:
+    """Archive expired article bodies and vacuum the database."""
+    import asyncio
+
+    asyncio.run(_run_retention(args))
+
+
+async def _run_retention(args: argparse.Namespace) -> None:
+    """Async retention pass: archive expired bodies, then reclaim space."""
+    from feed_brain.db.session import (
+        close_db,
+        get_archive_session_factory,
+        get_engine,
+        get_session_factory,
+        init_archive_db,
+        init_db,
+    )
+    from feed_brain.services.archive import archive_expired, count_expired, vacuum
+
+    settings = get_settings()
+    await init_db()
+    try:
+        async with get_session_factory()() as session:
+            if args.dry_run:
+                expired = await count_expired(session, settings)
+                log.info("retention_dry_run", expired=expired)
+                return
+            await init_archive_db()
+            async with get_archive_session_factory()() as archive_session:
+                archived = await archive_expired(session, archive_session, settings)
+        reclaimed = await vacuum(get_engine(), full=args.vacuum_full)
+        log.info("retention_done", archived=archived, pages_reclaimed=reclaimed)
+    finally:
+        await close_db()
+
+
+def cmd_compress_content(args: argparse.Namespace) -> None:
+    """Compress stored article bodies, optionally training a zstd dictionary first."""
+    import asyncio
+
+    asyncio.run(_run_compress_content(args))
+
+
+async def _run_compress_content(args: argparse.Namespace) -> None:
+    """Async content compression migration."""
+    from feed_brain.db.session import close_db, get_engine, get_session_factory, init_db
+    from feed_brain.services.archive import vacuum
+    from feed_brain.services.content_compression import compress_existing, train_content_dictionary
+
+    await init_db()
+    try:
+        async with get_session_factory()() as session:
+            if args.train_dictionary:
+                await train_content_dictionary(session, samples=args.samples)
+            rewritten = await compress_existing(session, recompress=args.recompress)
+        reclaimed = await vacuum(get_engine(), full=args.vacuum_full)
+        log.info("compress_content_done", rewritten=rewritten, pages_reclaimed=reclaimed)
+    finally:
+        await close_db()
+
+
+def cmd_import_opml(args: argparse.Namespace) -> None:
+    """Bulk-import feeds from an OPML file, optionally probing each one."""
+    import asyncio
+
+    asyncio.run(_run_import_opml(args))
+
+
+async def _run_import_opml(args: argparse.Namespace) -> None:
+    """Async OPML import and concurrent feed probe."""
+    from feed_brain.db.session import close_db, get_session_factory, init_db
+    from feed_brain.services.feed_probe import probe_feeds
+    from feed_brain.services.opml import import_feeds, iter_opml
+
+    with open(args.path, "rb") as source:
+        feeds = list(iter_opml(source))
+
+    await init_db()
+    try:
+        async with get_session_factory()() as session:
+            imported = await import_feeds(session, feeds)
+        log.info("import_opml_done", imported=imported, total=len(feeds))
+    finally:
+        await close_db()
+
+    if not args.probe:
+        return
+    failed = 0
+    async for result in probe_feeds([feed["url"] for feed in feeds], args.concurrency):
+        if not result.ok:
+            failed += 1
+            log.warning(
+                "feed_probe_failed", url=result.url, status=result.status, error=result.error
+            )
+    log.info("probe_done", checked=len(feeds), failed=failed)
+
+
+def cmd_export_clippings(args: argparse.Namespace) -> None:
+    """Rewrite missing or stale clippings, or export them all to another folder or a zip."""
+    import asyncio
+
+    asyncio.run(_run_export_clippings(args))
+
+
+async def _run_export_clippings(args: argparse.Namespace) -> None:
+    """Async clipping export/reconciliation."""
+    from pathlib import Path
+
+    from feed_brain.db.session import close_db, get_session_factory, init_db
+    from feed_brain.services.clipping_export import export_clippings, export_clippings_zip
+
+    vault = get_settings().clippings_dir
+    target = Path(args.dir).expanduser() if args.dir else vault
+    if args.zip is None and not target.is_dir():
+        if args.dir is None:
+            log.error("clippings_dir_not_found", path=str(target))
+            sys.exit(1)
+        target.mkdir(parents=True)
+
+    await init_db()
+    try:
+        async with get_session_factory()() as session:
+            if args.zip:
+                result = await export_clippings_zip(session, Path(args.zip).expanduser())
+            else:
+                result = await export_clippings(
+                    session,
+                    target,
+                    concurrency=args.concurrency,
+                    dry_run=args.dry_run,
+                    force=args.force,
+                    mark_created=target == vault,
+                )
+        log.info("export_clippings_done", **result.model_dump())
+    finally:
+        await close_db()
+
+
+def cmd_bench(args: argparse.Namespace) -> None:
+    """Benchmark fetch and classify offline against a local synthetic server."""
+    import json
+    import logging
+    from pathlib import Path
+
+    from feed_brain.bench import BenchConfig, run_pipeline_bench
+
+    # Per-article logging would drown the report (and skew the timings)
+    level = getattr(logging, args.log_level.upper())
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(level))
+    config = BenchConfig(
+        feeds=args.feeds,
+        articles_per_feed=args.articles_per_feed,
+        article_bytes=args.article_bytes,
+        latency_ms=args.latency_ms,
+        classifier_latency_ms=args.classifier_latency_ms,
+        seed=args.seed,
+    )
+    report = json.dumps(run_pipeline_bench(config), indent=2)
+    if args.output:
+        Path(args.output).write_text(report + "\n")
+    print(report)
+
+
+def cmd_gen_db(args: argparse.Namespace) -> None:
+    """Generate a large synthetic database for load tests and benchmarks."""
+    import json
+    from pathlib import Path
+
+    from feed_brain.loadtest import GenConfig, generate_database
+
+    path = Path(args.path).expanduser()
+    if path.exists() and not args.force:
+        log.error("database_exists", path=str(path), hint="pass --force to replace it")
+        sys.exit(1)
+    for stale in (path, path.with_name(path.name + "-wal"), path.with_name(path.name + "-shm")):
+        stale.unlink(missing_ok=True)
+
+    def progress(_stage: str, done: int, total: int | None) -> None:
+        if done % 100_000 == 0 or done == total:
+            log.info("gen_db_progress", articles=done, total=total)
+
+    config = GenConfig(
+        articles=args.articles,
+        sources=args.sources,
+        body_bytes=args.body_bytes,
+        days=args.days,
+        feedback_rate=args.feedback_rate,
+        search_bodies=args.search_bodies,
+        seed=args.seed,
+    )
+    print(json.dumps(generate_database(path, config, progress), indent=2))
+
+
+def cmd_loadtest(args: argparse.Namespace) -> None:
+    """Load-test the feed list, article detail and feedback routes."""
+    import json
+    import logging
+    from pathlib import Path
+
+    from feed_brain.loadtest import DEFAULT_MIX, LoadTestConfig, run_loadtest
+
+    mix = dict(DEFAULT_MIX)
+    for part in filter(None, (args.mix or "").split(",")):
+        route, _, weight = part.partition("=")
+        if route not in DEFAULT_MIX:
+            log.error("unknown_route", route=route, routes=sorted(DEFAULT_MIX))
+            sys.exit(1)
+        mix[route] = float(weight)
+
+    # Request logging would skew the timings
+    level = getattr(logging, args.log_level.upper())
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(level))
+    config = LoadTestConfig(
+        requests=args.requests,
+        concurrency=args.concurrency,
+        mix={route: weight for route, weight in mix.items() if weight > 0},
+        seed=args.seed,
+    )
+    db_path = Path(args.db).expanduser() if args.db else get_settings().db_path
+    report = json.dumps(run_loadtest(db_path, config, url=args.url), indent=2)
+    if args.output:
+        Path(args.output).write_text(report + "\n")
+    print(report)
+
+
 def main() -> None:
     """Main CLI entry point."""
     parser = argparse.ArgumentParser(prog="feed-brain", description="AI-powered feed aggregator")
@@ -57,13 +432,170 @@ def main() -> None:
     serve_parser.add_argument("--reload", action="store_true")
 
     # fetch
-    subparsers.add_parser("fetch", help="Fetch and classify feeds")
+    fetch_parser = subparsers.add_parser("fetch", help="Fetch and classify feeds")
+    fetch_parser.add_argument("--max-articles", type=int, default=None)
+    fetch_parser.add_argument("--max-seconds", type=float, default=None)
+    fetch_parser.add_argument("--max-cost", type=float, default=None, help="Max estimated USD")
+
+    # worker
+    worker_parser = subparsers.add_parser(
+        "worker", help="Run fetch workers over the durable task queue"
+    )
+    worker_parser.add_argument(
+        "--concurrency", type=int, default=None, help="Worker processes (default: CPU count)"
+    )
+    worker_parser.add_argument(
+        "--enqueue", action="store_true", help="Queue a poll of every active feed first"
+    )
+    worker_parser.add_argument(
+        "--drain", action="store_true", help="Exit once the queue is empty instead of waiting"
+    )
+    worker_parser.add_argument(
+        "--classify", action="store_true", help="Classify new articles after draining"
+    )
+    worker_parser.add_argument("--max-articles", type=int, default=None)
+    worker_parser.add_argument("--max-seconds", type=float, default=None)
+    worker_parser.add_argument("--max-cost", type=float, default=None, help="Max estimated USD")
+
+    # reclassify
+    reclassify_parser = subparsers.add_parser(
+        "reclassify", help="Reclassify articles from an older prompt/model version"
+    )
+    reclassify_parser.add_argument("--since-days", type=float, default=None)
+    reclassify_parser.add_argument(
+        "--tier", action="append", choices=["high", "medium", "low"], default=None
+    )
+    reclassify_parser.add_argument("--concurrency", type=int, default=None)
+    reclassify_parser.add_argument("--limit", type=int, default=None)
+    reclassify_parser.add_argument("--dry-run", action="store_true")
+
+    # reindex-search
+    subparsers.add_parser("reindex-search", help="Rebuild the full-text search index")
+
+    # repair-stats
+    subparsers.add_parser("repair-stats", help="Recompute dashboard counters from scratch")
+
+    # retention
+    retention_parser = subparsers.add_parser(
+        "retention", help="Move expired article bodies to the compressed archive"
+    )
+    retention_parser.add_argument("--dry-run", action="store_true")
+    retention_parser.add_argument(
+        "--vacuum-full", action="store_true", help="Full VACUUM (enables incremental vacuum)"
+    )
+
+    # import-opml
+    import_parser = subparsers.add_parser("import-opml", help="Bulk-import feeds from OPML")
+    import_parser.add_argument("path", type=str)
+    import_parser.add_argument("--probe", action="store_true", help="Check every feed afterwards")
+    import_parser.add_argument("--concurrency", type=int, default=20)
+
+    # compress-content
+    compress_parser = subparsers.add_parser(
+        "compress-content", help="Compress article bodies stored as plain text"
+    )
+    compress_parser.add_argument(
+        "--train-dictionary", action="store_true", help="Train a zstd dictionary first"
+    )
+    compress_parser.add_argument("--samples", type=int, default=2000)
+    compress_parser.add_argument(
+        "--recompress", action="store_true", help="Rewrite already compressed bodies too"
+    )
+    compress_parser.add_argument("--vacuum-full", action="store_true")
+
+    # export-clippings
+    export_parser = subparsers.add_parser(
+        "export-clippings", help="Rewrite missing or stale clippings for approved articles"
+    )
+    export_target = export_parser.add_mutually_exclusive_group()
+    export_target.add_argument("--dir", type=str, default=None, help="Export to this folder")
+    export_target.add_argument("--zip", type=str, default=None, help="Export to a zip archive")
+    export_parser.add_argument("--concurrency", type=int, default=8, help="Parallel file I/O")
+    export_parser.add_argument("--dry-run", action="store_true")
+    export_parser.add_argument(
+        "--force", action="store_true", help="Also rewrite clippings edited in the vault"
+    )
+
+    # bench
+    bench_parser = subparsers.add_parser(
+        "bench", help="Benchmark fetch and classify against a local synthetic server"
+    )
+    bench_parser.add_argument("--feeds", type=int, default=20)
+    bench_parser.add_argument("--articles-per-feed", type=int, default=10)
+    bench_parser.add_argument("--article-bytes", type=int, default=8_000)
+    bench_parser.add_argument("--latency-ms", type=float, default=20.0, help="Per feed/page")
+    bench_parser.add_argument(
+        "--classifier-latency-ms", type=float, default=150.0, help="Per fake API call"
+    )
+    bench_parser.add_argument("--seed", type=int, default=0)
+    bench_parser.add_argument("--output", type=str, default=None, help="Also write JSON here")
+    bench_parser.add_argument("--log-level", type=str, default="warning")
+
+    # gen-db
+    gen_db_parser = subparsers.add_parser(
+        "gen-db", help="Generate a large synthetic database for load tests"
+    )
+    gen_db_parser.add_argument("path", type=str)
+    gen_db_parser.add_argument("--articles", type=int, default=1_000_000)
+    gen_db_parser.add_argument("--sources", type=int, default=500)
+    gen_db_parser.add_argument("--body-bytes", type=int, default=6_000, help="Median body size")
+    gen_db_parser.add_argument("--days", type=int, default=365, help="Spread of fetch times")
+    gen_db_parser.add_argument("--feedback-rate", type=float, default=0.05)
+    gen_db_parser.add_argument(
+        "--search-bodies", action="store_true", help="Full-text index bodies too (slow)"
+    )
+    gen_db_parser.add_argument("--seed", type=int, default=0)
+    gen_db_parser.add_argument("--force", action="store_true", help="Replace an existing file")
+
+    # loadtest
+    loadtest_parser = subparsers.add_parser(
+        "loadtest", help="Report RPS and p99 for the feed, article and feedback routes"
+    )
+    loadtest_parser.add_argument(
+        "--db", type=str, default=None, help="Database to test (and to sample IDs from)"
+    )
+    loadtest_parser.add_argument(
+        "--url", type=str, default=None, help="Hit a running server instead of in-process"
+    )
+    loadtest_parser.add_argument("--requests", type=int, default=2_000)
+    loadtest_parser.add_argument("--concurrency", type=int, default=8)
+    loadtest_parser.add_argument(
+        "--mix", type=str, default=None, help="Route weights, e.g. feed_list=6,feedback=0"
+    )
+    loadtest_parser.add_argument("--seed", type=int, default=0)
+    loadtest_parser.add_argument("--output", type=str, default=None, help="Also write JSON here")
+    loadtest_parser.add_argument("--log-level", type=str, default="warning")
 
     args = parser.parse_args()
+    from feed_brain.metrics import configure as configure_metrics
+
+    configure_metrics(get_settings().metrics_enabled)
     if args.command == "serve":
         cmd_serve(args)
     elif args.command == "fetch":
         cmd_fetch(args)
+    elif args.command == "worker":
+        cmd_worker(args)
+    elif args.command == "reclassify":
+        cmd_reclassify(args)
+    elif args.command == "reindex-search":
+        cmd_reindex_search(args)
+    elif args.command == "repair-stats":
+        cmd_repair_stats(args)
+    elif args.command == "retention":
+        cmd_retention(args)
+    elif args.command == "import-opml":
+        cmd_import_opml(args)
+    elif args.command == "compress-content":
+        cmd_compress_content(args)
+    elif args.command == "export-clippings":
+        cmd_export_clippings(args)
+    elif args.command == "bench":
+        cmd_bench(args)
+    elif args.command == "gen-db":
+        cmd_gen_db(args)
+    elif args.command == "loadtest":
+        cmd_loadtest(args)
     else:
         parser.print_help()
         sys.exit(1)
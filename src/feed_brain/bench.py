@@ -0,0 +1,362 @@
+# ABOUTME: End-to-end pipeline benchmark against a local synthetic feed/article/classifier server.
+# ABOUTME: Runs fetch then classify offline and reports throughput, latency and peak RSS as JSON.
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import os
+import platform
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterator
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import structlog
+from pydantic import BaseModel
+
+from feed_brain.metrics import metrics
+
+log = structlog.get_logger()
+
+WORDS = (
+    "agent",
+    "context",
+    "model",
+    "latency",
+    "cache",
+    "index",
+    "query",
+    "kubernetes",
+    "pipeline",
+    "memory",
+    "schema",
+    "token",
+    "budget",
+    "prompt",
+)
+TIERS = ("high", "medium", "low")
+CATEGORIES = ("ai_agents", "claude_code", "development", "devops_cloud", "engineering_management")
+
+
+class BenchConfig(BaseModel):
+    """Shape of the synthetic workload."""
+
+    feeds: int = 20
+    articles_per_feed: int = 10
+    article_bytes: int = 8_000
+    latency_ms: float = 20.0  # per feed/article response
+    classifier_latency_ms: float = 150.0  # per fake Anthropic call
+    seed: int = 0
+
+
+def _sentence(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 20))).capitalize() + "."
+
+
+def render_feed(config: BenchConfig, base_url: str, feed: int) -> bytes:
+    """RSS document for synthetic feed `feed`, newest item first."""
+    now = datetime(2026, 1, 1, tzinfo=UTC)
+    items = "".join(
+        f"<item><title>Feed {feed} article {n}</title>"
+        f"<link>{base_url}/articles/{feed}/{n}</link>"
+        f"<author>bench@example.com (Bench {feed})</author>"
+        f"<pubDate>{format_datetime(now - timedelta(hours=n))}</pubDate>"
+        f"<description>Summary of article {n}</description></item>"
+        for n in range(config.articles_per_feed)
+    )
+    return (
+        f'<?xml version="1.0"?><rss version="2.0"><channel><title>Bench feed {feed}</title>'
+        f"<link>{base_url}/</link><description>Synthetic</description>{items}</channel></rss>"
+    ).encode()
+
+
+def render_article(config: BenchConfig, feed: int, n: int) -> bytes:
+    """Article page of about article_bytes, wrapped in the chrome readability strips."""
+    rng = random.Random(f"{config.seed}:{feed}:{n}")
+    parts = []
+    length = 0
+    while length < config.article_bytes:
+        kind = rng.random()
+        if kind < 0.75:
+            part = f"<p>{_sentence(rng)} <a href='/x/{rng.choice(WORDS)}'>link</a> {_sentence(rng)}</p>"
+        elif kind < 0.85:
+            part = f"<h2>{_sentence(rng)}</h2>"
+        elif kind < 0.95:
+            part = "<ul>" + "".join(f"<li>{_sentence(rng)}</li>" for _ in range(3)) + "</ul>"
+        else:
+            part = f"<pre><code>{rng.choice(WORDS)} = {rng.randint(0, 99)}</code></pre>"
+        parts.append(part)
+        length += len(part)
+    return (
+        f"<html><head><title>Feed {feed} article {n}</title><script>var x = 1;</script></head>"
+        f"<body><nav><a href='/'>Home</a><a href='/about'>About</a></nav>"
+        f"<article><h1>Feed {feed} article {n}</h1>{''.join(parts)}</article>"
+        f"<footer>Copyright bench</footer></body></html>"
+    ).encode()
+
+
+def render_classification(request_body: bytes) -> bytes:
+    """Anthropic Messages API response carrying a deterministic classification."""
+    digest = hashlib.blake2b(request_body, digest_size=4).digest()
+    result = {
+        "tier": TIERS[digest[0] % len(TIERS)],
+        "category": CATEGORIES[digest[1] % len(CATEGORIES)],
+        "summary": "Synthetic summary of the article.",
+        "reason": "Synthetic classification.",
+        "money_quote": "",
+        "actionables": [],
+        "confidence": 0.5 + digest[2] / 512,
+    }
+    return json.dumps(
+        {
+            "id": f"msg_bench_{digest.hex()}",
+            "type": "message",
+            "role": "assistant",
+            "model": "bench",
+            "content": [{"type": "text", "text": json.dumps(result)}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": {"input_tokens": len(request_body) // 4, "output_tokens": 120},
+        }
+    ).encode()
+
+
+class SyntheticServer:
+    """Threaded local HTTP server for feeds, article pages and a fake Messages API.
+
+    GET /feeds/<i>.xml, GET /articles/<i>/<n> and POST /v1/messages. Each
+    response waits its configured latency first; requests and bytes served are
+    counted per kind.
+    """
+
+    def __init__(self, config: BenchConfig) -> None:
+        self.config = config
+        self.requests: Counter[str] = Counter()
+        self.bytes_served: Counter[str] = Counter()
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "SyntheticServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def _record(self, kind: str, size: int) -> None:
+        with self._lock:
+            self.requests[kind] += 1
+            self.bytes_served[kind] += size
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *_args) -> None:  # keep the report output clean
+                pass
+
+            def _send(self, kind: str, body: bytes, content_type: str, latency_ms: float):
+                time.sleep(latency_ms / 1000)
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                server._record(kind, len(body))
+
+            def do_GET(self) -> None:
+                parts = self.path.strip("/").split("/")
+                config = server.config
+                try:
+                    if parts[0] == "feeds" and len(parts) == 2:
+                        feed = int(parts[1].removesuffix(".xml"))
+                        body = render_feed(config, server.url, feed)
+                        self._send("feed", body, "application/rss+xml", config.latency_ms)
+                        return
+                    if parts[0] == "articles" and len(parts) == 3:
+                        body = render_article(config, int(parts[1]), int(parts[2]))
+                        self._send("article", body, "text/html", config.latency_ms)
+                        return
+                except ValueError:
+                    pass
+                self.send_error(404)
+
+            def do_POST(self) -> None:
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if self.path.split("?")[0] != "/v1/messages":
+                    self.send_error(404)
+                    return
+                response = render_classification(body)
+                latency = server.config.classifier_latency_ms
+                self._send("classify", response, "application/json", latency)
+
+        return Handler
+
+
+def percentiles(samples: list[float]) -> dict[str, float]:
+    """p50/p90/p99/max in milliseconds (nearest rank)."""
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def rank(p: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000, 2)
+
+    return {"p50_ms": rank(0.5), "p90_ms": rank(0.9), "p99_ms": rank(0.99), "max_ms": rank(1.0)}
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+class _StageTimer:
+    """Progress callback that records the time between successive reports of one stage."""
+
+    def __init__(self, stage: str) -> None:
+        self.stage = stage
+        self.latencies: list[float] = []
+        self._last = time.perf_counter()
+        self._done = 0
+
+    def __call__(self, stage: str, done: int, _total: int | None) -> None:
+        if stage != self.stage or done <= self._done:
+            return
+        now = time.perf_counter()
+        self.latencies.append((now - self._last) / (done - self._done))
+        self._last = now
+        self._done = done
+
+
+@contextlib.contextmanager
+def override_environment(values: dict[str, str]) -> Iterator[None]:
+    """Point Settings at the benchmark database and server, restoring the environment after."""
+    from feed_brain.config import get_settings
+
+    saved = {key: os.environ.get(key) for key in values}
+    os.environ.update(values)
+    get_settings.cache_clear()
+    try:
+        yield
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        get_settings.cache_clear()
+
+
+async def _run_stages(config: BenchConfig, server: SyntheticServer) -> dict:
+    from sqlalchemy import func, select
+
+    from feed_brain.db.models import Article, FeedSource
+    from feed_brain.db.session import close_db, get_session_factory, init_db
+    from feed_brain.models import ClassificationBudget
+    from feed_brain.services.classifier import classify_unclassified
+    from feed_brain.services.fetcher import fetch_all_feeds
+
+    await init_db()
+    try:
+        async with get_session_factory()() as session:
+            session.add_all(
+                FeedSource(name=f"Bench feed {i}", url=f"{server.url}/feeds/{i}.xml")
+                for i in range(config.feeds)
+            )
+            await session.commit()
+
+        stages = {}
+        feeds = _StageTimer("feeds")
+        started = time.perf_counter()
+        stored = await fetch_all_feeds(feeds)
+        elapsed = time.perf_counter() - started
+        stages["fetch"] = {
+            "seconds": round(elapsed, 3),
+            "feeds_per_s": round(config.feeds / elapsed, 2),
+            "articles": stored,
+            "articles_per_s": round(stored / elapsed, 2),
+            "per_feed": percentiles(feeds.latencies),
+            "peak_rss_mb": peak_rss_mb(),
+        }
+
+        classified = _StageTimer("classified")
+        started = time.perf_counter()
+        count = await classify_unclassified(ClassificationBudget(), classified)
+        elapsed = time.perf_counter() - started
+        stages["classify"] = {
+            "seconds": round(elapsed, 3),
+            "articles": count,
+            "articles_per_s": round(count / elapsed, 2) if elapsed else 0.0,
+            "per_article": percentiles(classified.latencies),
+            "peak_rss_mb": peak_rss_mb(),
+        }
+
+        async with get_session_factory()() as session:
+            unclassified = (
+                await session.execute(select(func.count()).where(Article.classified_at.is_(None)))
+            ).scalar_one()
+        stages["classify"]["unclassified_left"] = unclassified
+        return stages
+    finally:
+        await close_db()
+
+
+def run_pipeline_bench(config: BenchConfig, workdir: Path | None = None) -> dict:
+    """Run fetch → classify against a local synthetic server and return the report.
+
+    Uses a throwaway database (in `workdir`, or a temporary directory) so the
+    real one is never touched. Per-item latencies are the time between progress
+    reports, which both stages emit once per feed and per article.
+    """
+    with contextlib.ExitStack() as stack:
+        if workdir is None:
+            workdir = Path(stack.enter_context(tempfile.TemporaryDirectory()))
+        server = stack.enter_context(SyntheticServer(config))
+        env = {
+            "DB_PATH": str(workdir / "bench.db"),
+            "ARCHIVE_DB_PATH": str(workdir / "bench_archive.db"),
+            "ANTHROPIC_API_KEY": "bench",
+            "ANTHROPIC_BASE_URL": server.url,
+            "MAX_ARTICLES_PER_FEED": str(config.articles_per_feed),
+        }
+        stack.enter_context(override_environment(env))
+        metrics.reset()
+        started = time.perf_counter()
+        stages = asyncio.run(_run_stages(config, server))
+        total = time.perf_counter() - started
+
+    report = {
+        "config": config.model_dump(),
+        "environment": {"python": platform.python_version(), "platform": sys.platform},
+        "total_seconds": round(total, 3),
+        "stages": stages,
+        "stage_timings": metrics.snapshot(),
+        "server": {
+            "requests": dict(server.requests),
+            "bytes": dict(server.bytes_served),
+        },
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    log.info("pipeline_bench_done", total_seconds=report["total_seconds"])
+    return report
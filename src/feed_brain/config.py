@@ -19,11 +19,42 @@ class Settings(BaseSettings):
 
     # Anthropic
     anthropic_api_key: SecretStr | None = None
+    anthropic_base_url: str | None = None  # None = the SDK default (api.anthropic.com)
     classifier_model: str = "claude-haiku-4-5-20251001"
+    # Estimated pricing (USD per million tokens) used for per-run spend budgets
+    classifier_input_cost_per_mtok: float = 1.0
+    classifier_output_cost_per_mtok: float = 5.0
+
+    # Per-run classification budgets (None = unlimited)
+    classify_max_articles: int | None = None
+    classify_max_seconds: float | None = None
+    classify_max_cost_usd: float | None = None
+
+    # Concurrent classifier requests during reclassification
+    reclassify_concurrency: int = 4
 
     # Database
     db_path: Path = Path("./feed_brain.db")
 
+    # SQLite tuning, applied to every new connection
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_mmap_size: int = 268_435_456  # bytes (256 MiB)
+    sqlite_cache_size: int = -65_536  # negative = KiB (64 MiB)
+    sqlite_busy_timeout_ms: int = 5_000
+    db_read_pool_size: int = 5
+
+    # Retention: bodies older than N days move to the compressed archive DB
+    # (None = keep forever). Skipped articles use the shorter of their tier's
+    # limit and retention_days_skipped; approved articles are kept if configured.
+    archive_db_path: Path = Path("./feed_brain_archive.db")
+    retention_days_high: int | None = None
+    retention_days_medium: int | None = 180
+    retention_days_low: int | None = 30
+    retention_days_unclassified: int | None = 90
+    retention_days_skipped: int | None = 14
+    retention_keep_approved: bool = True
+
     # Feed fetching
     feed_timeout: int = 15
     feed_user_agent: str = (
@@ -32,6 +63,12 @@ class Settings(BaseSettings):
     )
     max_articles_per_feed: int = 50
 
+    # Fetch workers (`feed-brain worker`): tasks per process, visibility timeout and retries
+    worker_slots: int = 4  # tasks one worker process runs at a time
+    worker_lease_seconds: float = 120.0  # renewed every third; a silent worker loses its tasks
+    worker_max_attempts: int = 3
+    worker_poll_seconds: float = 1.0  # idle wait between claims when the queue is empty
+
     # Obsidian integration
     clippings_dir: Path = Path(
         "/Users/maroffo/Library/Mobile Documents/iCloud~md~obsidian/Documents/Clippings"
@@ -40,15 +77,29 @@ class Settings(BaseSettings):
     # Server
     host: str = "127.0.0.1"
     port: int = 8000
+    fragment_cache_size: int = 5_000  # rendered article cards kept in memory (LRU)
 
     # Logging
     log_level: str = "INFO"
 
+    # Stage timing histograms (served on /metrics) and a per-run stage_timings log line
+    metrics_enabled: bool = True
+    metrics_log_summary: bool = False
+
+    # Per-request SQL counts in a Server-Timing header, with a warning past request_query_warn
+    server_timing_enabled: bool = True
+    request_query_warn: int = 20  # log a warning when one request runs more SQL statements
+
     @property
     def database_url(self) -> str:
         """Build async SQLite connection URL."""
         return f"sqlite+aiosqlite:///{self.db_path}"
 
+    @property
+    def archive_database_url(self) -> str:
+        """Build async SQLite connection URL for the cold archive."""
+        return f"sqlite+aiosqlite:///{self.archive_db_path}"
+
 
 @lru_cache
 def get_settings() -> Settings:
@@ -0,0 +1,105 @@
+# ABOUTME: Compression codecs for stored article text.
+# ABOUTME: Uses zstd (optionally with a trained dictionary) when installed, zlib otherwise.
+
+import threading
+import zlib
+from collections.abc import Callable
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depends on installed extras
+    zstandard = None
+
+# One-byte header identifying the codec, so either codec's output stays readable
+CODEC_ZLIB = 0x01
+CODEC_ZSTD = 0x02
+
+ZSTD_LEVEL = 3  # level 9 is ~8x slower for ~1% better ratio on article HTML
+ZLIB_LEVEL = 6
+DICTIONARY_SIZE = 112_640
+
+# Trained zstd dictionaries by id; zstd frames record the id of the dictionary
+# they were compressed with, so older dictionaries stay usable for reading
+_dictionaries: dict[int, "zstandard.ZstdCompressionDict"] = {}
+_active_dictionary: int | None = None
+# Reads a stored dictionary by id, for frames written with a dictionary another
+# process trained after this one started (see set_dictionary_loader)
+_dictionary_loader: Callable[[int], bytes | None] | None = None
+_load_lock = threading.Lock()
+
+
+def train_dictionary(samples: list[str], size: int = DICTIONARY_SIZE) -> bytes:
+    """Train a zstd dictionary from sample documents."""
+    if zstandard is None:
+        raise RuntimeError("training a dictionary requires the 'zstandard' package")
+    encoded = [sample.encode("utf-8") for sample in samples if sample]
+    return zstandard.train_dictionary(size, encoded, level=ZSTD_LEVEL).as_bytes()
+
+
+def register_dictionary(data: bytes, active: bool = True) -> int:
+    """Make a trained dictionary available for decompression (and compression if active)."""
+    global _active_dictionary
+    if zstandard is None:
+        raise RuntimeError("zstd dictionaries require the 'zstandard' package")
+    dictionary = zstandard.ZstdCompressionDict(data)
+    dictionary.precompute_compress(level=ZSTD_LEVEL)
+    dict_id = dictionary.dict_id()
+    _dictionaries[dict_id] = dictionary
+    if active:
+        _active_dictionary = dict_id
+    return dict_id
+
+
+def set_dictionary_loader(loader: Callable[[int], bytes | None] | None) -> None:
+    """Set how unregistered dictionaries are fetched (by id) when a frame needs one."""
+    global _dictionary_loader
+    _dictionary_loader = loader
+
+
+def _dictionary(dict_id: int) -> "zstandard.ZstdCompressionDict":
+    """A registered dictionary, loading and registering (inactive) unknown ones."""
+    if dict_id not in _dictionaries and _dictionary_loader is not None:
+        with _load_lock:
+            if dict_id not in _dictionaries and (data := _dictionary_loader(dict_id)):
+                register_dictionary(data, active=False)
+    if dict_id not in _dictionaries:
+        raise RuntimeError(f"zstd dictionary {dict_id} is not registered")
+    return _dictionaries[dict_id]
+
+
+def reset_dictionaries() -> None:
+    """Forget all registered dictionaries."""
+    global _active_dictionary
+    _dictionaries.clear()
+    _active_dictionary = None
+
+
+def compress(text: str) -> bytes:
+    """Compress text with the best available codec."""
+    raw = text.encode("utf-8")
+    if zstandard is not None:
+        if _active_dictionary is not None:
+            compressor = zstandard.ZstdCompressor(
+                level=ZSTD_LEVEL, dict_data=_dictionaries[_active_dictionary]
+            )
+        else:
+            compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+        return bytes([CODEC_ZSTD]) + compressor.compress(raw)
+    return bytes([CODEC_ZLIB]) + zlib.compress(raw, ZLIB_LEVEL)
+
+
+def decompress(data: bytes) -> str:
+    """Decompress bytes produced by compress()."""
+    codec, payload = data[0], data[1:]
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(payload).decode("utf-8")
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("zstd-compressed data requires the 'zstandard' package")
+        dict_id = zstandard.get_frame_parameters(payload).dict_id
+        if dict_id:
+            decompressor = zstandard.ZstdDecompressor(dict_data=_dictionary(dict_id))
+        else:
+            decompressor = zstandard.ZstdDecompressor()
+        return decompressor.decompress(payload).decode("utf-8")
+    raise ValueError(f"unknown compression codec: {codec:#x}")
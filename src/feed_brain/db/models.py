@@ -1,16 +1,35 @@
 # ABOUTME: SQLAlchemy ORM models for articles and feed sources.
-# ABOUTME: Defines FeedSource and Article tables with indexes and relationships.
+# ABOUTME: Hot tables (feeds, articles, bodies, dictionaries, stats, tasks, FTS) and the archive.
 
 from datetime import UTC, datetime
 
-from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Index, String, Text
+from sqlalchemy import (
+    DDL,
+    Boolean,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+    event,
+)
+from sqlalchemy.ext.associationproxy import AssociationProxy, association_proxy
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
+from feed_brain.db.types import CompressedText
+
 
 class Base(DeclarativeBase):
     pass
 
 
+class ArchiveBase(DeclarativeBase):
+    """Tables stored in the separate cold archive database."""
+
+
 class FeedSource(Base):
     __tablename__ = "feed_sources"
 
@@ -27,9 +46,13 @@ class FeedSource(Base):
 class Article(Base):
     __tablename__ = "articles"
     __table_args__ = (
-        Index("ix_articles_tier", "tier"),
+        # Keyset pagination indexes: (filter, fetched_at, id) serves both the
+        # filter and the ORDER BY fetched_at DESC, id DESC seek
+        Index("ix_articles_fetched_at_id", "fetched_at", "id"),
+        Index("ix_articles_tier_fetched_at_id", "tier", "fetched_at", "id"),
+        Index("ix_articles_category_fetched_at_id", "category", "fetched_at", "id"),
+        Index("ix_articles_source_fetched_at_id", "source_id", "fetched_at", "id"),
         Index("ix_articles_feedback", "feedback"),
-        Index("ix_articles_fetched_at", "fetched_at"),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True)
@@ -37,7 +60,6 @@ class Article(Base):
     title: Mapped[str] = mapped_column(String(500))
     author: Mapped[str | None] = mapped_column(String(255))
     source_id: Mapped[int | None] = mapped_column(ForeignKey("feed_sources.id"))
-    content: Mapped[str | None] = mapped_column(Text)
     published_date: Mapped[datetime | None] = mapped_column(DateTime)
 
     # AI classification
@@ -48,6 +70,7 @@ class Article(Base):
     confidence: Mapped[float | None] = mapped_column(Float)
     money_quote: Mapped[str | None] = mapped_column(Text)
     actionables: Mapped[str | None] = mapped_column(Text)  # JSON array
+    classifier_version: Mapped[str | None] = mapped_column(String(100))  # model:prompt-hash
 
     # Feedback
     feedback: Mapped[str | None] = mapped_column(String(20))
@@ -57,5 +80,106 @@ class Article(Base):
     # Timestamps
     fetched_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(UTC))
     classified_at: Mapped[datetime | None] = mapped_column(DateTime)
+    archived_at: Mapped[datetime | None] = mapped_column(DateTime)  # body moved to archive
+    # Row version for rendered-fragment caching and HTTP validators
+    updated_at: Mapped[datetime | None] = mapped_column(
+        DateTime, default=lambda: datetime.now(UTC), onupdate=lambda: datetime.now(UTC)
+    )
 
     source: Mapped[FeedSource | None] = relationship(back_populates="articles")
+
+    # Heavy content lives in article_bodies; load it explicitly with
+    # selectinload(Article.body) where it is needed (detail page, clipping, classifier)
+    body: Mapped["ArticleBody | None"] = relationship(
+        back_populates="article", cascade="all, delete-orphan", lazy="raise"
+    )
+    content: AssociationProxy[str | None] = association_proxy(
+        "body", "content", creator=lambda content: ArticleBody(content=content)
+    )
+    markdown: AssociationProxy[str | None] = association_proxy(
+        "body", "markdown", creator=lambda markdown: ArticleBody(markdown=markdown)
+    )
+
+
+class ArticleBody(Base):
+    __tablename__ = "article_bodies"
+
+    article_id: Mapped[int] = mapped_column(
+        ForeignKey("articles.id", ondelete="CASCADE"), primary_key=True
+    )
+    content: Mapped[str | None] = mapped_column(CompressedText)
+    # Markdown rendering of content, converted once at extraction for clippings
+    markdown: Mapped[str | None] = mapped_column(CompressedText)
+
+    article: Mapped[Article] = relationship(back_populates="body")
+
+
+class ArchivedBody(ArchiveBase):
+    """Compressed article body retired from the hot database."""
+
+    __tablename__ = "archived_bodies"
+
+    article_id: Mapped[int] = mapped_column(primary_key=True)  # articles.id in the hot DB
+    content: Mapped[bytes] = mapped_column(LargeBinary)  # db.compression format
+    archived_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(UTC))
+
+
+class CompressionDictionary(Base):
+    """Trained zstd dictionary for article bodies; every one ever used must be kept."""
+
+    __tablename__ = "compression_dictionaries"
+
+    id: Mapped[int] = mapped_column(primary_key=True)  # zstd dictionary id
+    data: Mapped[bytes] = mapped_column(LargeBinary)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(UTC))
+
+
+class StatCounter(Base):
+    """Article counts per dimension value, maintained incrementally by services.stats."""
+
+    __tablename__ = "stat_counters"
+
+    dimension: Mapped[str] = mapped_column(String(20), primary_key=True)  # all/tier/category/source
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    articles: Mapped[int] = mapped_column(Integer, default=0)
+    classified: Mapped[int] = mapped_column(Integer, default=0)
+    high: Mapped[int] = mapped_column(Integer, default=0)
+    approved: Mapped[int] = mapped_column(Integer, default=0)
+    skipped: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class Task(Base):
+    """Durable fetch work (feed polls, extractions) claimed by workers under a lease.
+
+    A claimed task is `running` until its lease expires; a worker that dies
+    mid-task simply stops renewing it and another worker reclaims it. Finished
+    tasks are deleted, failed ones kept for inspection until re-enqueued.
+    """
+
+    __tablename__ = "tasks"
+    __table_args__ = (Index("ix_tasks_status_run_after", "status", "run_after"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    kind: Mapped[str] = mapped_column(String(20))  # feed_poll / extract
+    key: Mapped[str] = mapped_column(String(2100), unique=True)  # one live task per feed or URL
+    payload: Mapped[str] = mapped_column(Text)  # JSON
+    status: Mapped[str] = mapped_column(String(20), default="queued")  # queued/running/failed
+    attempts: Mapped[int] = mapped_column(Integer, default=0)  # claims so far
+    run_after: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(UTC))
+    lease_owner: Mapped[str | None] = mapped_column(String(100))
+    lease_expires_at: Mapped[datetime | None] = mapped_column(DateTime)
+    heartbeat_at: Mapped[datetime | None] = mapped_column(DateTime)
+    error: Mapped[str | None] = mapped_column(Text)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(UTC))
+
+
+# Full-text index over article text; rowid is the article id. Kept in sync by
+# services.search from the fetch and classify write paths.
+event.listen(
+    Base.metadata,
+    "after_create",
+    DDL(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5("
+        "title, summary, money_quote, body, tokenize = 'porter unicode61 remove_diacritics 2')"
+    ),
+)
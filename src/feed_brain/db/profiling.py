@@ -0,0 +1,76 @@
+# ABOUTME: Counts SQL statements and their database time through SQLAlchemy cursor events.
+# ABOUTME: track_queries() scopes the counting to a request, a test block or a job.
+
+import contextlib
+import time
+from collections.abc import Iterator
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryStats:
+    """Statements executed and seconds spent in the driver; nested scopes add to their parents."""
+
+    __slots__ = ("count", "seconds", "parent")
+
+    def __init__(self, parent: "QueryStats | None" = None) -> None:
+        self.count = 0
+        self.seconds = 0.0
+        self.parent = parent
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def _before_cursor_execute(conn, *_args) -> None:
+    if _current.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, *_args) -> None:
+    stats = _current.get()
+    started = conn.info.get("query_started")
+    if stats is None or not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    while stats is not None:
+        stats.count += 1
+        stats.seconds += elapsed
+        stats = stats.parent
+
+
+def _handle_error(context) -> None:
+    # A failed statement never reaches after_cursor_execute; drop its start time
+    connection = context.connection
+    if connection is not None and (started := connection.info.get("query_started")):
+        started.pop()
+
+
+def instrument(engine: Engine) -> None:
+    """Count statements on `engine` (the sync engine behind an AsyncEngine)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+@contextlib.contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Count statements run in this context (and tasks it starts) until the block exits.
+
+    The cursor events fire in the greenlet SQLAlchemy runs for the awaiting
+    task, which shares that task's context, so concurrent requests are
+    counted separately.
+    """
+    stats = QueryStats(_current.get())
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def untrack_queries() -> None:
+    """Stop counting in the current context, e.g. a background task that outlives a request."""
+    _current.set(None)
@@ -0,0 +1,89 @@
+# ABOUTME: Reusable article queries for the web UI.
+# ABOUTME: Keyset pagination and prev/next seeks over (fetched_at, id) with tier/category filters.
+
+import base64
+from datetime import UTC, datetime
+
+from sqlalchemy import Select, select, tuple_
+
+from feed_brain.db.models import Article
+
+
+def as_naive_utc(value: datetime) -> datetime:
+    """Normalize a datetime to naive UTC (SQLite returns naive values)."""
+    if value.tzinfo is not None:
+        value = value.astimezone(UTC).replace(tzinfo=None)
+    return value
+
+
+def encode_cursor(fetched_at: datetime, article_id: int) -> str:
+    """Encode a keyset position as an opaque URL-safe token."""
+    raw = f"{fetched_at.isoformat()}|{article_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decode a cursor token. Raises ValueError for malformed input."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        fetched_at, article_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(fetched_at), int(article_id)
+    except (UnicodeDecodeError, ValueError) as e:
+        raise ValueError(f"invalid cursor: {cursor!r}") from e
+
+
+def filter_articles(
+    query: Select,
+    tier: str | None = None,
+    category: str | None = None,
+    *,
+    source_id: int | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> Select:
+    """Apply the feed list filters (and the API's source/date filters) to an article query."""
+    if tier:
+        query = query.where(Article.tier == tier)
+    if category:
+        query = query.where(Article.category == category)
+    if source_id is not None:
+        query = query.where(Article.source_id == source_id)
+    if since is not None:
+        query = query.where(Article.fetched_at >= since)
+    if until is not None:
+        query = query.where(Article.fetched_at < until)
+    return query
+
+
+def keyset_page(query: Select, cursor: str | None, per_page: int) -> Select:
+    """Order newest first and seek past `cursor`.
+
+    Fetches one extra row so callers can tell whether another page exists.
+    """
+    query = query.order_by(Article.fetched_at.desc(), Article.id.desc())
+    if cursor:
+        fetched_at, article_id = decode_cursor(cursor)
+        query = query.where(tuple_(Article.fetched_at, Article.id) < (fetched_at, article_id))
+    return query.limit(per_page + 1)
+
+
+def neighbors_query(
+    fetched_at: datetime, article_id: int, tier: str | None = None, category: str | None = None
+) -> Select:
+    """Select (prev_id, next_id) around an article in one round trip.
+
+    The feed is ordered newest first, so "prev" is the closest newer article
+    and "next" the closest older one. Both are index seeks on (fetched_at, id).
+    """
+    position = tuple_(Article.fetched_at, Article.id)
+    current = (fetched_at, article_id)
+    base = filter_articles(select(Article.id), tier, category)
+    newer = (
+        base.where(position > current).order_by(Article.fetched_at.asc(), Article.id.asc()).limit(1)
+    )
+    older = (
+        base.where(position < current)
+        .order_by(Article.fetched_at.desc(), Article.id.desc())
+        .limit(1)
+    )
+    return select(newer.scalar_subquery(), older.scalar_subquery())
@@ -1,46 +1,245 @@
-# ABOUTME: Database engine and async session factory.
-# ABOUTME: Manages SQLAlchemy async engine lifecycle and table creation.
+# ABOUTME: Database engines and async session factories.
+# ABOUTME: Single-writer and pooled read-only SQLite engines with tuned pragmas.
+
+import sqlite3
+from functools import partial
+from pathlib import Path
 
 import structlog
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 
-from feed_brain.config import get_settings
-from feed_brain.db.models import Base
+from feed_brain.config import Settings, get_settings
+from feed_brain.db import compression, profiling
+from feed_brain.db.models import ArchiveBase, Base, CompressionDictionary
 
 log = structlog.get_logger()
 
 _engine = None
 _session_factory = None
+_read_engine = None
+_read_session_factory = None
+_archive_engine = None
+_archive_session_factory = None
+
+
+def _apply_sqlite_profile(dbapi_connection, settings: Settings, read_only: bool) -> None:
+    """Apply the configured SQLite pragmas to a fresh connection."""
+    pragmas = [
+        f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}",
+        f"PRAGMA synchronous={settings.sqlite_synchronous}",
+        f"PRAGMA mmap_size={settings.sqlite_mmap_size}",
+        f"PRAGMA cache_size={settings.sqlite_cache_size}",
+    ]
+    if read_only:
+        pragmas.append("PRAGMA query_only=ON")
+    else:
+        # Both are persistent in the file and need a write lock to change;
+        # auto_vacuum only takes effect on new databases or after a full VACUUM
+        pragmas[:0] = [
+            "PRAGMA auto_vacuum=INCREMENTAL",
+            f"PRAGMA journal_mode={settings.sqlite_journal_mode}",
+        ]
+
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in pragmas:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+def create_engine(
+    settings: Settings, *, read_only: bool = False, url: str | None = None
+) -> AsyncEngine:
+    """Create a tuned SQLite engine.
+
+    The writer holds a single connection so SQLite's one-writer rule is enforced
+    by the pool instead of surfacing as "database is locked"; readers get a pool
+    of query-only connections that WAL lets run alongside an open write. Every
+    other writer waits for that connection, so writer sessions must stay short:
+    do network and file I/O before opening one or after closing it.
+    """
+    pool_size = settings.db_read_pool_size if read_only else 1
+    engine = create_async_engine(
+        url or settings.database_url, echo=False, pool_size=pool_size, max_overflow=0
+    )
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _on_connect(dbapi_connection, _connection_record) -> None:
+        _apply_sqlite_profile(dbapi_connection, settings, read_only)
 
+    profiling.instrument(engine.sync_engine)
+    return engine
 
-def get_engine():
-    """Get or create the async engine."""
+
+def get_engine() -> AsyncEngine:
+    """Get or create the single-writer engine."""
     global _engine
     if _engine is None:
-        settings = get_settings()
-        _engine = create_async_engine(settings.database_url, echo=False)
+        _engine = create_engine(get_settings())
     return _engine
 
 
+def get_read_engine() -> AsyncEngine:
+    """Get or create the pooled read-only engine used by the web UI."""
+    global _read_engine
+    if _read_engine is None:
+        _read_engine = create_engine(get_settings(), read_only=True)
+    return _read_engine
+
+
 def get_session_factory() -> async_sessionmaker[AsyncSession]:
-    """Get or create the session factory."""
+    """Get or create the session factory for writes."""
     global _session_factory
     if _session_factory is None:
         _session_factory = async_sessionmaker(get_engine(), expire_on_commit=False)
     return _session_factory
 
 
+def get_read_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Get or create the session factory for read-only queries."""
+    global _read_session_factory
+    if _read_session_factory is None:
+        _read_session_factory = async_sessionmaker(get_read_engine(), expire_on_commit=False)
+    return _read_session_factory
+
+
+def get_archive_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Get or create the session factory for the cold archive database."""
+    global _archive_engine, _archive_session_factory
+    if _archive_session_factory is None:
+        settings = get_settings()
+        _archive_engine = create_engine(settings, url=settings.archive_database_url)
+        _archive_session_factory = async_sessionmaker(_archive_engine, expire_on_commit=False)
+    return _archive_session_factory
+
+
+async def init_archive_db() -> None:
+    """Create the archive tables if they don't exist."""
+    get_archive_session_factory()
+    async with _archive_engine.begin() as conn:
+        await conn.run_sync(ArchiveBase.metadata.create_all)
+
+
 async def init_db() -> None:
     """Create all tables if they don't exist."""
     engine = get_engine()
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_migrate_schema)
+        await conn.run_sync(_split_article_bodies)
+        await conn.run_sync(_load_compression_dictionaries)
+    # Dictionaries trained later by another process (compress-content) are read on demand
+    compression.set_dictionary_loader(partial(_read_dictionary, get_settings().db_path))
     log.info("database_initialized", url=get_settings().database_url)
 
 
+# Indexes the models used to define and that newer ones replace; any other
+# index found in the database (e.g. one an operator added) is left alone
+_RETIRED_INDEXES = {
+    "articles": ("ix_articles_tier", "ix_articles_fetched_at"),
+}
+
+# One-off fills for columns added to existing databases, keyed by (table, column)
+_BACKFILLS = {
+    ("articles", "updated_at"): (
+        "UPDATE articles SET updated_at = COALESCE(feedback_at, classified_at, fetched_at)"
+    ),
+}
+
+
+def _migrate_schema(connection) -> None:
+    """Add columns and indexes introduced after the database was created.
+
+    create_all only creates missing tables, so existing databases are brought
+    up to date in place with ALTER TABLE ADD COLUMN. Indexes the models
+    replaced (_RETIRED_INDEXES) are dropped.
+    """
+    inspector = inspect(connection)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            column_type = column.type.compile(dialect=connection.dialect)
+            connection.exec_driver_sql(
+                f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"
+            )
+            if backfill := _BACKFILLS.get((table.name, column.name)):
+                connection.exec_driver_sql(backfill)
+            log.info("column_added", table=table.name, column=column.name)
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+        existing_indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        for name in _RETIRED_INDEXES.get(table.name, ()):
+            if name in existing_indexes:
+                connection.exec_driver_sql(f"DROP INDEX {name}")
+                log.info("index_dropped", table=table.name, index=name)
+
+
+def _split_article_bodies(connection) -> None:
+    """Move legacy articles.content into article_bodies (one-time migration)."""
+    columns = {column["name"] for column in inspect(connection).get_columns("articles")}
+    if "content" not in columns:
+        return
+    moved = connection.exec_driver_sql(
+        "INSERT OR IGNORE INTO article_bodies (article_id, content) "
+        "SELECT id, content FROM articles WHERE content IS NOT NULL"
+    ).rowcount
+    connection.exec_driver_sql("ALTER TABLE articles DROP COLUMN content")
+    log.info("article_bodies_migrated", moved=moved)
+
+
+def _load_compression_dictionaries(connection) -> None:
+    """Register stored zstd dictionaries; the newest one compresses new bodies."""
+    rows = connection.execute(
+        select(CompressionDictionary.data).order_by(CompressionDictionary.created_at)
+    ).all()
+    if not rows:
+        return
+    if compression.zstandard is None:
+        log.warning("compression_dictionaries_unavailable", hint="install the zstd extra")
+        return
+    for (data,) in rows:
+        compression.register_dictionary(data)
+
+
+def _read_dictionary(db_path: Path, dict_id: int) -> bytes | None:
+    """Fetch one stored dictionary with a plain read-only connection.
+
+    Decompression runs inside result processing, where the async engine
+    can't be awaited; this happens once per dictionary per process.
+    """
+    connection = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        row = connection.execute(
+            "SELECT data FROM compression_dictionaries WHERE id = ?", (dict_id,)
+        ).fetchone()
+    finally:
+        connection.close()
+    return row[0] if row else None
+
+
 async def close_db() -> None:
-    """Dispose of the engine."""
-    global _engine, _session_factory
+    """Dispose of the writer, reader and archive engines."""
+    global _engine, _session_factory, _read_engine, _read_session_factory
+    global _archive_engine, _archive_session_factory
+    if _archive_engine is not None:
+        await _archive_engine.dispose()
+        _archive_engine = None
+        _archive_session_factory = None
+    if _read_engine is not None:
+        await _read_engine.dispose()
+        _read_engine = None
+        _read_session_factory = None
     if _engine is not None:
         await _engine.dispose()
         _engine = None
@@ -0,0 +1,29 @@
+# ABOUTME: Custom SQLAlchemy column types.
+# ABOUTME: CompressedText stores text as compressed BLOBs and reads legacy plain TEXT unchanged.
+
+from sqlalchemy import LargeBinary
+from sqlalchemy.types import TypeDecorator
+
+from feed_brain.db.compression import compress, decompress
+
+
+class CompressedText(TypeDecorator):
+    """Text column stored compressed (zstd or zlib, see db.compression).
+
+    Rows written before compression existed are plain TEXT; SQLite hands those
+    back as str, which passes through untouched until `compress-content`
+    rewrites them.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value: str | None, _dialect) -> bytes | None:
+        if value is None:
+            return None
+        return compress(value)
+
+    def process_result_value(self, value: bytes | str | None, _dialect) -> str | None:
+        if value is None or isinstance(value, str):
+            return value
+        return decompress(value)
@@ -0,0 +1,468 @@
+# ABOUTME: Large synthetic database generator and web-tier load test.
+# ABOUTME: gen-db bulk-loads millions of realistic rows; loadtest reports RPS and p99 per route.
+
+import asyncio
+import bisect
+import contextlib
+import itertools
+import math
+import random
+import sqlite3
+import tempfile
+import time
+from collections import defaultdict
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import structlog
+from pydantic import BaseModel
+
+from feed_brain.bench import WORDS, override_environment, peak_rss_mb, percentiles
+from feed_brain.models import Category, Feedback, Tier
+
+log = structlog.get_logger()
+
+INSERT_BATCH_SIZE = 10_000
+PHRASE_POOL_SIZE = 4_096
+
+# Share of articles per tier; the newest UNCLASSIFIED_SHARE are still unclassified
+TIER_WEIGHTS = {Tier.HIGH: 0.12, Tier.MEDIUM: 0.33, Tier.LOW: 0.55}
+UNCLASSIFIED_SHARE = 0.02
+CATEGORY_WEIGHTS = {
+    Category.AI_AGENTS: 0.2,
+    Category.CLAUDE_CODE: 0.08,
+    Category.DEVELOPMENT: 0.25,
+    Category.DEVOPS_CLOUD: 0.15,
+    Category.ENGINEERING_MANAGEMENT: 0.1,
+    Category.POLITICS_ECONOMICS: 0.08,
+    Category.MARKETING: 0.04,
+    Category.MEDIA_CULTURE: 0.05,
+    Category.HEALTH_SCIENCE: 0.05,
+}
+MISSING_BODY_SHARE = 0.03  # extraction failed: the article has no body row
+
+# Route mix for the load test, as relative weights
+DEFAULT_MIX = {"feed_list": 6.0, "article_detail": 3.0, "feedback": 1.0}
+
+
+class GenConfig(BaseModel):
+    """Shape of a generated database."""
+
+    articles: int = 1_000_000
+    sources: int = 500
+    body_bytes: int = 6_000  # median; sizes are log-normal
+    bodies: int = 1_000  # distinct bodies, reused across articles
+    days: int = 365  # fetched_at spread
+    feedback_rate: float = 0.05  # share of classified articles with feedback
+    search_bodies: bool = False  # full-text index bodies too (slow), not just metadata
+    seed: int = 0
+
+
+class LoadTestConfig(BaseModel):
+    """Shape of a load test run."""
+
+    requests: int = 2_000
+    concurrency: int = 8
+    mix: dict[str, float] = DEFAULT_MIX
+    seed: int = 0
+
+
+def _sqlite_datetime(value: datetime) -> str:
+    """Format a naive UTC datetime the way SQLAlchemy stores it in SQLite."""
+    return value.isoformat(" ", "microseconds")
+
+
+def _words(rng: random.Random, low: int, high: int) -> str:
+    return " ".join(rng.choices(WORDS, k=rng.randint(low, high))).capitalize()
+
+
+def _body(rng: random.Random, size: int) -> tuple[str, str]:
+    """Sanitized article HTML of about `size` characters, and its plain text."""
+    html, text = [], []
+    length = 0
+    while length < size:
+        kind = rng.random()
+        if kind < 0.8:
+            sentences = [_words(rng, 8, 24) + "." for _ in range(rng.randint(2, 5))]
+            word = rng.choice(WORDS)
+            part = f"<p>{' '.join(sentences)} <a href='https://example.com/{word}'>{word}</a></p>"
+        elif kind < 0.9:
+            sentences = [_words(rng, 3, 8)]
+            part = f"<h2>{sentences[0]}</h2>"
+        else:
+            sentences = [_words(rng, 4, 12) for _ in range(rng.randint(2, 5))]
+            part = "<ul>" + "".join(f"<li>{s}</li>" for s in sentences) + "</ul>"
+        html.append(part)
+        text.extend(sentences)
+        length += len(part)
+    return "".join(html), " ".join(text)
+
+
+def _body_pool(config: GenConfig, rng: random.Random) -> list[tuple[bytes, bytes, str]]:
+    """Compressed (content, markdown) pairs plus plain text, with log-normal sizes."""
+    from feed_brain.db.compression import compress
+    from feed_brain.services.markdown import html_to_markdown
+
+    pool = []
+    for _ in range(config.bodies):
+        size = int(min(300_000, max(300, rng.lognormvariate(math.log(config.body_bytes), 0.8))))
+        html, text = _body(rng, size)
+        pool.append((compress(html), compress(html_to_markdown(html)), text))
+    return pool
+
+
+def _picker(rng: random.Random, weights: dict):
+    """Weighted choice; rng.choices re-derives its setup on every call."""
+    keys = list(weights)
+    cumulative = list(itertools.accumulate(weights.values()))
+    total, rand = cumulative[-1], rng.random
+    return lambda: keys[bisect.bisect(cumulative, rand() * total)]
+
+
+def _create_schema(path: Path) -> list:
+    """Create every table and return the secondary indexes, dropped until the load is done."""
+    from sqlalchemy import create_engine
+
+    from feed_brain.db.models import Article, Base
+
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    indexes = list(Article.__table__.indexes)
+    with engine.begin() as conn:
+        for index in indexes:
+            conn.exec_driver_sql(f"DROP INDEX {index.name}")
+    engine.dispose()
+    return indexes
+
+
+def _create_indexes(path: Path, indexes: list) -> None:
+    from sqlalchemy import create_engine
+
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as conn:
+        for index in indexes:
+            index.create(conn)
+    engine.dispose()
+
+
+_ARTICLE_COLUMNS = (
+    "id", "url", "title", "author", "source_id", "published_date", "summary", "tier", "category",
+    "reason", "confidence", "money_quote", "actionables", "classifier_version", "feedback",
+    "clipping_created", "feedback_at", "fetched_at", "classified_at", "updated_at",
+)  # fmt: skip
+_INSERT_ARTICLE = (
+    f"INSERT INTO articles ({', '.join(_ARTICLE_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(_ARTICLE_COLUMNS))})"
+)
+_INSERT_BODY = "INSERT INTO article_bodies (article_id, content, markdown) VALUES (?, ?, ?)"
+_INSERT_FTS = (
+    "INSERT INTO articles_fts (rowid, title, summary, money_quote, body) VALUES (?, ?, ?, ?, ?)"
+)
+
+
+def _article_rows(config: GenConfig, rng: random.Random, pool_size: int, now: datetime):
+    """Yield (article row, body index or None), oldest first so IDs follow fetched_at.
+
+    Text fields are drawn from phrase pools: generating fresh text per row
+    costs several times more than the inserts themselves.
+    """
+    rand = rng.random
+    phrases = {
+        "title": [_words(rng, 4, 12) for _ in range(PHRASE_POOL_SIZE)],
+        "summary": [
+            _words(rng, 12, 30) + ". " + _words(rng, 8, 20) + "." for _ in range(PHRASE_POOL_SIZE)
+        ],
+        "sentence": [_words(rng, 6, 16) + "." for _ in range(PHRASE_POOL_SIZE)],
+    }
+    actionables = ['["' + _words(rng, 3, 6) + '"]' for _ in range(PHRASE_POOL_SIZE)]
+
+    def phrase(kind: str) -> str:
+        return phrases[kind][int(rand() * PHRASE_POOL_SIZE)]
+
+    tier_of = _picker(rng, {tier.value: weight for tier, weight in TIER_WEIGHTS.items()})
+    category_of = _picker(rng, {c.value: weight for c, weight in CATEGORY_WEIGHTS.items()})
+    # A few prolific sources publish most articles (Zipf-like)
+    source_of = _picker(rng, {rank: 1 / rank**1.1 for rank in range(1, config.sources + 1)})
+    span = timedelta(days=config.days) / max(config.articles, 1)
+    classified_until = int(config.articles * (1 - UNCLASSIFIED_SHARE))
+
+    for article_id in range(1, config.articles + 1):
+        fetched = now - span * (config.articles - article_id)
+        source_id = source_of()
+        tier = category = reason = confidence = quote = actions = version = None
+        classified = feedback = feedback_at = None
+        if article_id <= classified_until:
+            tier = tier_of()
+            category = category_of()
+            reason = phrase("sentence")
+            confidence = round(0.5 + rand() / 2, 2)
+            quote = phrase("sentence") if rand() < 0.7 else None
+            actions = actionables[int(rand() * PHRASE_POOL_SIZE)] if tier == Tier.HIGH else "[]"
+            version = "synthetic"
+            classified = fetched + timedelta(minutes=1 + rand() * 30)
+            if rand() < config.feedback_rate:
+                approve = 0.6 if tier == Tier.HIGH else 0.1
+                feedback = Feedback.APPROVED if rand() < approve else Feedback.SKIPPED
+                feedback_at = min(now, classified + timedelta(hours=1 + rand() * 72))
+        row = (
+            article_id,
+            f"https://source-{source_id}.example.com/posts/{article_id}",
+            phrase("title"),
+            f"Author {int(rand() * 2000)}" if rand() < 0.8 else None,
+            source_id,
+            _sqlite_datetime(fetched - timedelta(hours=rand() * 48)),
+            phrase("summary"),
+            tier,
+            category,
+            reason,
+            confidence,
+            quote,
+            actions,
+            version,
+            feedback and feedback.value,
+            feedback == Feedback.APPROVED,
+            feedback_at and _sqlite_datetime(feedback_at),
+            _sqlite_datetime(fetched),
+            classified and _sqlite_datetime(classified),
+            _sqlite_datetime(feedback_at or classified or fetched),
+        )
+        body = None if rand() < MISSING_BODY_SHARE else int(rand() * pool_size)
+        yield row, body
+
+
+def generate_database(path: Path, config: GenConfig, progress=None) -> dict:
+    """Write a synthetic feed-brain database of `config.articles` articles to `path`.
+
+    Rows go in with plain sqlite3 executemany in large batches, with journaling
+    off and the secondary indexes created after the load, which is several
+    times faster than maintaining them row by row. Bodies come from a pool of
+    pre-compressed documents, so the table is realistically sized without
+    compressing every row. Dashboard counters are computed at the end, the way
+    `repair-stats` does it.
+    """
+    if path.exists():
+        raise FileExistsError(path)
+    rng = random.Random(config.seed)
+    started = time.perf_counter()
+    pool = _body_pool(config, rng)
+    indexes = _create_schema(path)
+    now = datetime.now(UTC).replace(tzinfo=None)
+
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=OFF")
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.execute("PRAGMA cache_size=-200000")
+    conn.executemany(
+        "INSERT INTO feed_sources (id, name, url, feed_type, active, created_at) "
+        "VALUES (?, ?, ?, 'rss', 1, ?)",
+        [
+            (
+                i,
+                f"Source {i}",
+                f"https://source-{i}.example.com/feed",
+                _sqlite_datetime(now - timedelta(days=config.days)),
+            )
+            for i in range(1, config.sources + 1)
+        ],
+    )
+
+    rows = _article_rows(config, rng, len(pool), now)
+    done = 0
+    while batch := list(itertools.islice(rows, INSERT_BATCH_SIZE)):
+        conn.executemany(_INSERT_ARTICLE, (row for row, _ in batch))
+        conn.executemany(
+            _INSERT_BODY,
+            ((row[0], *pool[body][:2]) for row, body in batch if body is not None),
+        )
+        conn.executemany(
+            _INSERT_FTS,
+            (
+                (
+                    row[0],
+                    row[2],
+                    row[6],
+                    row[11],
+                    pool[body][2] if config.search_bodies and body is not None else "",
+                )
+                for row, body in batch
+            ),
+        )
+        conn.commit()
+        done += len(batch)
+        if progress:
+            progress("articles", done, config.articles)
+    conn.close()
+    loaded = time.perf_counter() - started
+
+    _create_indexes(path, indexes)
+    with override_environment({"DB_PATH": str(path)}):
+        asyncio.run(_finish_database())
+    report = {
+        "articles": config.articles,
+        "sources": config.sources,
+        "load_seconds": round(loaded, 1),
+        "total_seconds": round(time.perf_counter() - started, 1),
+        "rows_per_s": round(config.articles / loaded) if loaded else 0,
+        "size_mb": round(path.stat().st_size / 1e6, 1),
+    }
+    log.info("database_generated", path=str(path), **report)
+    return report
+
+
+async def _finish_database() -> None:
+    """Run migrations and compute the dashboard counters on the configured database."""
+    from feed_brain.db.session import close_db, get_session_factory, init_db
+    from feed_brain.services.stats import repair_stats
+
+    await init_db()
+    try:
+        async with get_session_factory()() as session:
+            await repair_stats(session)
+    finally:
+        await close_db()
+
+
+def _sample_targets(db_path: Path, rng: random.Random, count: int) -> list[tuple[int, str]]:
+    """Random (article id, feed cursor at that article) pairs from the database."""
+    from feed_brain.db.queries import encode_cursor
+
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        low, high = conn.execute("SELECT min(id), max(id) FROM articles").fetchone()
+        if low is None:
+            raise ValueError(f"{db_path} has no articles")
+        targets = []
+        for _ in range(count):
+            article_id, fetched_at = conn.execute(
+                "SELECT id, fetched_at FROM articles WHERE id >= ? ORDER BY id LIMIT 1",
+                (rng.randint(low, high),),
+            ).fetchone()
+            cursor = encode_cursor(datetime.fromisoformat(fetched_at), article_id)
+            targets.append((article_id, cursor))
+        return targets
+    finally:
+        conn.close()
+
+
+def _schedule(config: LoadTestConfig, targets: list[tuple[int, str]]):
+    """The request sequence: (route, method, path) drawn from the route mix."""
+    rng = random.Random(config.seed)
+    route_of = _picker(rng, config.mix)
+    feed_filters = ["", "tier=high", "tier=medium&category=development", "category=ai_agents"]
+    schedule = []
+    for _ in range(config.requests):
+        route = route_of()
+        article_id, cursor = rng.choice(targets)
+        if route == "feed_list":
+            query = rng.choice(feed_filters)
+            if rng.random() < 0.3:  # scrolled further down
+                query = f"{query}&cursor={cursor}" if query else f"cursor={cursor}"
+            schedule.append((route, "GET", f"/?{query}" if query else "/"))
+        elif route == "article_detail":
+            schedule.append((route, "GET", f"/article/{article_id}"))
+        elif route == "feedback":
+            verdict = rng.choice([Feedback.APPROVED, Feedback.SKIPPED])
+            path = f"/article/{article_id}/feedback?feedback={verdict.value}"
+            schedule.append((route, "POST", path))
+        else:
+            raise ValueError(f"unknown route {route!r}")
+    return schedule
+
+
+async def _drive(client, config: LoadTestConfig, schedule) -> dict:
+    """Run the schedule with `concurrency` closed-loop workers and summarize per route."""
+    # One unmeasured request per route warms templates, caches and connections
+    for route in config.mix:
+        _, method, path = next(item for item in schedule if item[0] == route)
+        await client.request(method, path)
+
+    latencies: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+    pending = iter(schedule)
+
+    async def worker() -> None:
+        for route, method, path in pending:
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, path)
+                failed = response.status_code >= 400
+            except Exception:
+                failed = True
+            latencies[route].append(time.perf_counter() - started)
+            if failed:
+                errors[route] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(config.concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "seconds": round(elapsed, 3),
+        "requests": len(schedule),
+        "rps": round(len(schedule) / elapsed, 1),
+        "routes": {
+            route: {
+                "requests": len(samples),
+                "errors": errors[route],
+                "rps": round(len(samples) / elapsed, 1),
+                **percentiles(samples),
+            }
+            for route, samples in sorted(latencies.items())
+        },
+    }
+
+
+async def _run_in_process(config: LoadTestConfig, schedule) -> dict:
+    import httpx
+
+    from feed_brain.db.session import close_db, init_db
+    from feed_brain.web.app import create_app
+
+    app = create_app()
+    await init_db()
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+            return await _drive(client, config, schedule)
+    finally:
+        await app.state.jobs.shutdown()
+        await close_db()
+
+
+async def _run_remote(url: str, config: LoadTestConfig, schedule) -> dict:
+    import httpx
+
+    limits = httpx.Limits(max_connections=config.concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30) as client:
+        return await _drive(client, config, schedule)
+
+
+def run_loadtest(db_path: Path, config: LoadTestConfig, url: str | None = None) -> dict:
+    """Load-test the feed list, article detail and feedback routes; report RPS and p99.
+
+    Article IDs and feed cursors are sampled from `db_path`. Without `url` the
+    app runs in this process against that database (ASGI, no HTTP server), so
+    the numbers are the app's own cost; with `url` a running server is hit
+    over HTTP and must be serving the same database. Feedback requests write,
+    so point this at a generated database, not the real one.
+    """
+    rng = random.Random(config.seed)
+    schedule = _schedule(config, _sample_targets(db_path, rng, min(config.requests, 1000)))
+    if url:
+        result = asyncio.run(_run_remote(url, config, schedule))
+    else:
+        with contextlib.ExitStack() as stack:
+            clippings = stack.enter_context(tempfile.TemporaryDirectory())
+            stack.enter_context(
+                override_environment({"DB_PATH": str(db_path), "CLIPPINGS_DIR": clippings})
+            )
+            result = asyncio.run(_run_in_process(config, schedule))
+
+    report = {
+        "target": url or f"in-process:{db_path}",
+        "config": config.model_dump(),
+        **result,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    log.info("loadtest_done", rps=report["rps"], requests=report["requests"])
+    return report
@@ -0,0 +1,160 @@
+# ABOUTME: Lightweight stage timers aggregated into Prometheus-style histograms.
+# ABOUTME: `with span("readability"):` times a block; when disabled it is a shared no-op.
+
+import bisect
+import contextlib
+import threading
+import time
+from collections.abc import Iterator
+from contextvars import ContextVar
+
+import structlog
+
+log = structlog.get_logger()
+
+# Upper bounds in seconds; stages range from sub-millisecond queries to multi-second LLM calls
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+METRIC_NAME = "feed_brain_stage_seconds"
+
+_NOOP = contextlib.nullcontext()
+
+
+class _Histogram:
+    __slots__ = ("counts", "sum")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(BUCKETS) + 1)  # per bucket, not cumulative; last is +Inf
+        self.sum = 0.0
+
+
+class StageMetrics:
+    """Per-stage duration histograms, safe to update from worker threads."""
+
+    def __init__(self) -> None:
+        self.enabled = True
+        self._stages: dict[str, _Histogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self._stages.get(stage)
+            if histogram is None:
+                histogram = self._stages[stage] = _Histogram()
+            histogram.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+            histogram.sum += seconds
+        if (summary := _run_summary.get()) is not None:
+            summary.add(stage, seconds)
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        """Count and total seconds per stage."""
+        with self._lock:
+            return {
+                stage: {"count": sum(h.counts), "seconds": round(h.sum, 6)}
+                for stage, h in sorted(self._stages.items())
+            }
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines = [
+            f"# HELP {METRIC_NAME} Time spent in fetch, extract, classify and clipping stages.",
+            f"# TYPE {METRIC_NAME} histogram",
+        ]
+        with self._lock:
+            stages = sorted((stage, list(h.counts), h.sum) for stage, h in self._stages.items())
+        for stage, counts, total in stages:
+            label = stage.replace("\\", "\\\\").replace('"', '\\"')
+            cumulative = 0
+            for bound, count in zip((*BUCKETS, "+Inf"), counts, strict=True):
+                cumulative += count
+                lines.append(f'{METRIC_NAME}_bucket{{stage="{label}",le="{bound}"}} {cumulative}')
+            lines.append(f'{METRIC_NAME}_sum{{stage="{label}"}} {total}')
+            lines.append(f'{METRIC_NAME}_count{{stage="{label}"}} {cumulative}')
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages.clear()
+
+
+metrics = StageMetrics()
+
+
+class _Span:
+    __slots__ = ("stage", "started")
+
+    def __init__(self, stage: str) -> None:
+        self.stage = stage
+
+    def __enter__(self) -> None:
+        self.started = time.perf_counter()
+
+    def __exit__(self, *_exc) -> None:
+        metrics.observe(self.stage, time.perf_counter() - self.started)
+
+
+def span(stage: str):
+    """Context manager timing one stage; failures are timed too.
+
+    Around an await this is wall time, including time other tasks held the
+    event loop. Disabled, it returns a shared null context, so instrumented
+    code pays one attribute check.
+    """
+    if not metrics.enabled:
+        return _NOOP
+    return _Span(stage)
+
+
+def configure(enabled: bool) -> None:
+    """Turn stage timing on or off (Settings.metrics_enabled)."""
+    metrics.enabled = enabled
+
+
+class _RunSummary:
+    def __init__(self) -> None:
+        self.stages: dict[str, list[float]] = {}  # stage -> [count, total, max]
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            entry = self.stages.setdefault(stage, [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] = max(entry[2], seconds)
+
+
+_run_summary: ContextVar[_RunSummary | None] = ContextVar("run_summary", default=None)
+
+
+@contextlib.contextmanager
+def run_summary(run: str, enabled: bool = True) -> Iterator[None]:
+    """Log one `stage_timings` line with per-stage totals for the spans inside the block.
+
+    Spans in tasks and threads started inside the block are included (they
+    inherit the context). Nested runs report only to the innermost one.
+    """
+    if not enabled or not metrics.enabled:
+        yield
+        return
+    summary = _RunSummary()
+    token = _run_summary.set(summary)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _run_summary.reset(token)
+        log.info(
+            "stage_timings",
+            run=run,
+            seconds=round(time.perf_counter() - started, 3),
+            stages={
+                stage: {
+                    "count": count,
+                    "total_s": round(total, 3),
+                    "mean_ms": round(total / count * 1000, 2),
+                    "max_ms": round(peak * 1000, 2),
+                }
+                for stage, (count, total, peak) in sorted(
+                    summary.stages.items(), key=lambda item: -item[1][1]
+                )
+            },
+        )
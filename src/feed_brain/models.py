@@ -1,8 +1,9 @@
 # ABOUTME: Pydantic schemas for data validation and serialization.
-# ABOUTME: Defines classification output, article data, and feed source schemas.
+# ABOUTME: Classification output, article views and rows, jobs, worker tasks and feed sources.
 
 from datetime import datetime
 from enum import StrEnum
+from typing import NamedTuple
 
 from pydantic import BaseModel
 
@@ -42,6 +43,14 @@ class ClassificationResult(BaseModel):
     actionables: list[str] = []
 
 
+class ClassificationBudget(BaseModel):
+    """Per-run limits for a classification pass (None = unlimited)."""
+
+    max_articles: int | None = None
+    max_seconds: float | None = None
+    max_cost_usd: float | None = None
+
+
 class FeedSourceCreate(BaseModel):
     """Schema for creating a new feed source."""
 
@@ -70,3 +79,117 @@ class ArticleView(BaseModel):
     clipping_created: bool
     fetched_at: datetime
     classified_at: datetime | None
+
+
+class ArticleRow(NamedTuple):
+    """Feed card data, built straight from a column-projected query row.
+
+    A plain tuple rather than a pydantic model: the feed list renders up to
+    200 of these per request and they need no validation.
+    """
+
+    id: int
+    title: str
+    summary: str | None
+    tier: str | None
+    category: str | None
+    feedback: str | None
+    fetched_at: datetime
+    updated_at: datetime | None
+    source_name: str | None
+
+    @property
+    def version(self) -> datetime:
+        """Row version for caching; rows from before updated_at fall back to fetched_at."""
+        return self.updated_at or self.fetched_at
+
+
+class SearchHit(BaseModel):
+    """Full-text search result with a highlighted snippet."""
+
+    id: int
+    title: str
+    source_name: str | None
+    tier: Tier | None
+    category: Category | None
+    fetched_at: datetime
+    snippet: str  # HTML-escaped, matches wrapped in <mark>
+    rank: float
+
+
+class FeedProbe(BaseModel):
+    """Reachability and format check for one feed URL."""
+
+    url: str
+    ok: bool
+    status: int | None = None
+    feed_format: str | None = None  # rss, atom, rdf
+    error: str | None = None
+    elapsed_ms: float
+
+
+class JobStatus(StrEnum):
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class TaskKind(StrEnum):
+    FEED_POLL = "feed_poll"
+    EXTRACT = "extract"
+
+
+class TaskStatus(StrEnum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    FAILED = "failed"
+
+
+class ClaimedTask(NamedTuple):
+    """A task a worker holds the lease on; `owner` fences its writes."""
+
+    id: int
+    kind: TaskKind
+    payload: str  # JSON
+    attempts: int
+    owner: str
+
+
+class FeedEntry(BaseModel):
+    """A feed item not yet stored; the payload of an extract task."""
+
+    url: str
+    title: str
+    author: str | None = None
+    published_date: datetime | None = None
+    source_id: int
+
+
+class StageProgress(BaseModel):
+    """Progress of one stage of a background job."""
+
+    done: int = 0
+    total: int | None = None
+
+
+class JobView(BaseModel):
+    """Snapshot of a background job for the UI and JSON polling."""
+
+    id: str
+    kind: str
+    status: JobStatus
+    stages: dict[str, StageProgress]
+    started_at: datetime
+    finished_at: datetime | None
+    error: str | None
+    result: dict | None
+
+
+class ClippingExport(BaseModel):
+    """Outcome of reconciling approved articles against a clippings folder or zip."""
+
+    written: int = 0  # missing clippings created
+    updated: int = 0  # stale clippings rewritten
+    unchanged: int = 0
+    edited: int = 0  # stale clippings kept because they were edited in the vault
+    conflicts: int = 0  # every candidate name is taken by another note
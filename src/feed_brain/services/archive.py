@@ -0,0 +1,197 @@
+# ABOUTME: Retention policy engine and compressed cold archive for article bodies.
+# ABOUTME: Moves expired bodies to the archive DB, restores them lazily, and vacuums.
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+
+import structlog
+from sqlalchemy import (
+    LargeBinary,
+    and_,
+    delete,
+    false,
+    func,
+    or_,
+    select,
+    text,
+    type_coerce,
+    update,
+)
+from sqlalchemy.dialects.sqlite import insert
+
+from feed_brain.config import Settings, get_settings
+from feed_brain.db.compression import compress, decompress
+from feed_brain.db.models import ArchivedBody, Article, ArticleBody
+from feed_brain.db.session import get_archive_session_factory
+from feed_brain.models import Feedback, Tier
+from feed_brain.services.markdown import html_to_markdown
+
+log = structlog.get_logger()
+
+ARCHIVE_BATCH_SIZE = 500
+
+
+def expired_condition(settings: Settings, now: datetime):
+    """SQL condition matching articles whose body has outlived the retention policy."""
+    tier_days = {
+        Tier.HIGH.value: settings.retention_days_high,
+        Tier.MEDIUM.value: settings.retention_days_medium,
+        Tier.LOW.value: settings.retention_days_low,
+    }
+    clauses = [
+        and_(Article.tier == tier, Article.fetched_at < now - timedelta(days=days))
+        for tier, days in tier_days.items()
+        if days is not None
+    ]
+    if settings.retention_days_unclassified is not None:
+        cutoff = now - timedelta(days=settings.retention_days_unclassified)
+        clauses.append(and_(Article.tier.is_(None), Article.fetched_at < cutoff))
+    if settings.retention_days_skipped is not None:
+        cutoff = now - timedelta(days=settings.retention_days_skipped)
+        clauses.append(
+            and_(Article.feedback == Feedback.SKIPPED.value, Article.fetched_at < cutoff)
+        )
+
+    condition = or_(*clauses) if clauses else false()
+    if settings.retention_keep_approved:
+        condition = and_(
+            condition,
+            or_(Article.feedback.is_(None), Article.feedback != Feedback.APPROVED.value),
+        )
+    return condition
+
+
+def _expired_bodies(settings: Settings, now: datetime):
+    """Select (article_id, stored content) of bodies due for archiving.
+
+    Content is read as stored: bodies are already in db.compression format
+    (or plain text from before compression), so they move without a round trip.
+    """
+    return (
+        select(ArticleBody.article_id, type_coerce(ArticleBody.content, LargeBinary))
+        .join(Article, Article.id == ArticleBody.article_id)
+        .where(Article.archived_at.is_(None), expired_condition(settings, now))
+        .order_by(ArticleBody.article_id)
+    )
+
+
+async def count_expired(session, settings: Settings, now: datetime | None = None) -> int:
+    """Count bodies the retention policy would archive."""
+    now = now or datetime.now(UTC).replace(tzinfo=None)
+    query = select(func.count()).select_from(_expired_bodies(settings, now).subquery())
+    return (await session.execute(query)).scalar_one()
+
+
+def _compress_batch(
+    rows: list[tuple[int, bytes | str | None]], archived_at: datetime
+) -> list[dict]:
+    return [
+        {
+            "article_id": article_id,
+            "content": content if isinstance(content, bytes) else compress(content or ""),
+            "archived_at": archived_at,
+        }
+        for article_id, content in rows
+    ]
+
+
+async def archive_expired(
+    session, archive_session, settings: Settings, now: datetime | None = None
+) -> int:
+    """Move expired bodies into the archive, leaving metadata stubs in articles.
+
+    Each batch is committed to the archive before it is deleted from the hot
+    database, so an interrupted run never loses content. Returns bodies archived.
+    """
+    now = now or datetime.now(UTC).replace(tzinfo=None)
+    archived = 0
+    while True:
+        result = await session.execute(_expired_bodies(settings, now).limit(ARCHIVE_BATCH_SIZE))
+        rows = [tuple(row) for row in result.all()]
+        if not rows:
+            break
+
+        values = await asyncio.to_thread(_compress_batch, rows, now)
+        stmt = insert(ArchivedBody).values(values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["article_id"],
+            set_={"content": stmt.excluded.content, "archived_at": stmt.excluded.archived_at},
+        )
+        await archive_session.execute(stmt)
+        await archive_session.commit()
+
+        ids = [article_id for article_id, _ in rows]
+        await session.execute(delete(ArticleBody).where(ArticleBody.article_id.in_(ids)))
+        await session.execute(update(Article).where(Article.id.in_(ids)).values(archived_at=now))
+        await session.commit()
+
+        archived += len(ids)
+        log.info("retention_progress", archived=archived)
+
+    log.info("retention_complete", archived=archived)
+    return archived
+
+
+async def read_archived_content(article_id: int) -> str | None:
+    """Load an archived body from the cold archive, if there is one."""
+    if not get_settings().archive_db_path.exists():
+        return None
+    async with get_archive_session_factory()() as archive_session:
+        result = await archive_session.execute(
+            select(ArchivedBody.content).where(ArchivedBody.article_id == article_id)
+        )
+        data = result.scalar_one_or_none()
+    return decompress(data) if data is not None else None
+
+
+async def read_archived_contents(article_ids: list[int]) -> dict[int, str]:
+    """Load several archived bodies in one query, by article ID."""
+    if not article_ids or not get_settings().archive_db_path.exists():
+        return {}
+    async with get_archive_session_factory()() as archive_session:
+        result = await archive_session.execute(
+            select(ArchivedBody.article_id, ArchivedBody.content).where(
+                ArchivedBody.article_id.in_(article_ids)
+            )
+        )
+        return {article_id: decompress(data) for article_id, data in result.all()}
+
+
+async def restore_article(article: Article) -> bool:
+    """Bring an archived body back into the hot database (caller commits).
+
+    The archive copy is kept; re-archiving simply overwrites it.
+    """
+    content = await read_archived_content(article.id)
+    if content is None:
+        return False
+    article.content = content
+    article.markdown = html_to_markdown(content)
+    article.archived_at = None
+    log.info("article_restored", article_id=article.id)
+    return True
+
+
+async def vacuum(engine, full: bool = False) -> int:
+    """Return freed pages to the filesystem. Returns pages reclaimed.
+
+    Incremental vacuum needs auto_vacuum=INCREMENTAL, which new databases get
+    from the connection profile; a full VACUUM converts older databases.
+    """
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        before = (await conn.execute(text("PRAGMA page_count"))).scalar_one()
+        auto_vacuum = (await conn.execute(text("PRAGMA auto_vacuum"))).scalar_one()
+        if full:
+            await conn.execute(text("VACUUM"))
+        elif auto_vacuum == 2:  # INCREMENTAL
+            # The pragma frees one page per step; executescript runs it to completion
+            raw = await conn.get_raw_connection()
+            await raw.driver_connection.executescript("PRAGMA incremental_vacuum;")
+        else:
+            log.warning(
+                "incremental_vacuum_unavailable", hint="run retention with --vacuum-full once"
+            )
+        after = (await conn.execute(text("PRAGMA page_count"))).scalar_one()
+    log.info("vacuum_complete", pages_before=before, pages_after=after, full=full)
+    return before - after
@@ -1,18 +1,31 @@
 # ABOUTME: Article classification service using Anthropic Haiku.
 # ABOUTME: Scores articles by relevance tier, assigns category, generates summary.
 
+import asyncio
+import hashlib
+import heapq
 import json
 import re
+import time
 from datetime import UTC, datetime
+from typing import TYPE_CHECKING
 
 import structlog
-from anthropic import AsyncAnthropic
-from sqlalchemy import select
+from sqlalchemy import case, func, or_, select
+from sqlalchemy.orm import selectinload
 
-from feed_brain.config import get_settings
-from feed_brain.db.models import Article
+from feed_brain.config import Settings, get_settings
+from feed_brain.db.models import Article, ArticleBody
+from feed_brain.db.queries import as_naive_utc
 from feed_brain.db.session import get_session_factory
-from feed_brain.models import Category, ClassificationResult, Tier
+from feed_brain.metrics import run_summary, span
+from feed_brain.models import Category, ClassificationBudget, ClassificationResult, Tier
+from feed_brain.services.jobs import Progress
+from feed_brain.services.search import index_articles
+from feed_brain.services.stats import record_changes, snapshot
+
+if TYPE_CHECKING:
+    from anthropic import AsyncAnthropic
 
 log = structlog.get_logger()
 
@@ -82,8 +95,58 @@ If the article is purely informational with no actionable content, return an emp
 """
 
 
+# Priority ranking: recency halves every RECENCY_HALF_LIFE_HOURS, and a source's
+# historical high-tier rate adds up to SOURCE_RATE_WEIGHT on top.
+RECENCY_HALF_LIFE_HOURS = 24.0
+SOURCE_RATE_WEIGHT = 0.5
+
+# Articles loaded and committed together while draining the priority queue.
+CLASSIFY_BATCH_SIZE = 20
+
+# Articles loaded per reclassification round, per unit of concurrency.
+RECLASSIFY_BATCH_PER_WORKER = 10
+
+# Typical size of a classification response, used for spend estimates.
+ESTIMATED_OUTPUT_TOKENS = 350
+
+
+def classifier_version(settings: Settings) -> str:
+    """Identify the classification profile: model plus a hash of SYSTEM_PROMPT."""
+    prompt_hash = hashlib.sha256(SYSTEM_PROMPT.encode("utf-8")).hexdigest()[:12]
+    return f"{settings.classifier_model}:{prompt_hash}"
+
+
+def _build_user_message(article: Article) -> str:
+    """Build the user prompt for an article (title, author, content preview)."""
+    content_preview = (article.content or "")[:3000]
+    return f"Title: {article.title}\nAuthor: {article.author or 'Unknown'}\n\nContent:\n{content_preview}"
+
+
+def estimate_cost(article: Article, settings: Settings) -> float:
+    """Estimate the USD cost of classifying one article (~4 characters per token)."""
+    input_tokens = (len(SYSTEM_PROMPT) + len(_build_user_message(article))) / 4
+    return (
+        input_tokens * settings.classifier_input_cost_per_mtok
+        + ESTIMATED_OUTPUT_TOKENS * settings.classifier_output_cost_per_mtok
+    ) / 1_000_000
+
+
+def anthropic_client(settings: Settings) -> "AsyncAnthropic":
+    """Anthropic client for the classifier; base URL overridable (e.g. a local fake).
+
+    The SDK takes about a second to import, so it is only loaded here, once
+    there is something to classify.
+    """
+    from anthropic import AsyncAnthropic
+
+    return AsyncAnthropic(
+        api_key=settings.anthropic_api_key.get_secret_value(),
+        base_url=settings.anthropic_base_url,
+    )
+
+
 async def classify_article(
-    article: Article, client: AsyncAnthropic | None = None
+    article: Article, client: "AsyncAnthropic | None" = None
 ) -> ClassificationResult | None:
     """Classify a single article using Haiku.
 
@@ -94,18 +157,16 @@ async def classify_article(
         if settings.anthropic_api_key is None:
             log.error("no_anthropic_api_key")
             return None
-        client = AsyncAnthropic(api_key=settings.anthropic_api_key.get_secret_value())
-
-    content_preview = (article.content or "")[:3000]
-    user_message = f"Title: {article.title}\nAuthor: {article.author or 'Unknown'}\n\nContent:\n{content_preview}"
+        client = anthropic_client(settings)
 
     try:
-        response = await client.messages.create(
-            model=settings.classifier_model,
-            max_tokens=1000,
-            system=SYSTEM_PROMPT,
-            messages=[{"role": "user", "content": user_message}],
-        )
+        with span("classify.llm_call"):
+            response = await client.messages.create(
+                model=settings.classifier_model,
+                max_tokens=1000,
+                system=SYSTEM_PROMPT,
+                messages=[{"role": "user", "content": _build_user_message(article)}],
+            )
 
         text = response.content[0].text.strip() if response.content else ""
         log.debug("classifier_raw_response", text=text[:200], stop_reason=response.stop_reason)
@@ -137,9 +198,87 @@ async def classify_article(
         return None
 
 
-async def classify_unclassified() -> int:
-    """Classify all articles that haven't been classified yet.
+def _priority(published: datetime, now: datetime, high_rate: float) -> float:
+    """Score an article: fresh articles from high-yield sources come first."""
+    age_hours = max((now - published).total_seconds() / 3600, 0.0)
+    return 0.5 ** (age_hours / RECENCY_HALF_LIFE_HOURS) + SOURCE_RATE_WEIGHT * high_rate
 
+
+async def _source_high_rates(session) -> dict[int | None, float]:
+    """Historical share of high-tier classifications per source."""
+    result = await session.execute(
+        select(
+            Article.source_id,
+            func.count(),
+            func.sum(case((Article.tier == Tier.HIGH.value, 1), else_=0)),
+        )
+        .where(Article.classified_at.isnot(None))
+        .group_by(Article.source_id)
+    )
+    # Laplace smoothing keeps sources with little history close to 0.5
+    return {source_id: (high + 1) / (total + 2) for source_id, total, high in result.all()}
+
+
+async def _rank_unclassified(session) -> list[tuple[float, int]]:
+    """Build a priority heap of unclassified article IDs.
+
+    Only lightweight columns are loaded; entries are (-score, article_id) so
+    heappop yields the most urgent article first.
+    """
+    rates = await _source_high_rates(session)
+    result = await session.execute(
+        select(Article.id, Article.source_id, Article.published_date, Article.fetched_at)
+        .join(Article.body)
+        .where(Article.classified_at.is_(None), ArticleBody.content.isnot(None))
+    )
+    now = as_naive_utc(datetime.now(UTC))
+    heap = [
+        (
+            -_priority(as_naive_utc(published or fetched), now, rates.get(source_id, 0.5)),
+            article_id,
+        )
+        for article_id, source_id, published, fetched in result.all()
+    ]
+    heapq.heapify(heap)
+    return heap
+
+
+def _budget_exhausted(
+    budget: ClassificationBudget, attempted: int, elapsed: float, projected_cost: float
+) -> str | None:
+    """Return the name of the exhausted budget, or None if the next article fits."""
+    if budget.max_articles is not None and attempted >= budget.max_articles:
+        return "max_articles"
+    if budget.max_seconds is not None and elapsed >= budget.max_seconds:
+        return "max_seconds"
+    if budget.max_cost_usd is not None and projected_cost > budget.max_cost_usd:
+        return "max_cost_usd"
+    return None
+
+
+def _apply_classification(
+    article: Article, classification: ClassificationResult, version: str
+) -> None:
+    """Copy a classification result and its profile version onto the article row."""
+    article.summary = classification.summary
+    article.tier = classification.tier.value
+    article.category = classification.category.value
+    article.reason = classification.reason
+    article.confidence = classification.confidence
+    article.money_quote = classification.money_quote
+    article.actionables = json.dumps(classification.actionables)
+    article.classifier_version = version
+    article.classified_at = datetime.now(UTC)
+
+
+async def classify_unclassified(
+    budget: ClassificationBudget | None = None, progress: Progress | None = None
+) -> int:
+    """Classify unclassified articles in priority order, within per-run budgets.
+
+    Budgets default to the classify_max_* settings. When one is exhausted the
+    run stops cleanly; remaining articles are left for the next run. progress,
+    if given, receives the running "classified" count after each article.
     Returns the number of articles classified.
     """
     settings = get_settings()
@@ -147,33 +286,230 @@ async def classify_unclassified() -> int:
         log.error("no_anthropic_api_key")
         return 0
 
-    client = AsyncAnthropic(api_key=settings.anthropic_api_key.get_secret_value())
-    session_factory = get_session_factory()
-    classified = 0
+    if budget is None:
+        budget = ClassificationBudget(
+            max_articles=settings.classify_max_articles,
+            max_seconds=settings.classify_max_seconds,
+            max_cost_usd=settings.classify_max_cost_usd,
+        )
 
+    with run_summary("classify", settings.metrics_log_summary):
+        return await _classify_queue(get_session_factory(), None, settings, budget, progress)
+
+
+async def _load_articles(session_factory, article_ids: list[int]) -> dict[int, Article]:
+    """Articles with their bodies, loaded in a short session and returned detached."""
     async with session_factory() as session:
         result = await session.execute(
-            select(Article).where(
-                Article.classified_at.is_(None),
-                Article.content.isnot(None),
-            )
+            select(Article).options(selectinload(Article.body)).where(Article.id.in_(article_ids))
         )
-        articles = result.scalars().all()
+        return {article.id: article for article in result.scalars().all()}
+
+
+async def _store_classifications(
+    session_factory, results: list[tuple[int, ClassificationResult]], version: str
+) -> None:
+    """Write classification results in one short transaction.
 
-        for article in articles:
+    Rows are reloaded first, so feedback given while the API calls ran is
+    neither overwritten nor miscounted in the stats.
+    """
+    if not results:
+        return
+    with span("classify.db_commit"):
+        async with session_factory() as session:
+            articles = await session.execute(
+                select(Article)
+                .options(selectinload(Article.body))
+                .where(Article.id.in_([article_id for article_id, _ in results]))
+            )
+            current = {article.id: article for article in articles.scalars().all()}
+            updated = []
+            changes = []
+            for article_id, classification in results:
+                if (article := current.get(article_id)) is None:
+                    continue  # deleted meanwhile
+                before = snapshot(article)
+                _apply_classification(article, classification, version)
+                changes.append((before, snapshot(article)))
+                updated.append(article)
+            await index_articles(session, updated)
+            await record_changes(session, changes)
+            await session.commit()
+
+
+async def _classify_queue(
+    session_factory,
+    client: "AsyncAnthropic | None",
+    settings: Settings,
+    budget: ClassificationBudget,
+    progress: Progress | None = None,
+) -> int:
+    """Drain the priority queue until it is empty or a budget runs out.
+
+    Without a client one is created once the queue turns out to be non-empty,
+    so runs with nothing to classify never load the SDK. No session is held
+    during API calls: each batch is loaded, classified, then written in its
+    own short transaction.
+    """
+    async with session_factory() as session:
+        queue = await _rank_unclassified(session)
+    if queue and client is None:
+        client = anthropic_client(settings)
+    version = classifier_version(settings)
+    total = len(queue)
+    started = time.monotonic()
+    spent = 0.0
+    attempted = 0
+    classified = 0
+    stop_reason = None
+    if progress:
+        progress("classified", 0, total)
+
+    while queue and stop_reason is None:
+        batch_ids = [heapq.heappop(queue)[1] for _ in range(min(CLASSIFY_BATCH_SIZE, len(queue)))]
+        articles = await _load_articles(session_factory, batch_ids)
+        results = []
+
+        for article_id in batch_ids:
+            if (article := articles.get(article_id)) is None:
+                continue  # deleted since the queue was ranked
+            cost = estimate_cost(article, settings)
+            stop_reason = _budget_exhausted(
+                budget, attempted, time.monotonic() - started, spent + cost
+            )
+            if stop_reason:
+                break
+
+            attempted += 1
+            spent += cost
             classification = await classify_article(article, client)
             if classification:
-                article.summary = classification.summary
-                article.tier = classification.tier.value
-                article.category = classification.category.value
-                article.reason = classification.reason
-                article.confidence = classification.confidence
-                article.money_quote = classification.money_quote
-                article.actionables = json.dumps(classification.actionables)
-                article.classified_at = datetime.now(UTC)
+                results.append((article_id, classification))
                 classified += 1
+            if progress:
+                progress("classified", classified, total)
 
-        await session.commit()
+        await _store_classifications(session_factory, results, version)
 
-    log.info("classification_complete", classified=classified, total=len(articles))
+    if stop_reason:
+        log.info(
+            "classification_budget_exhausted",
+            budget=stop_reason,
+            remaining=total - attempted,
+        )
+    log.info(
+        "classification_complete",
+        classified=classified,
+        total=total,
+        estimated_cost_usd=round(spent, 4),
+    )
     return classified
+
+
+def _outdated_query(version: str, since: datetime | None, tiers: list[str] | None):
+    """Select IDs of articles classified under a profile other than `version`."""
+    query = (
+        select(Article.id)
+        .join(Article.body)
+        .where(
+            Article.classified_at.isnot(None),
+            ArticleBody.content.isnot(None),
+            or_(Article.classifier_version.is_(None), Article.classifier_version != version),
+        )
+    )
+    if since is not None:
+        query = query.where(Article.fetched_at >= as_naive_utc(since))
+    if tiers:
+        query = query.where(Article.tier.in_(tiers))
+    return query.order_by(Article.fetched_at.desc())
+
+
+async def count_outdated(since: datetime | None = None, tiers: list[str] | None = None) -> int:
+    """Count articles that reclassify() would process."""
+    version = classifier_version(get_settings())
+    session_factory = get_session_factory()
+    async with session_factory() as session:
+        result = await session.execute(
+            select(func.count()).select_from(_outdated_query(version, since, tiers).subquery())
+        )
+        return result.scalar_one()
+
+
+async def reclassify(
+    since: datetime | None = None,
+    tiers: list[str] | None = None,
+    concurrency: int | None = None,
+    limit: int | None = None,
+) -> int:
+    """Reclassify articles classified under an older prompt/model version.
+
+    Only outdated rows are touched, optionally restricted to articles fetched
+    after `since` and to the given tiers. Returns the number reclassified.
+    """
+    settings = get_settings()
+    if settings.anthropic_api_key is None:
+        log.error("no_anthropic_api_key")
+        return 0
+
+    client = anthropic_client(settings)
+
+    with run_summary("reclassify", settings.metrics_log_summary):
+        return await _reclassify_outdated(
+            get_session_factory(),
+            client,
+            settings,
+            since=since,
+            tiers=tiers,
+            concurrency=concurrency or settings.reclassify_concurrency,
+            limit=limit,
+        )
+
+
+async def _reclassify_outdated(
+    session_factory,
+    client: "AsyncAnthropic",
+    settings: Settings,
+    *,
+    since: datetime | None,
+    tiers: list[str] | None,
+    concurrency: int,
+    limit: int | None,
+) -> int:
+    """Reclassify outdated rows in batches, `concurrency` API calls at a time.
+
+    Like _classify_queue, no session is held while the calls run.
+    """
+    version = classifier_version(settings)
+    query = _outdated_query(version, since, tiers)
+    if limit is not None:
+        query = query.limit(limit)
+    async with session_factory() as session:
+        article_ids = (await session.execute(query)).scalars().all()
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _classify(article: Article) -> ClassificationResult | None:
+        async with semaphore:
+            return await classify_article(article, client)
+
+    batch_size = concurrency * RECLASSIFY_BATCH_PER_WORKER
+    reclassified = 0
+    for start in range(0, len(article_ids), batch_size):
+        batch_ids = article_ids[start : start + batch_size]
+        articles = list((await _load_articles(session_factory, batch_ids)).values())
+        classifications = await asyncio.gather(*(_classify(article) for article in articles))
+
+        results = [
+            (article.id, classification)
+            for article, classification in zip(articles, classifications, strict=True)
+            if classification
+        ]
+        await _store_classifications(session_factory, results, version)
+        reclassified += len(results)
+        log.info("reclassify_progress", done=start + len(batch_ids), total=len(article_ids))
+
+    log.info(
+        "reclassify_complete", reclassified=reclassified, total=len(article_ids), version=version
+    )
+    return reclassified
@@ -1,17 +1,34 @@
 # ABOUTME: Obsidian clipping generator for approved articles.
-# ABOUTME: Creates markdown files in the Clippings/ folder matching existing format.
+# ABOUTME: Writes markdown files atomically into the Clippings/ folder from background batches.
 
+import asyncio
+import hashlib
 import json
+import os
 from datetime import UTC, datetime
 from pathlib import Path
 
 import structlog
+from sqlalchemy import and_, func, select, update
+from sqlalchemy.orm import selectinload
 
 from feed_brain.config import get_settings
 from feed_brain.db.models import Article
+from feed_brain.db.session import get_session_factory
+from feed_brain.metrics import run_summary, span
+from feed_brain.models import Feedback
+from feed_brain.services.archive import restore_article
+from feed_brain.services.jobs import Progress
+from feed_brain.services.markdown import html_to_markdown
 
 log = structlog.get_logger()
 
+CLIPPING_BATCH_SIZE = 50
+
+# Frontmatter field holding a hash of the rest of the file as rendered, so
+# clippings edited in the vault can be told apart from ones that are just stale
+RENDER_HASH_FIELD = "feed-brain-hash: "
+
 CLIPPING_TEMPLATE = """\
 ---
 title: {title}
@@ -24,6 +41,7 @@ description: {summary}
 tags:
   - "clippings"
   - "feed-brain"
+feed-brain-hash: {render_hash}
 ---
 
 {ai_section}{content}
@@ -63,25 +81,64 @@ def _sanitize_filename(title: str) -> str:
     return result.strip()[:200]
 
 
-async def create_clipping(article: Article, clippings_dir: Path | None = None) -> bool:
-    """Create a markdown clipping file for an approved article.
+def candidate_names(article: Article) -> tuple[str, str]:
+    """Filenames an article's clipping may have: the title, then the ID-suffixed fallback."""
+    stem = _sanitize_filename(article.title) or "Untitled"
+    return f"{stem}.md", f"{stem} ({article.id}).md"
 
-    Returns True if the file was created successfully.
-    """
-    settings = get_settings()
-    target_dir = clippings_dir or settings.clippings_dir
 
-    if not target_dir.exists():
-        log.error("clippings_dir_not_found", path=str(target_dir))
-        return False
+def read_text(path: Path) -> str | None:
+    """A clipping's text, or None if it can't be read."""
+    try:
+        return path.read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError):
+        return None
 
-    filename = _sanitize_filename(article.title) + ".md"
-    filepath = target_dir / filename
 
-    if filepath.exists():
-        log.warning("clipping_already_exists", path=str(filepath))
-        return True
+def clipping_source(text: str) -> str | None:
+    """The article URL recorded in a clipping's frontmatter, if it has one."""
+    for line in text.split("\n", 40)[:40]:
+        if line.startswith("source: "):
+            try:
+                return json.loads(line.removeprefix("source: "))
+            except ValueError:
+                return None
+    return None
+
+
+def _render_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
 
+
+def split_render_hash(text: str) -> tuple[str, str | None]:
+    """A clipping's text without its render hash line, and the hash it records (if any)."""
+    lines = text.split("\n", 40)
+    for index, line in enumerate(lines[:40]):
+        if line.startswith(RENDER_HASH_FIELD):
+            del lines[index]
+            return "\n".join(lines), line.removeprefix(RENDER_HASH_FIELD)
+    return text, None
+
+
+def clipping_edited(text: str) -> bool:
+    """Whether a clipping was changed since it was rendered; files without a hash count as edited."""
+    unhashed, recorded = split_render_hash(text)
+    return recorded != _render_hash(unhashed)
+
+
+def render_clipping(article: Article, markdown: str | None = None) -> str:
+    """Render the markdown clipping for an article.
+
+    Uses `markdown` when given, else the Markdown stored at extraction (the
+    body must be loaded); bodies stored before that are converted here. The
+    output depends only on the article, so re-rendering reproduces the file.
+    The frontmatter records a hash of the rest of the text (RENDER_HASH_FIELD).
+    """
+    if markdown is None:
+        markdown = article.markdown
+    if markdown is None:
+        with span("clipping.markdown"):
+            markdown = html_to_markdown(article.content or "")
     published = ""
     if article.published_date:
         published = article.published_date.strftime("%Y-%m-%d")
@@ -90,21 +147,166 @@ async def create_clipping(article: Article, clippings_dir: Path | None = None) -
         """Safely quote a string for YAML frontmatter using JSON encoding."""
         return json.dumps(value)
 
-    content = CLIPPING_TEMPLATE.format(
+    text = CLIPPING_TEMPLATE.format(
+        render_hash="",
         title=_yaml_str(article.title),
         url=_yaml_str(article.url),
         author=_yaml_str(article.author or "Unknown"),
         published=published,
-        created=datetime.now(UTC).strftime("%Y-%m-%d"),
+        created=(article.feedback_at or datetime.now(UTC)).strftime("%Y-%m-%d"),
         summary=_yaml_str(article.summary or ""),
         ai_section=_build_ai_section(article),
-        content=article.content or "",
+        content=markdown,
     )
+    # Frontmatter values are single-line JSON, so the first match is the field
+    unhashed, _ = split_render_hash(text)
+    field = f"\n{RENDER_HASH_FIELD}"
+    return text.replace(f"{field}\n", f"{field}{_render_hash(unhashed)}\n", 1)
 
-    try:
-        filepath.write_text(content, encoding="utf-8")
-        log.info("clipping_created", path=str(filepath))
+
+class ClippingWriter:
+    """Writes clippings into one vault folder with a single directory scan.
+
+    Vault folders are often cloud-synced, where every stat can stall, so the
+    existing filenames are listed once into a case-insensitive index instead of
+    checking each path. Names are assigned deterministically: the title, or
+    "Title (<article id>).md" when another file already has the title. Files
+    appear atomically (temp file, then rename), so a half-written clipping is
+    never synced. All methods block; call them off the event loop.
+    """
+
+    def __init__(self, target_dir: Path) -> None:
+        self.target_dir = target_dir
+        self._names: set[str] | None = None
+
+    @property
+    def names(self) -> set[str]:
+        """Casefolded names in the folder, listed on first use."""
+        if self._names is None:
+            with os.scandir(self.target_dir) as entries:
+                self._names = {entry.name.casefold() for entry in entries}
+        return self._names
+
+    def assign(self, article: Article) -> tuple[Path, bool]:
+        """Pick the clipping path for an article; returns (path, already_written).
+
+        A file with the title is this article's own clipping (written by a run
+        that didn't get to flag it) when its frontmatter source is the URL.
+        """
+        preferred, suffixed = candidate_names(article)
+        if preferred.casefold() not in self.names:
+            return self.target_dir / preferred, False
+        path = self.target_dir / preferred
+        if clipping_source(read_text(path) or "") == article.url:
+            return path, True
+        return self.target_dir / suffixed, suffixed.casefold() in self.names
+
+    def write(self, path: Path, content: str) -> bool:
+        """Atomically create `path`; returns True if the clipping is on disk afterwards."""
+        tmp = path.with_name(f".{path.name}.tmp")
+        try:
+            with span("clipping.write"):
+                tmp.write_text(content, encoding="utf-8")
+                os.replace(tmp, path)
+        except OSError as e:
+            log.error("clipping_write_error", path=str(path), error=str(e))
+            tmp.unlink(missing_ok=True)
+            return False
+        self.names.add(path.name.casefold())
+        log.info("clipping_created", path=str(path))
         return True
-    except OSError as e:
-        log.error("clipping_write_error", path=str(filepath), error=str(e))
+
+    def write_batch(self, items: list[tuple[Article, str]]) -> list[int]:
+        """Write rendered (article, markdown) pairs; returns the IDs of articles now clipped."""
+        clipped = []
+        for article, content in items:
+            path, exists = self.assign(article)
+            if exists:
+                log.warning("clipping_already_exists", path=str(path))
+            if exists or self.write(path, content):
+                clipped.append(article.id)
+        return clipped
+
+
+async def create_clipping(article: Article, clippings_dir: Path | None = None) -> bool:
+    """Create a markdown clipping file for an approved article.
+
+    Returns True if the file was created successfully.
+    """
+    settings = get_settings()
+    target_dir = clippings_dir or settings.clippings_dir
+
+    if not await asyncio.to_thread(target_dir.is_dir):
+        log.error("clippings_dir_not_found", path=str(target_dir))
         return False
+
+    writer = ClippingWriter(target_dir)
+    clipped = await asyncio.to_thread(writer.write_batch, [(article, render_clipping(article))])
+    return bool(clipped)
+
+
+async def write_pending_clippings(
+    progress: Progress | None = None,
+    clippings_dir: Path | None = None,
+    batch_size: int = CLIPPING_BATCH_SIZE,
+) -> int:
+    """Create clippings for approved articles that don't have one yet.
+
+    Works in batches: load and render articles in a short transaction, write
+    the files off the event loop with no database connection held (the vault
+    may be slow), then flag the batch with one UPDATE in its own short
+    transaction. Returns clippings written.
+    """
+    settings = get_settings()
+    target_dir = clippings_dir or settings.clippings_dir
+    if not await asyncio.to_thread(target_dir.is_dir):
+        log.error("clippings_dir_not_found", path=str(target_dir))
+        return 0
+
+    pending = and_(Article.feedback == Feedback.APPROVED.value, Article.clipping_created.is_(False))
+    session_factory = get_session_factory()
+    writer = ClippingWriter(target_dir)
+    written = 0
+    last_id = 0
+    with run_summary("clippings", settings.metrics_log_summary):
+        async with session_factory() as session:
+            total = (await session.execute(select(func.count()).where(pending))).scalar_one()
+        if progress:
+            progress("clippings", 0, total)
+        while True:
+            async with session_factory() as session:
+                result = await session.execute(
+                    select(Article)
+                    .options(selectinload(Article.body))
+                    .where(pending, Article.id > last_id)
+                    .order_by(Article.id)
+                    .limit(batch_size)
+                )
+                articles = result.scalars().all()
+                if not articles:
+                    break
+                last_id = articles[-1].id
+
+                for article in articles:
+                    if article.body is None and article.archived_at is not None:
+                        with span("clipping.restore"):
+                            await restore_article(article)
+                items = [(article, render_clipping(article)) for article in articles]
+                await session.commit()  # keeps restored bodies
+
+            clipped = await asyncio.to_thread(writer.write_batch, items)
+            if clipped:
+                with span("clipping.db_commit"):
+                    async with session_factory() as session:
+                        await session.execute(
+                            update(Article)
+                            .where(Article.id.in_(clipped))
+                            .values(clipping_created=True)
+                        )
+                        await session.commit()
+            written += len(clipped)
+            if progress:
+                progress("clippings", written, total)
+
+    log.info("pending_clippings_written", written=written, total=total)
+    return written
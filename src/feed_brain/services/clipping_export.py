@@ -0,0 +1,197 @@
+# ABOUTME: Reconciles approved articles with the clippings vault, or exports them to a zip.
+# ABOUTME: Rewrites missing or stale clippings with bounded parallel file I/O.
+
+import asyncio
+import zipfile
+from pathlib import Path
+
+import structlog
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import selectinload
+
+from feed_brain.db.models import Article
+from feed_brain.models import ClippingExport, Feedback
+from feed_brain.services.archive import read_archived_content
+from feed_brain.services.clipping import (
+    ClippingWriter,
+    candidate_names,
+    clipping_edited,
+    clipping_source,
+    read_text,
+    render_clipping,
+    split_render_hash,
+)
+from feed_brain.services.jobs import Progress
+from feed_brain.services.markdown import html_to_markdown
+
+log = structlog.get_logger()
+
+EXPORT_BATCH_SIZE = 200
+EXPORT_CONCURRENCY = 8
+
+_approved = Article.feedback == Feedback.APPROVED.value
+
+
+async def _render_batch(articles: list[Article]) -> list[tuple[Article, str]]:
+    """Render clippings, reading archived bodies from cold storage without restoring them."""
+    rendered = []
+    for article in articles:
+        markdown = None
+        if article.body is None and article.archived_at is not None:
+            markdown = html_to_markdown(await read_archived_content(article.id) or "")
+        rendered.append((article, render_clipping(article, markdown)))
+    return rendered
+
+
+async def _approved_batches(session, batch_size: int):
+    """Approved articles with bodies loaded, in ID order so naming is deterministic."""
+    last_id = 0
+    while True:
+        result = await session.execute(
+            select(Article)
+            .options(selectinload(Article.body))
+            .where(_approved, Article.id > last_id)
+            .order_by(Article.id)
+            .limit(batch_size)
+        )
+        articles = result.scalars().all()
+        if not articles:
+            return
+        last_id = articles[-1].id
+        yield articles
+
+
+async def export_clippings(
+    session,
+    target_dir: Path,
+    *,
+    concurrency: int = EXPORT_CONCURRENCY,
+    batch_size: int = EXPORT_BATCH_SIZE,
+    dry_run: bool = False,
+    force: bool = False,
+    mark_created: bool = False,
+    progress: Progress | None = None,
+) -> ClippingExport:
+    """Bring `target_dir` in line with the approved articles.
+
+    The folder is listed once. A clipping is ours when its frontmatter source
+    is the article URL; it is stale when the render hash in its frontmatter
+    differs from a fresh render's.
+    Stale clippings are rewritten only if their render hash shows they weren't
+    edited in the vault since; edited ones are kept and counted unless `force`.
+    Names follow ClippingWriter: the title, else "Title (<id>).md", so other
+    notes are never overwritten. Reads and writes run in worker threads, at
+    most `concurrency` at a time. With mark_created the articles found or
+    written get clipping_created set.
+    """
+    writer = ClippingWriter(target_dir)
+    await asyncio.to_thread(lambda: writer.names)
+    limit = asyncio.Semaphore(concurrency)
+
+    async def io(fn, *args):
+        async with limit:
+            return await asyncio.to_thread(fn, *args)
+
+    result = ClippingExport()
+    claimed: set[str] = set()  # names taken by earlier articles in this run
+    total = (await session.execute(select(func.count()).where(_approved))).scalar_one()
+    done = 0
+    async for articles in _approved_batches(session, batch_size):
+        rendered = await _render_batch(articles)
+
+        # Read every existing candidate file in parallel to learn who owns it
+        existing = sorted(
+            {
+                name
+                for article, _ in rendered
+                for name in candidate_names(article)
+                if name.casefold() in writer.names and name.casefold() not in claimed
+            }
+        )
+        texts = await asyncio.gather(*(io(read_text, target_dir / name) for name in existing))
+        on_disk = {name.casefold(): text for name, text in zip(existing, texts, strict=True)}
+
+        writes: list[tuple[Article, str, str]] = []
+        clipped: list[int] = []
+        for article, content in rendered:
+            names = [n for n in candidate_names(article) if n.casefold() not in claimed]
+            owned = next(
+                (
+                    n
+                    for n in names
+                    if clipping_source(on_disk.get(n.casefold()) or "") == article.url
+                ),
+                None,
+            )
+            free = next((n for n in names if n.casefold() not in writer.names), None)
+            current, recorded = split_render_hash(on_disk[owned.casefold()] if owned else "")
+            fresh, fresh_hash = split_render_hash(content)
+            # Unchanged when the render it came from is still current, even if edited since
+            if owned and (recorded == fresh_hash or current == fresh):
+                result.unchanged += 1
+                clipped.append(article.id)
+            elif owned and not force and clipping_edited(on_disk[owned.casefold()]):
+                result.edited += 1
+                clipped.append(article.id)
+                log.warning("clipping_edited_kept", article_id=article.id, path=owned)
+            elif owned:
+                writes.append((article, owned, content))
+                result.updated += 1
+            elif free:
+                writes.append((article, free, content))
+                result.written += 1
+            else:
+                result.conflicts += 1
+                log.warning("clipping_name_conflict", article_id=article.id, title=article.title)
+                continue
+            claimed.add((owned or free).casefold())
+
+        if not dry_run:
+            ok = await asyncio.gather(
+                *(io(writer.write, target_dir / name, content) for _, name, content in writes)
+            )
+            clipped.extend(
+                article.id for (article, _, _), wrote in zip(writes, ok, strict=True) if wrote
+            )
+            if mark_created and clipped:
+                await session.execute(
+                    update(Article).where(Article.id.in_(clipped)).values(clipping_created=True)
+                )
+                await session.commit()
+
+        done += len(articles)
+        if progress:
+            progress("clippings", done, total)
+
+    log.info("clippings_exported", target=str(target_dir), dry_run=dry_run, **result.model_dump())
+    return result
+
+
+async def export_clippings_zip(
+    session, zip_path: Path, *, batch_size: int = EXPORT_BATCH_SIZE
+) -> ClippingExport:
+    """Write every approved article's clipping into a new zip archive in one pass."""
+    result = ClippingExport()
+    claimed: set[str] = set()
+    with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        async for articles in _approved_batches(session, batch_size):
+            entries = []
+            for article, content in await _render_batch(articles):
+                name = next(
+                    (n for n in candidate_names(article) if n.casefold() not in claimed), None
+                )
+                if name is None:
+                    result.conflicts += 1
+                    continue
+                claimed.add(name.casefold())
+                entries.append((name, content))
+
+            def write_entries(entries=entries) -> None:
+                for name, content in entries:
+                    archive.writestr(name, content)
+
+            await asyncio.to_thread(write_entries)
+            result.written += len(entries)
+
+    log.info("clippings_zipped", path=str(zip_path), **result.model_dump())
+    return result
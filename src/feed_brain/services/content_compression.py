@@ -0,0 +1,82 @@
+# ABOUTME: Maintenance for compressed article bodies.
+# ABOUTME: Trains the shared zstd dictionary and rewrites legacy plain-text bodies compressed.
+
+import asyncio
+
+import structlog
+from sqlalchemy import LargeBinary, bindparam, func, select, type_coerce, update
+
+from feed_brain.db import compression
+from feed_brain.db.models import ArticleBody, CompressionDictionary
+
+log = structlog.get_logger()
+
+COMPRESS_BATCH_SIZE = 500
+DICTIONARY_SAMPLES = 2000
+
+_stored_content = type_coerce(ArticleBody.content, LargeBinary)
+
+
+async def train_content_dictionary(session, samples: int = DICTIONARY_SAMPLES) -> int:
+    """Train a zstd dictionary on a random sample of bodies and make it active.
+
+    Small documents compress much better against a shared dictionary. Returns the
+    dictionary id; the dictionary is stored so rows written with it stay readable.
+    """
+    result = await session.execute(
+        select(ArticleBody.content)
+        .where(ArticleBody.content.is_not(None))
+        .order_by(func.random())
+        .limit(samples)
+    )
+    documents = [content for content in result.scalars() if content]
+    data = await asyncio.to_thread(compression.train_dictionary, documents)
+    dict_id = compression.register_dictionary(data)
+    await session.merge(CompressionDictionary(id=dict_id, data=data))
+    await session.commit()
+    log.info("compression_dictionary_trained", dict_id=dict_id, samples=len(documents))
+    return dict_id
+
+
+def _recompress(rows: list[tuple[int, bytes | str]]) -> list[dict]:
+    encoded = []
+    for article_id, stored in rows:
+        text = stored if isinstance(stored, str) else compression.decompress(stored)
+        encoded.append({"b_article_id": article_id, "b_content": compression.compress(text)})
+    return encoded
+
+
+async def compress_existing(
+    session, recompress: bool = False, batch_size: int = COMPRESS_BATCH_SIZE
+) -> int:
+    """Rewrite plain-text bodies in compressed form, one committed batch at a time.
+
+    With recompress=True every body is rewritten, e.g. to pick up a newly
+    trained dictionary. Returns the number of bodies rewritten.
+    """
+    statement = (
+        update(ArticleBody.__table__)
+        .where(ArticleBody.__table__.c.article_id == bindparam("b_article_id"))
+        .values(content=bindparam("b_content", type_=LargeBinary))
+    )
+    rewritten = 0
+    last_id = 0
+    while True:
+        query = (
+            select(ArticleBody.article_id, _stored_content)
+            .where(ArticleBody.article_id > last_id, ArticleBody.content.is_not(None))
+            .order_by(ArticleBody.article_id)
+            .limit(batch_size)
+        )
+        if not recompress:
+            query = query.where(func.typeof(ArticleBody.content) == "text")
+        rows = (await session.execute(query)).all()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        encoded = await asyncio.to_thread(_recompress, rows)
+        await session.execute(statement, encoded)
+        await session.commit()
+        rewritten += len(encoded)
+        log.info("content_compressed_batch", rewritten=rewritten)
+    return rewritten
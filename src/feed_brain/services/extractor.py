@@ -7,6 +7,7 @@ from bs4 import BeautifulSoup
 from readability import Document
 
 from feed_brain.config import Settings, get_settings
+from feed_brain.metrics import span
 
 log = structlog.get_logger()
 
@@ -41,6 +42,20 @@ ALLOWED_TAGS = [
 ALLOWED_ATTRS = {"a": ["href"], "img": ["src", "alt"]}
 
 
+def sanitize_html(html_content: str) -> BeautifulSoup:
+    """Parse HTML keeping only ALLOWED_TAGS (others unwrapped) and ALLOWED_ATTRS."""
+    soup = BeautifulSoup(html_content, "html.parser")
+    for tag in soup.find_all(True):
+        if tag.name not in ALLOWED_TAGS:
+            tag.unwrap()
+        else:
+            allowed = ALLOWED_ATTRS.get(tag.name, [])
+            for attr in list(tag.attrs):
+                if attr not in allowed:
+                    del tag[attr]
+    return soup
+
+
 async def extract_content(url: str, settings: Settings | None = None) -> str | None:
     """Download and extract sanitized HTML content from a URL.
 
@@ -49,30 +64,22 @@ async def extract_content(url: str, settings: Settings | None = None) -> str | N
     """
     settings = settings or get_settings()
     try:
-        async with httpx.AsyncClient(
-            timeout=settings.feed_timeout,
-            headers={"User-Agent": settings.feed_user_agent},
-            follow_redirects=True,
-        ) as client:
-            response = await client.get(url)
-            response.raise_for_status()
-
-        doc = Document(response.text)
-        html_content = doc.summary()
+        with span("extract.download"):
+            async with httpx.AsyncClient(
+                timeout=settings.feed_timeout,
+                headers={"User-Agent": settings.feed_user_agent},
+                follow_redirects=True,
+            ) as client:
+                response = await client.get(url)
+                response.raise_for_status()
 
-        # Sanitize: keep only safe tags and attributes
-        soup = BeautifulSoup(html_content, "html.parser")
-        for tag in soup.find_all(True):
-            if tag.name not in ALLOWED_TAGS:
-                tag.unwrap()
-            else:
-                allowed = ALLOWED_ATTRS.get(tag.name, [])
-                for attr in list(tag.attrs):
-                    if attr not in allowed:
-                        del tag[attr]
+        with span("extract.readability"):
+            html_content = Document(response.text).summary()
 
-        cleaned = str(soup).strip()
-        text_length = soup.get_text().strip()
+        with span("extract.sanitize"):
+            soup = sanitize_html(html_content)
+            cleaned = str(soup).strip()
+            text_length = soup.get_text().strip()
 
         if len(text_length) < 50:
             log.warning("extraction_too_short", url=url, length=len(text_length))
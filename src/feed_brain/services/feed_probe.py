@@ -0,0 +1,136 @@
+# ABOUTME: Concurrent feed reachability and format checks.
+# ABOUTME: Probes many feed URLs at once and yields results as each one finishes.
+
+import asyncio
+import re
+import secrets
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Iterable
+
+import httpx
+import structlog
+
+from feed_brain.config import Settings, get_settings
+from feed_brain.models import FeedProbe
+
+log = structlog.get_logger()
+
+PROBE_CONCURRENCY = 20
+SNIFF_BYTES = 4096
+PROBE_BATCH_TTL_SECONDS = 600
+MAX_PROBE_BATCHES = 100
+
+_FORMATS = [
+    ("rss", re.compile(rb"<rss[\s>]")),
+    ("atom", re.compile(rb"<feed[\s>]")),
+    ("rdf", re.compile(rb"<rdf:RDF[\s>]")),
+]
+
+
+def sniff_format(head: bytes) -> str | None:
+    """Detect the feed format from the start of a response body."""
+    for name, pattern in _FORMATS:
+        if pattern.search(head):
+            return name
+    return None
+
+
+class ProbeBatches:
+    """Feed URLs waiting for their probe stream, keyed by an unguessable token.
+
+    A batch is handed out once. Batches whose stream is never opened (the page
+    was closed first) expire after `ttl` seconds, and at most `maxsize` are
+    kept, oldest dropped first.
+    """
+
+    def __init__(
+        self, ttl: float = PROBE_BATCH_TTL_SECONDS, maxsize: int = MAX_PROBE_BATCHES
+    ) -> None:
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._batches: OrderedDict[str, tuple[float, list[str]]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._batches)
+
+    def add(self, urls: Iterable[str]) -> str:
+        """Store a batch and return its token."""
+        self._prune()
+        token = secrets.token_urlsafe(12)
+        self._batches[token] = (time.monotonic(), list(urls))
+        while len(self._batches) > self.maxsize:
+            self._batches.popitem(last=False)
+        return token
+
+    def pop(self, token: str) -> list[str] | None:
+        """Take the batch for token; None if unknown, already taken or expired."""
+        self._prune()
+        entry = self._batches.pop(token, None)
+        return entry[1] if entry else None
+
+    def _prune(self) -> None:
+        cutoff = time.monotonic() - self.ttl
+        while self._batches and next(iter(self._batches.values()))[0] < cutoff:
+            self._batches.popitem(last=False)
+
+
+async def probe_feed(client: httpx.AsyncClient, url: str) -> FeedProbe:
+    """Fetch the start of a feed and check that it is a reachable RSS/Atom/RDF document."""
+    started = time.perf_counter()
+    status = None
+    try:
+        async with client.stream("GET", url) as response:
+            status = response.status_code
+            response.raise_for_status()
+            head = b""
+            async for chunk in response.aiter_bytes():
+                head += chunk
+                if len(head) >= SNIFF_BYTES:
+                    break
+        feed_format = sniff_format(head[:SNIFF_BYTES])
+        error = None if feed_format else "not an RSS/Atom feed"
+    except (httpx.HTTPError, httpx.InvalidURL) as e:
+        # InvalidURL (e.g. a bad port in an OPML xmlUrl) is not an HTTPError
+        feed_format, error = None, str(e) or type(e).__name__
+    return FeedProbe(
+        url=url,
+        ok=error is None,
+        status=status,
+        feed_format=feed_format,
+        error=error,
+        elapsed_ms=round((time.perf_counter() - started) * 1000, 1),
+    )
+
+
+async def probe_feeds(
+    urls: Iterable[str],
+    concurrency: int = PROBE_CONCURRENCY,
+    settings: Settings | None = None,
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> AsyncIterator[FeedProbe]:
+    """Probe feeds concurrently, yielding each result as soon as it completes."""
+    settings = settings or get_settings()
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(
+        timeout=settings.feed_timeout,
+        headers={"User-Agent": settings.feed_user_agent},
+        follow_redirects=True,
+        limits=limits,
+        transport=transport,
+    ) as client:
+
+        async def bounded(url: str) -> FeedProbe:
+            async with semaphore:
+                return await probe_feed(client, url)
+
+        tasks = [asyncio.create_task(bounded(url)) for url in urls]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+    log.info("feeds_probed", count=len(tasks))
@@ -0,0 +1,41 @@
+# ABOUTME: Bulk feedback (approve/skip) for many articles at once.
+# ABOUTME: One UPDATE for the feedback itself, with stat counters adjusted in the same transaction.
+
+from datetime import UTC, datetime
+
+import structlog
+from sqlalchemy import select, update
+
+from feed_brain.db.models import Article
+from feed_brain.models import Feedback
+from feed_brain.services.stats import ArticleState, record_changes
+
+log = structlog.get_logger()
+
+
+async def bulk_feedback(session, article_ids: list[int], feedback: Feedback) -> list[int]:
+    """Set feedback on every listed article that exists; returns the IDs updated.
+
+    Clippings for approvals are not written here; approved articles are left
+    with clipping_created unset for services.clipping.write_pending_clippings.
+    """
+    result = await session.execute(
+        select(
+            Article.id, Article.source_id, Article.tier, Article.category, Article.feedback
+        ).where(Article.id.in_(article_ids))
+    )
+    before = {row.id: ArticleState(*row[1:]) for row in result}
+    if not before:
+        return []
+
+    await session.execute(
+        update(Article)
+        .where(Article.id.in_(before))
+        .values(feedback=feedback.value, feedback_at=datetime.now(UTC))
+    )
+    await record_changes(
+        session, [(state, state._replace(feedback=feedback.value)) for state in before.values()]
+    )
+    await session.commit()
+    log.info("bulk_feedback", feedback=feedback.value, articles=len(before))
+    return list(before)
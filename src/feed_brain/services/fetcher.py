@@ -12,83 +12,158 @@ from sqlalchemy import select
 from feed_brain.config import get_settings
 from feed_brain.db.models import Article, FeedSource
 from feed_brain.db.session import get_session_factory
+from feed_brain.metrics import run_summary, span
+from feed_brain.models import FeedEntry
 from feed_brain.services.extractor import extract_content
+from feed_brain.services.jobs import Progress
+from feed_brain.services.markdown import html_to_markdown
+from feed_brain.services.search import index_articles
+from feed_brain.services.stats import record_changes, snapshot
 
 log = structlog.get_logger()
 
 
-async def fetch_all_feeds() -> int:
+async def fetch_all_feeds(progress: Progress | None = None) -> int:
     """Fetch articles from all active feed sources.
 
+    progress, if given, is told after each feed how many feeds are done and
+    how many articles have been extracted so far.
     Returns the number of new articles stored.
     """
     settings = get_settings()
     session_factory = get_session_factory()
     total_new = 0
 
-    async with session_factory() as session:
-        result = await session.execute(select(FeedSource).where(FeedSource.active.is_(True)))
-        sources = result.scalars().all()
+    with run_summary("fetch", settings.metrics_log_summary):
+        async with session_factory() as session:
+            result = await session.execute(select(FeedSource).where(FeedSource.active.is_(True)))
+            sources = result.scalars().all()
 
         if not sources:
             log.warning("no_active_feeds")
             return 0
 
-        for source in sources:
-            new_count = await _fetch_single_feed(session, source, settings)
-            total_new += new_count
-
-        await session.commit()
+        if progress:
+            progress("feeds", 0, len(sources))
+        for done, source in enumerate(sources, start=1):
+            total_new += await _fetch_single_feed(session_factory, source, settings)
+            if progress:
+                progress("feeds", done, len(sources))
+                progress("articles", total_new, None)
 
     log.info("fetch_complete", total_new=total_new, feeds=len(sources))
     return total_new
 
 
-async def _fetch_single_feed(session, source: FeedSource, settings) -> int:
-    """Fetch and store articles from a single feed source."""
+async def _fetch_single_feed(session_factory, source: FeedSource, settings) -> int:
+    """Fetch and store articles from a single feed source.
+
+    The writer connection is only taken for the dedup query and the final
+    transaction storing the feed's articles, never across downloads, so web
+    requests writing meanwhile don't queue behind a slow feed.
+    """
+    feed = await parse_feed(source, settings)
+    if feed is None:
+        return 0
+
+    entries = feed_entries(feed, source.id, settings)
+    async with session_factory() as session:
+        seen = await stored_urls(session, [entry.url for entry in entries])
+    new_entries = []
+    for entry in entries:
+        if entry.url not in seen:
+            seen.add(entry.url)
+            new_entries.append(entry)
+
+    articles = [
+        new_article(entry, await extract_content(entry.url, settings)) for entry in new_entries
+    ]
+    if not articles:
+        return 0
+
+    async with session_factory() as session:
+        # Another fetch or a worker may have stored some of them meanwhile
+        stored = await stored_urls(session, [article.url for article in articles])
+        articles = [article for article in articles if article.url not in stored]
+        session.add_all(articles)
+        await store_new_articles(session, articles)
+        with span("fetch.db_commit"):
+            await session.commit()
+    for article in articles:
+        log.info("article_stored", title=article.title, url=article.url)
+    return len(articles)
+
+
+async def stored_urls(session, urls: list[str]) -> set[str]:
+    """The subset of `urls` already stored as articles."""
+    if not urls:
+        return set()
+    with span("fetch.dedup_query"):
+        result = await session.execute(select(Article.url).where(Article.url.in_(urls)))
+    return set(result.scalars())
+
+
+async def parse_feed(source: FeedSource, settings):
+    """Download and parse a feed; None (after logging) if it isn't valid RSS/Atom."""
     log.info("fetching_feed", name=source.name, url=source.url)
 
-    feed = await asyncio.to_thread(feedparser.parse, source.url, agent=settings.feed_user_agent)
+    with span("fetch.feed"):  # download and parse: feedparser does both in one call
+        feed = await asyncio.to_thread(feedparser.parse, source.url, agent=settings.feed_user_agent)
     if feed.bozo:
         log.error("feed_parse_error", name=source.name, error=str(feed.bozo_exception))
-        return 0
+        return None
+    return feed
 
-    new_count = 0
-    entries = feed.entries[: settings.max_articles_per_feed]
 
-    for entry in entries:
+def feed_entries(feed, source_id: int, settings) -> list[FeedEntry]:
+    """The feed's items that have a link, newest first, up to max_articles_per_feed."""
+    entries = []
+    for entry in feed.entries[: settings.max_articles_per_feed]:
         url = getattr(entry, "link", None)
         if not url:
             continue
 
-        # Skip if already stored
-        existing = await session.execute(select(Article.id).where(Article.url == url))
-        if existing.scalar_one_or_none() is not None:
-            continue
-
-        title = getattr(entry, "title", "Untitled")
-        author = getattr(entry, "author", None)
-
         # Parse published date
         published_date = None
         if hasattr(entry, "published_parsed") and entry.published_parsed:
             with contextlib.suppress(ValueError, TypeError):
                 published_date = datetime(*entry.published_parsed[:6], tzinfo=UTC)
 
-        # Extract content
-        content = await extract_content(url, settings)
-
-        article = Article(
-            url=url,
-            title=title,
-            author=author,
-            source_id=source.id,
-            content=content,
-            published_date=published_date,
-            fetched_at=datetime.now(UTC),
+        entries.append(
+            FeedEntry(
+                url=url,
+                title=getattr(entry, "title", "Untitled"),
+                author=getattr(entry, "author", None),
+                published_date=published_date,
+                source_id=source_id,
+            )
         )
-        session.add(article)
-        new_count += 1
-        log.info("article_stored", title=title, url=url)
-
-    return new_count
+    return entries
+
+
+def new_article(entry: FeedEntry, content: str | None) -> Article:
+    """Article for an extracted entry, converting content to Markdown for clippings."""
+    markdown = None
+    if content:
+        with span("fetch.markdown"):
+            markdown = html_to_markdown(content)
+    return Article(
+        url=entry.url,
+        title=entry.title,
+        author=entry.author,
+        source_id=entry.source_id,
+        content=content,
+        markdown=markdown,
+        published_date=entry.published_date,
+        fetched_at=datetime.now(UTC),
+    )
+
+
+async def store_new_articles(session, articles: list[Article]) -> None:
+    """Flush articles added to the session and index them for search and stats."""
+    if not articles:
+        return
+    with span("fetch.db_write"):
+        await session.flush()
+        await index_articles(session, articles)
+        await record_changes(session, [(None, snapshot(article)) for article in articles])
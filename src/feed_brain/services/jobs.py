@@ -0,0 +1,151 @@
+# ABOUTME: In-process background job manager with per-kind single-flight.
+# ABOUTME: Jobs report per-stage progress that watchers (e.g. SSE streams) follow live.
+
+import asyncio
+import uuid
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Awaitable, Callable
+from datetime import UTC, datetime
+
+import structlog
+
+from feed_brain.db.profiling import untrack_queries
+from feed_brain.models import JobStatus, JobView, StageProgress
+
+log = structlog.get_logger()
+
+# progress(stage, done, total): called by long-running services as work completes
+Progress = Callable[[str, int, int | None], None]
+
+MAX_FINISHED_JOBS = 50
+
+
+class Job:
+    """A running or finished background job and its progress."""
+
+    def __init__(self, kind: str) -> None:
+        self.id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.status = JobStatus.RUNNING
+        self.stages: dict[str, StageProgress] = {}
+        self.started_at = datetime.now(UTC)
+        self.finished_at: datetime | None = None
+        self.error: str | None = None
+        self.result: dict | None = None
+        self.task: asyncio.Task | None = None
+        self.rerun = False  # new work arrived while running; run once more before finishing
+        self._changed = asyncio.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status != JobStatus.RUNNING
+
+    def report(self, stage: str, done: int, total: int | None = None) -> None:
+        """Progress callback handed to the job's work function."""
+        progress = self.stages.setdefault(stage, StageProgress())
+        progress.done = done
+        if total is not None:
+            progress.total = total
+        self._notify()
+
+    def finish(self, status: JobStatus, result: dict | None = None, error: str | None = None):
+        self.status = status
+        self.result = result
+        self.error = error
+        self.finished_at = datetime.now(UTC)
+        self._notify()
+
+    def _notify(self) -> None:
+        # Wake current watchers and arm a fresh event for the next change
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def view(self) -> JobView:
+        return JobView(
+            id=self.id,
+            kind=self.kind,
+            status=self.status,
+            stages={name: stage.model_copy() for name, stage in self.stages.items()},
+            started_at=self.started_at,
+            finished_at=self.finished_at,
+            error=self.error,
+            result=self.result,
+        )
+
+    async def watch(self) -> AsyncIterator[JobView]:
+        """Yield the current state, then a fresh snapshot after each change until finished.
+
+        Bursts of progress between two yields collapse into one snapshot.
+        """
+        while True:
+            changed = self._changed
+            yield self.view()
+            if self.finished:
+                return
+            await changed.wait()
+
+
+class JobManager:
+    """Runs jobs as asyncio tasks; at most one running job per kind.
+
+    Jobs run in the web server's event loop alongside request handlers and
+    share its single writer connection, so job bodies must not hold a writer
+    session across network or file I/O.
+    """
+
+    def __init__(self) -> None:
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+
+    def get(self, job_id: str) -> Job | None:
+        return self._jobs.get(job_id)
+
+    def running(self, kind: str) -> Job | None:
+        return next(
+            (job for job in self._jobs.values() if job.kind == kind and not job.finished), None
+        )
+
+    def start(
+        self, kind: str, work: Callable[[Progress], Awaitable[dict]], rerun: bool = False
+    ) -> tuple[Job, bool]:
+        """Start `work(progress)` unless a job of this kind is already running.
+
+        Returns (job, started); when a run is in flight the existing job is
+        returned with started=False, so repeated clicks never overlap. With
+        rerun=True the running job calls `work` once more before finishing, for
+        queue-draining jobs that must not miss items added mid-run.
+        """
+        if (job := self.running(kind)) is not None:
+            job.rerun = job.rerun or rerun
+            return job, False
+        job = Job(kind)
+        self._jobs[job.id] = job
+        job.task = asyncio.create_task(self._run(job, work))
+        self._prune()
+        return job, True
+
+    async def _run(self, job: Job, work: Callable[[Progress], Awaitable[dict]]) -> None:
+        untrack_queries()  # the job outlives the request that started it
+        log.info("job_started", job_id=job.id, kind=job.kind)
+        try:
+            result = await work(job.report)
+            while job.rerun:
+                job.rerun = False
+                result = await work(job.report)
+        except Exception as e:
+            log.exception("job_failed", job_id=job.id, kind=job.kind)
+            job.finish(JobStatus.FAILED, error=str(e) or type(e).__name__)
+        else:
+            log.info("job_done", job_id=job.id, kind=job.kind, result=result)
+            job.finish(JobStatus.DONE, result=result)
+
+    def _prune(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[: max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[job_id]
+
+    async def shutdown(self) -> None:
+        """Cancel running jobs (application shutdown)."""
+        tasks = [job.task for job in self._jobs.values() if job.task and not job.task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,265 @@
+# ABOUTME: Streaming HTML-to-Markdown converter for sanitized article bodies.
+# ABOUTME: Runs at extraction time so clippings are plain template assembly.
+
+import re
+
+from lxml import etree
+
+from feed_brain.services.extractor import ALLOWED_TAGS
+
+# How each sanitized tag is rendered; anything else is unwrapped (text kept)
+CONTAINERS = {"blockquote", "figure", "li"}  # hold paragraphs and nested blocks
+PARAGRAPHS = {"p", "figcaption", "h1", "h2", "h3", "h4", "pre"}
+SPANS = {"a", "strong", "b", "em", "i", "code"}
+LISTS = {"ul", "ol"}
+VOID = {"br", "img"}
+BLOCKS = CONTAINERS | PARAGRAPHS | LISTS | {"table"}
+
+_EMPHASIS = {"strong": "**", "b": "**", "em": "*", "i": "*"}
+_WHITESPACE = re.compile(r"\s+")
+_ESCAPE = str.maketrans({char: "\\" + char for char in "\\`*_[]<"})
+_LINE_START = re.compile(r"^(#|>|[-+](?=\s)|\d+(?=\.\s))")
+
+
+class _Node:
+    """One open element: collects inline text, finished blocks, list items or table rows."""
+
+    __slots__ = ("tag", "attrs", "inline", "blocks", "transparent")
+
+    def __init__(self, tag: str, attrs=None, transparent: bool = False) -> None:
+        self.tag = tag
+        self.attrs = attrs
+        self.inline: list[str] = []
+        self.blocks: list = []
+        self.transparent = transparent
+
+    def text(self) -> str:
+        """Inline text with hard breaks ("\\n" markers) and collapsed edges."""
+        lines = "".join(self.inline).split("\n")
+        return "  \n".join(line.strip() for line in lines).strip()
+
+    def flush(self) -> None:
+        text = self.text()
+        self.inline.clear()
+        if text:
+            self.blocks.append(_paragraph(text))
+
+
+class _ListBlock(str):
+    """A rendered list, so an enclosing item can keep it tight under its text."""
+
+
+def _paragraph(text: str) -> str:
+    """Escape a leading "#", ">", "-", "+" or "1." that would start a heading, quote or list."""
+    match = _LINE_START.match(text)
+    if match is None:
+        return text
+    if match.group(1).isdigit():
+        return match.group(1) + "\\" + text[match.end() :]
+    return "\\" + text
+
+
+def _fence(text: str, char: str = "`", minimum: int = 1) -> str:
+    longest = max((len(run) for run in re.findall(f"{re.escape(char)}+", text)), default=0)
+    return char * max(minimum, longest + 1)
+
+
+def _link_target(url: str) -> str:
+    return f"<{url}>" if re.search(r"[\s()<>]", url) else url
+
+
+class _MarkdownTarget:
+    """lxml parser target: builds Markdown as start/data/end events stream in."""
+
+    def __init__(self) -> None:
+        self.stack = [_Node("root")]  # every open element, for end events
+        self.nodes = self.stack[:]  # the non-transparent ones; nodes[-1] receives text
+        self.raw = 0  # inside code/pre: text is neither escaped nor squashed
+        self.pre = 0
+
+    def _inline_node(self) -> _Node:
+        return self.nodes[-1]
+
+    def _push(self, node: _Node) -> None:
+        self.stack.append(node)
+        if not node.transparent:
+            self.nodes.append(node)
+
+    def _container(self) -> _Node:
+        return next(
+            node for node in reversed(self.nodes) if node.tag in CONTAINERS or node.tag == "root"
+        )
+
+    def _accepts(self, tag: str) -> bool:
+        parent = self._inline_node().tag
+        if tag == "li" and parent in LISTS:
+            return True
+        return parent in CONTAINERS or parent == "root"
+
+    def start(self, tag: str, attrib) -> None:
+        if tag not in ALLOWED_TAGS:
+            self._push(_Node(tag, transparent=True))
+            return
+        if tag in BLOCKS and not self._accepts(tag):
+            # e.g. <p> inside <a> or a table cell: keep the text, drop the structure
+            self._inline_node().inline.append("\n" if self.pre else " ")
+            self._push(_Node(tag, transparent=True))
+            return
+        if tag in BLOCKS:
+            self._container().flush()
+        node = _Node(tag, dict(attrib) if tag in ("a", "img") else None)
+        node.transparent = tag in VOID or tag in ("thead", "tbody") or (tag == "code" and self.pre)
+        self._push(node)
+        if tag == "br":
+            target = self._inline_node()
+            target.inline.append("\n" if target.tag not in ("th", "td") or self.pre else " ")
+        elif tag == "img":
+            alt = node.attrs.get("alt", "").translate(_ESCAPE)
+            if src := node.attrs.get("src"):
+                self._inline_node().inline.append(f"![{alt}]({_link_target(src)})")
+        elif tag == "pre":
+            self.pre += 1
+            self.raw += 1
+        elif tag == "code" and not self.pre:
+            self.raw += 1
+
+    def data(self, text: str) -> None:
+        node = self._inline_node()
+        if node.tag in LISTS or node.tag in ("table", "tr"):
+            return  # whitespace between items, rows and cells
+        if not self.raw:
+            text = text.translate(_ESCAPE)
+        if not self.pre:
+            text = _WHITESPACE.sub(" ", text)
+        node.inline.append(text)
+
+    def end(self, tag: str) -> None:
+        node = self.stack.pop()
+        if node.transparent:
+            return
+        self.nodes.pop()
+        if tag in SPANS:
+            self._end_span(node)
+        elif tag in LISTS:
+            self._container().blocks.append(_ListBlock("\n".join(node.blocks)))
+        elif tag == "li":
+            self._end_item(node)
+        elif tag in CONTAINERS:
+            node.flush()
+            body = "\n\n".join(node.blocks)
+            if tag == "blockquote":
+                body = "\n".join(f"> {line}" if line else ">" for line in body.split("\n"))
+            if body:
+                self._container().blocks.append(body)
+        elif tag == "pre":
+            self.pre -= 1
+            self.raw -= 1
+            code = "".join(node.inline).strip("\n")
+            fence = _fence(code, minimum=3)
+            self._container().blocks.append(f"{fence}\n{code}\n{fence}")
+        elif tag in PARAGRAPHS:
+            text = node.text()
+            if text and tag.startswith("h"):
+                self._container().blocks.append("#" * int(tag[1]) + " " + text.replace("  \n", " "))
+            elif text:
+                self._container().blocks.append(_paragraph(text))
+        elif tag in ("th", "td"):
+            self._end_cell(node)
+        elif tag == "tr":
+            self._end_row(node.blocks)
+        elif tag == "table":
+            if node.inline:  # cells that sat directly in <table>
+                node.blocks.append(node.inline[:])
+            self._end_table(node)
+
+    def _nearest(self, tag: str) -> _Node | None:
+        return next((node for node in reversed(self.nodes) if node.tag == tag), None)
+
+    def _end_cell(self, node: _Node) -> None:
+        cell = node.text().replace("  \n", " ")
+        if (row := self._nearest("tr")) is not None:
+            row.blocks.append(cell.replace("|", "\\|"))
+        elif (table := self._nearest("table")) is not None:
+            # A cell without a <tr>: collect it into an implicit row (the
+            # table's otherwise unused inline list) ended by the next row
+            table.inline.append(cell.replace("|", "\\|"))
+        elif cell:
+            self._container().blocks.append(_paragraph(cell))
+
+    def _end_row(self, cells: list[str]) -> None:
+        if not cells:
+            return
+        table = self._nearest("table")
+        if table is None:
+            self._container().blocks.append(_paragraph(" ".join(cells)))
+            return
+        if table.inline:
+            table.blocks.append(table.inline[:])
+            table.inline.clear()
+        table.blocks.append(cells)
+
+    def _end_span(self, node: _Node) -> None:
+        if node.tag == "code":
+            self.raw -= 1
+        joined = "".join(node.inline)
+        inner = joined.strip()
+        lead = " " if joined[:1].isspace() else ""
+        trail = " " if joined[-1:].isspace() else ""
+        if not inner:
+            rendered = ""
+        elif node.tag == "code":
+            fence = _fence(inner)
+            pad = " " if inner.startswith("`") or inner.endswith("`") else ""
+            rendered = f"{fence}{pad}{inner}{pad}{fence}"
+        elif node.tag == "a":
+            href = (node.attrs or {}).get("href")
+            rendered = f"[{inner}]({_link_target(href)})" if href else inner
+        else:
+            marker = _EMPHASIS[node.tag]
+            rendered = f"{marker}{inner}{marker}"
+        self._inline_node().inline.append(lead + rendered + trail)
+
+    def _end_item(self, node: _Node) -> None:
+        node.flush()
+        parent = self.nodes[-1]
+        marker = f"{len(parent.blocks) + 1}. " if parent.tag == "ol" else "- "
+        # Paragraphs of one item need a blank line between them (a bare newline
+        # would be a lazy continuation); a nested list follows directly
+        body = "".join(
+            ("" if i == 0 else "\n" if isinstance(block, _ListBlock) else "\n\n") + block
+            for i, block in enumerate(node.blocks)
+        )
+        indent = " " * len(marker)
+        item = marker + "\n".join(
+            indent + line if line and i else line for i, line in enumerate(body.split("\n"))
+        )
+        target = parent if parent.tag in LISTS else self._container()
+        target.blocks.append(item.rstrip())
+
+    def _end_table(self, node: _Node) -> None:
+        rows = node.blocks
+        if not rows:
+            return
+        width = max(len(row) for row in rows)
+        rows = [row + [""] * (width - len(row)) for row in rows]
+        lines = ["| " + " | ".join(rows[0]) + " |", "|" + " --- |" * width]
+        lines.extend("| " + " | ".join(row) + " |" for row in rows[1:])
+        self._container().blocks.append("\n".join(lines))
+
+    def close(self) -> str:
+        root = self.stack[0]
+        root.flush()
+        return "\n\n".join(root.blocks)
+
+
+def html_to_markdown(html: str) -> str:
+    """Convert sanitized article HTML (extractor.ALLOWED_TAGS) to Markdown.
+
+    Streams parser events into a small stack of open elements instead of
+    building a tree, so cost is one pass over the input.
+    """
+    if not html or not html.strip():
+        return ""
+    parser = etree.HTMLParser(target=_MarkdownTarget())
+    parser.feed(html)
+    return parser.close()
@@ -1,33 +1,83 @@
-# ABOUTME: OPML file parser for bulk feed import.
-# ABOUTME: Extracts feed names and URLs from standard OPML XML format.
+# ABOUTME: OPML parsing and bulk feed import.
+# ABOUTME: Streams outlines with iterparse and upserts feed sources in batched INSERTs.
 
+import io
+from collections.abc import Iterable, Iterator
+from typing import BinaryIO
 from xml.etree import ElementTree
 
 import structlog
+from sqlalchemy import func, select
+from sqlalchemy.dialects.sqlite import insert
+
+from feed_brain.db.models import FeedSource
 
 log = structlog.get_logger()
 
+IMPORT_BATCH_SIZE = 1000
+
+
+def iter_opml(source: BinaryIO) -> Iterator[dict[str, str]]:
+    """Stream feed entries ({'name', 'url'}) from an OPML file object.
+
+    Elements are cleared and detached from their parent as soon as they are
+    read, so memory stays flat however large the file is. Raises
+    ElementTree.ParseError on malformed XML.
+    """
+    open_elements: list[ElementTree.Element] = []
+    for event, element in ElementTree.iterparse(source, events=("start", "end")):  # noqa: S314
+        if event == "end":
+            open_elements.pop()
+            element.clear()
+            if open_elements:
+                open_elements[-1].remove(element)
+            continue
+        open_elements.append(element)
+        if element.tag.rpartition("}")[2] != "outline":
+            continue
+        xml_url = element.get("xmlUrl")
+        if not xml_url:
+            continue
+        name = element.get("title") or element.get("text") or xml_url
+        yield {"name": name, "url": xml_url}
+
 
 def parse_opml(content: str) -> list[dict[str, str]]:
     """Parse OPML content and extract feed entries.
 
     Returns list of dicts with 'name' and 'url' keys.
     """
-    feeds: list[dict[str, str]] = []
-
     try:
-        root = ElementTree.fromstring(content)  # noqa: S314
+        feeds = list(iter_opml(io.BytesIO(content.encode("utf-8"))))
     except ElementTree.ParseError as e:
         log.error("opml_parse_error", error=str(e))
-        return feeds
-
-    for outline in root.iter("outline"):
-        xml_url = outline.get("xmlUrl")
-        if not xml_url:
-            continue
-
-        name = outline.get("title") or outline.get("text") or xml_url
-        feeds.append({"name": name, "url": xml_url})
+        return []
 
     log.info("opml_parsed", count=len(feeds))
     return feeds
+
+
+async def import_feeds(
+    session, feeds: Iterable[dict[str, str]], batch_size: int = IMPORT_BATCH_SIZE
+) -> int:
+    """Insert feed sources in batches, skipping URLs that already exist.
+
+    Returns the number of feeds added.
+    """
+    count = select(func.count()).select_from(FeedSource)
+    before = (await session.execute(count)).scalar_one()
+    statement = insert(FeedSource).on_conflict_do_nothing(index_elements=["url"])
+
+    batch: list[dict[str, str]] = []
+    for feed in feeds:
+        batch.append({"name": feed["name"][:255], "url": feed["url"], "feed_type": "rss"})
+        if len(batch) >= batch_size:
+            await session.execute(statement, batch)
+            batch = []
+    if batch:
+        await session.execute(statement, batch)
+    await session.commit()
+
+    imported = (await session.execute(count)).scalar_one() - before
+    log.info("feeds_imported", imported=imported)
+    return imported
@@ -0,0 +1,156 @@
+# ABOUTME: Full-text search over articles using SQLite FTS5.
+# ABOUTME: Maintains the articles_fts index and runs BM25-ranked queries with snippets.
+
+import re
+from collections.abc import Iterable, Mapping
+from datetime import datetime
+
+import structlog
+from lxml import html as lxml_html
+from markupsafe import escape
+from sqlalchemy import select, text
+from sqlalchemy.orm import selectinload
+
+from feed_brain.db.models import Article
+from feed_brain.models import SearchHit
+
+log = structlog.get_logger()
+
+# BM25 column weights: title, summary, money_quote, body
+RANK_WEIGHTS = (10.0, 5.0, 3.0, 1.0)
+
+# Snippet markers that cannot appear in indexed text; swapped for <mark> after escaping
+_MARK_START = "\x02"
+_MARK_END = "\x03"
+
+REBUILD_BATCH_SIZE = 500
+
+_INSERT_SQL = text(
+    "INSERT INTO articles_fts (rowid, title, summary, money_quote, body) "
+    "VALUES (:rowid, :title, :summary, :money_quote, :body)"
+)
+_DELETE_SQL = text("DELETE FROM articles_fts WHERE rowid = :rowid")
+_SEARCH_SQL = text(f"""
+    SELECT a.id, a.title, fs.name, a.tier, a.category, a.fetched_at,
+           snippet(articles_fts, -1, '{_MARK_START}', '{_MARK_END}', '…', 24),
+           bm25(articles_fts, {", ".join(str(w) for w in RANK_WEIGHTS)}) AS rank
+    FROM articles_fts
+    JOIN articles a ON a.id = articles_fts.rowid
+    LEFT JOIN feed_sources fs ON fs.id = a.source_id
+    WHERE articles_fts MATCH :match AND (:tier IS NULL OR a.tier = :tier)
+    ORDER BY rank
+    LIMIT :limit
+""")
+
+
+def _plain_text(content: str | None) -> str:
+    """Strip sanitized HTML down to its text for indexing."""
+    if not content:
+        return ""
+    try:
+        return lxml_html.fromstring(content).text_content()
+    except Exception:
+        return re.sub(r"<[^>]+>", " ", content)
+
+
+def match_expression(query: str) -> str | None:
+    """Turn free-form user input into a safe FTS5 MATCH expression.
+
+    Every word is quoted (so FTS5 operators in the input are inert) and the
+    last one is a prefix match, for search-as-you-type.
+    """
+    words = re.findall(r"\w+", query)
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def _highlight(snippet: str) -> str:
+    """Escape a raw FTS5 snippet and turn the match markers into <mark> tags."""
+    escaped = str(escape(snippet))
+    return escaped.replace(_MARK_START, "<mark>").replace(_MARK_END, "</mark>")
+
+
+async def index_articles(
+    session, articles: Iterable[Article], archived: Mapping[int, str] | None = None
+) -> None:
+    """Insert or refresh articles in the full-text index.
+
+    Articles must be flushed (have an id) and have their body loaded;
+    `archived` supplies the cold-archive bodies of archived articles by ID.
+    """
+    archived = archived or {}
+    rows = [
+        {
+            "rowid": article.id,
+            "title": article.title,
+            "summary": article.summary or "",
+            "money_quote": article.money_quote or "",
+            "body": _plain_text(article.content or archived.get(article.id)),
+        }
+        for article in articles
+    ]
+    if not rows:
+        return
+    await session.execute(_DELETE_SQL, [{"rowid": row["rowid"]} for row in rows])
+    await session.execute(_INSERT_SQL, rows)
+
+
+async def search_articles(
+    session, query: str, tier: str | None = None, limit: int = 20
+) -> list[SearchHit]:
+    """BM25-ranked search with highlighted snippets."""
+    match = match_expression(query)
+    if match is None:
+        return []
+    result = await session.execute(_SEARCH_SQL, {"match": match, "tier": tier, "limit": limit})
+    return [
+        SearchHit(
+            id=article_id,
+            title=title,
+            source_name=source_name,
+            tier=tier_value,
+            category=category,
+            fetched_at=datetime.fromisoformat(fetched_at),
+            snippet=_highlight(snippet or ""),
+            rank=rank,
+        )
+        for article_id, title, source_name, tier_value, category, fetched_at, snippet, rank in result
+    ]
+
+
+async def rebuild_index(session) -> int:
+    """Rebuild the full-text index from scratch. Returns the number of articles indexed.
+
+    Archived articles are indexed with their bodies read from the cold archive,
+    so they stay as findable as they were when first indexed.
+    """
+    from feed_brain.services.archive import read_archived_contents
+
+    await session.execute(text("DELETE FROM articles_fts"))
+    indexed = 0
+    last_id = 0
+    while True:
+        result = await session.execute(
+            select(Article)
+            .options(selectinload(Article.body))
+            .where(Article.id > last_id)
+            .order_by(Article.id)
+            .limit(REBUILD_BATCH_SIZE)
+        )
+        batch = result.scalars().all()
+        if not batch:
+            break
+        cold = [article.id for article in batch if article.body is None and article.archived_at]
+        await index_articles(session, batch, await read_archived_contents(cold))
+        indexed += len(batch)
+        last_id = batch[-1].id
+        session.expunge_all()
+        log.info("search_index_progress", indexed=indexed)
+
+    await session.execute(text("INSERT INTO articles_fts (articles_fts) VALUES ('optimize')"))
+    await session.commit()
+    log.info("search_index_rebuilt", indexed=indexed)
+    return indexed
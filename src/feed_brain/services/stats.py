@@ -0,0 +1,168 @@
+# ABOUTME: Incrementally maintained aggregate counters for the stats dashboard.
+# ABOUTME: Write paths report article state changes; a repair pass recomputes from scratch.
+
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+from typing import NamedTuple
+
+import structlog
+from sqlalchemy import Text, case, cast, delete, func, select
+from sqlalchemy.dialects.sqlite import insert
+
+from feed_brain.db.models import Article, StatCounter
+from feed_brain.models import Feedback, Tier
+
+log = structlog.get_logger()
+
+COUNTER_FIELDS = ("articles", "classified", "high", "approved", "skipped")
+UNSET_KEY = "none"
+
+
+class ArticleState(NamedTuple):
+    """The article fields that stat counters depend on."""
+
+    source_id: int | None
+    tier: str | None
+    category: str | None
+    feedback: str | None
+
+
+def snapshot(article: Article) -> ArticleState:
+    """Capture an article's counter-relevant state."""
+    return ArticleState(article.source_id, article.tier, article.category, article.feedback)
+
+
+def _contributions(state: ArticleState | None) -> Counter:
+    """Counter increments one article in `state` contributes, keyed by (dimension, key, field)."""
+    counts: Counter = Counter()
+    if state is None:
+        return counts
+    fields = ["articles"]
+    if state.tier:
+        fields.append("classified")
+    if state.tier == Tier.HIGH.value:
+        fields.append("high")
+    if state.feedback == Feedback.APPROVED.value:
+        fields.append("approved")
+    elif state.feedback == Feedback.SKIPPED.value:
+        fields.append("skipped")
+
+    keys = [
+        ("all", "all"),
+        ("tier", state.tier or UNSET_KEY),
+        ("category", state.category or UNSET_KEY),
+        ("source", str(state.source_id) if state.source_id is not None else UNSET_KEY),
+    ]
+    for dimension, key in keys:
+        for field in fields:
+            counts[(dimension, key, field)] += 1
+    return counts
+
+
+async def _apply_deltas(session, deltas: dict[tuple[str, str], dict[str, int]]) -> None:
+    """Upsert counter deltas, adding to existing rows."""
+    rows = [
+        {"dimension": dimension, "key": key, **{f: fields.get(f, 0) for f in COUNTER_FIELDS}}
+        for (dimension, key), fields in deltas.items()
+        if any(fields.values())
+    ]
+    if not rows:
+        return
+    stmt = insert(StatCounter).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["dimension", "key"],
+        set_={f: getattr(StatCounter, f) + getattr(stmt.excluded, f) for f in COUNTER_FIELDS},
+    )
+    await session.execute(stmt)
+
+
+async def record_changes(
+    session, changes: Iterable[tuple[ArticleState | None, ArticleState | None]]
+) -> None:
+    """Apply (before, after) article state changes to the counters.
+
+    Use (None, state) for a new article and (state, None) for a removed one.
+    Runs in the caller's transaction so counters commit with the change.
+    """
+    total: Counter = Counter()
+    for before, after in changes:
+        total.update(_contributions(after))
+        total.subtract(_contributions(before))
+
+    deltas: dict[tuple[str, str], dict[str, int]] = defaultdict(dict)
+    for (dimension, key, field), value in total.items():
+        if value:
+            deltas[(dimension, key)][field] = value
+    await _apply_deltas(session, deltas)
+
+
+async def reassign_source(session, source_id: int) -> None:
+    """Fold a deleted source's counters into the unset-source bucket."""
+    key = str(source_id)
+    result = await session.execute(
+        select(StatCounter).where(StatCounter.dimension == "source", StatCounter.key == key)
+    )
+    counter = result.scalar_one_or_none()
+    if counter is None:
+        return
+    moved = {f: getattr(counter, f) for f in COUNTER_FIELDS}
+    await session.execute(
+        delete(StatCounter).where(StatCounter.dimension == "source", StatCounter.key == key)
+    )
+    await _apply_deltas(session, {("source", UNSET_KEY): moved})
+
+
+async def load_counters(session) -> dict[str, list[StatCounter]]:
+    """All counters grouped by dimension, each sorted by article count."""
+    result = await session.execute(select(StatCounter).order_by(StatCounter.articles.desc()))
+    grouped: dict[str, list[StatCounter]] = defaultdict(list)
+    for counter in result.scalars().all():
+        grouped[counter.dimension].append(counter)
+    return grouped
+
+
+async def _recompute(session) -> dict[tuple[str, str], dict[str, int]]:
+    """Compute every counter from the articles table with GROUP BY."""
+    aggregates = [
+        func.count(),
+        func.count(Article.tier),
+        func.sum(case((Article.tier == Tier.HIGH.value, 1), else_=0)),
+        func.sum(case((Article.feedback == Feedback.APPROVED.value, 1), else_=0)),
+        func.sum(case((Article.feedback == Feedback.SKIPPED.value, 1), else_=0)),
+    ]
+    columns = {
+        "tier": func.coalesce(Article.tier, UNSET_KEY),
+        "category": func.coalesce(Article.category, UNSET_KEY),
+        "source": func.coalesce(cast(Article.source_id, Text), UNSET_KEY),
+    }
+    expected: dict[tuple[str, str], dict[str, int]] = {}
+
+    overall = (await session.execute(select(*aggregates))).one()
+    if overall[0]:
+        expected[("all", "all")] = dict(zip(COUNTER_FIELDS, overall, strict=True))
+    for dimension, column in columns.items():
+        result = await session.execute(select(column, *aggregates).group_by(column))
+        for key, *values in result.all():
+            expected[(dimension, str(key))] = dict(zip(COUNTER_FIELDS, values, strict=True))
+    return expected
+
+
+async def repair_stats(session) -> int:
+    """Recompute all counters from scratch and replace the table.
+
+    Returns the number of counter rows that had drifted (added, removed or changed).
+    """
+    expected = await _recompute(session)
+    current = {
+        (c.dimension, c.key): {f: getattr(c, f) for f in COUNTER_FIELDS}
+        for c in (await session.execute(select(StatCounter))).scalars().all()
+    }
+    drifted = sum(
+        1 for key in expected.keys() | current.keys() if expected.get(key) != current.get(key)
+    )
+
+    await session.execute(delete(StatCounter))
+    await _apply_deltas(session, expected)
+    await session.commit()
+    log.info("stats_repaired", drifted=drifted, rows=len(expected))
+    return drifted
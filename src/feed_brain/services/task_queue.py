@@ -0,0 +1,186 @@
+# ABOUTME: Durable task queue in the SQLite tasks table, claimed by workers under leases.
+# ABOUTME: Atomic claims, heartbeats, owner-fenced completion, and retries with backoff.
+
+from datetime import UTC, datetime, timedelta
+
+import structlog
+from sqlalchemy import and_, delete, exists, func, or_, select, update
+from sqlalchemy.dialects.sqlite import insert
+
+from feed_brain.db.models import Task
+from feed_brain.models import ClaimedTask, TaskKind, TaskStatus
+
+log = structlog.get_logger()
+
+RETRY_BACKOFF_SECONDS = 30  # doubled after every failed attempt
+
+
+def _now(now: datetime | None) -> datetime:
+    return now or datetime.now(UTC)
+
+
+def _claimable(now: datetime, max_attempts: int):
+    """Queued tasks that are due, and running tasks whose worker stopped renewing the lease."""
+    return or_(
+        and_(Task.status == TaskStatus.QUEUED, Task.run_after <= now),
+        and_(
+            Task.status == TaskStatus.RUNNING,
+            Task.lease_expires_at < now,
+            Task.attempts < max_attempts,
+        ),
+    )
+
+
+def _held_by(task: ClaimedTask):
+    return and_(
+        Task.id == task.id, Task.status == TaskStatus.RUNNING, Task.lease_owner == task.owner
+    )
+
+
+async def enqueue(session, tasks: list[tuple[TaskKind, str, str]]) -> None:
+    """Queue (kind, key, payload) tasks; keys already queued or running are left alone.
+
+    A failed task with the same key is reset and queued again.
+    """
+    if not tasks:
+        return
+    stmt = insert(Task).values(
+        [
+            {"kind": kind, "key": key, "payload": payload, "run_after": datetime.now(UTC)}
+            for kind, key, payload in tasks
+        ]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["key"],
+        set_={
+            "kind": stmt.excluded.kind,
+            "payload": stmt.excluded.payload,
+            "status": TaskStatus.QUEUED,
+            "attempts": 0,
+            "run_after": stmt.excluded.run_after,
+            "error": None,
+        },
+        where=Task.status == TaskStatus.FAILED,
+    )
+    await session.execute(stmt)
+
+
+async def claim(
+    session,
+    owner: str,
+    lease_seconds: float,
+    max_attempts: int,
+    now: datetime | None = None,
+) -> ClaimedTask | None:
+    """Lease the next due task to `owner`, or None if there is nothing to do.
+
+    One UPDATE ... RETURNING picks and leases the task, so the SQLite write
+    lock makes the claim atomic across worker processes. Commits.
+    """
+    now = _now(now)
+    candidate = (
+        select(Task.id)
+        .where(_claimable(now, max_attempts))
+        .order_by(Task.run_after, Task.id)
+        .limit(1)
+        .scalar_subquery()
+    )
+    result = await session.execute(
+        update(Task)
+        .where(Task.id == candidate)
+        .values(
+            status=TaskStatus.RUNNING,
+            attempts=Task.attempts + 1,
+            lease_owner=owner,
+            lease_expires_at=now + timedelta(seconds=lease_seconds),
+            heartbeat_at=now,
+        )
+        .returning(Task.id, Task.kind, Task.payload, Task.attempts)
+        .execution_options(synchronize_session=False)
+    )
+    row = result.one_or_none()
+    await session.commit()
+    if row is None:
+        return None
+    return ClaimedTask(row.id, TaskKind(row.kind), row.payload, row.attempts, owner)
+
+
+async def heartbeat(
+    session, task: ClaimedTask, lease_seconds: float, now: datetime | None = None
+) -> bool:
+    """Extend the lease; False if another worker has taken the task over. Commits."""
+    now = _now(now)
+    result = await session.execute(
+        update(Task)
+        .where(_held_by(task))
+        .values(lease_expires_at=now + timedelta(seconds=lease_seconds), heartbeat_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    await session.commit()
+    return result.rowcount == 1
+
+
+async def complete(session, task: ClaimedTask) -> bool:
+    """Delete the finished task if `task.owner` still holds it; False if the lease was lost.
+
+    Does not commit: run it first in the transaction holding the task's
+    results, so the write lock is taken up front and the results are only
+    committed by the lease holder.
+    """
+    result = await session.execute(
+        delete(Task).where(_held_by(task)).execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+async def fail(
+    session, task: ClaimedTask, error: str, max_attempts: int, now: datetime | None = None
+) -> TaskStatus | None:
+    """Requeue the task with exponential backoff, or mark it failed after max_attempts.
+
+    Returns the new status, or None if the lease was lost. Commits.
+    """
+    now = _now(now)
+    if task.attempts >= max_attempts:
+        values = {"status": TaskStatus.FAILED}
+    else:
+        backoff = RETRY_BACKOFF_SECONDS * 2 ** (task.attempts - 1)
+        values = {"status": TaskStatus.QUEUED, "run_after": now + timedelta(seconds=backoff)}
+    result = await session.execute(
+        update(Task)
+        .where(_held_by(task))
+        .values(**values, lease_owner=None, lease_expires_at=None, error=error[:2000])
+        .execution_options(synchronize_session=False)
+    )
+    await session.commit()
+    return values["status"] if result.rowcount == 1 else None
+
+
+async def expire_abandoned(session, max_attempts: int, now: datetime | None = None) -> int:
+    """Fail tasks whose lease ran out on their last attempt (they crashed every worker). Commits."""
+    result = await session.execute(
+        update(Task)
+        .where(
+            Task.status == TaskStatus.RUNNING,
+            Task.lease_expires_at < _now(now),
+            Task.attempts >= max_attempts,
+        )
+        .values(status=TaskStatus.FAILED, lease_owner=None, error="lease expired")
+        .execution_options(synchronize_session=False)
+    )
+    await session.commit()
+    if result.rowcount:
+        log.warning("tasks_abandoned", count=result.rowcount)
+    return result.rowcount
+
+
+async def has_pending(session) -> bool:
+    """Whether any task is queued (due or not) or held by a worker."""
+    pending = exists().where(Task.status.in_([TaskStatus.QUEUED, TaskStatus.RUNNING]))
+    return bool((await session.execute(select(pending))).scalar())
+
+
+async def queue_counts(session) -> dict[str, int]:
+    """Number of tasks per status."""
+    rows = await session.execute(select(Task.status, func.count()).group_by(Task.status))
+    return dict(rows.all())
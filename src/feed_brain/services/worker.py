@@ -0,0 +1,262 @@
+# ABOUTME: Fetch workers draining the durable task queue: feed polls and article extraction.
+# ABOUTME: run_workers starts N processes, each running lease-holding slots with heartbeats.
+
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+from collections import Counter
+
+import structlog
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+
+from feed_brain.config import Settings, get_settings
+from feed_brain.db.models import Article, FeedSource
+from feed_brain.db.session import close_db, get_session_factory, init_db
+from feed_brain.metrics import configure, run_summary, span
+from feed_brain.models import ClaimedTask, FeedEntry, TaskKind
+from feed_brain.services import task_queue
+from feed_brain.services.extractor import extract_content
+from feed_brain.services.fetcher import (
+    feed_entries,
+    new_article,
+    parse_feed,
+    store_new_articles,
+    stored_urls,
+)
+
+log = structlog.get_logger()
+
+
+async def enqueue_feed_polls() -> int:
+    """Queue a poll of every active feed (feeds already queued or being polled are skipped)."""
+    async with get_session_factory()() as session:
+        result = await session.execute(select(FeedSource).where(FeedSource.active.is_(True)))
+        sources = result.scalars().all()
+        await task_queue.enqueue(
+            session,
+            [
+                (
+                    TaskKind.FEED_POLL,
+                    f"feed:{source.id}",
+                    json.dumps({"source_id": source.id, "name": source.name, "url": source.url}),
+                )
+                for source in sources
+            ],
+        )
+        await session.commit()
+    log.info("feed_polls_enqueued", feeds=len(sources))
+    return len(sources)
+
+
+async def _poll_feed(task: ClaimedTask, settings: Settings) -> bool:
+    """Parse a feed and queue an extract task per item not stored yet.
+
+    Returns False if the lease was lost before the results were committed.
+    """
+    payload = json.loads(task.payload)
+    source = FeedSource(id=payload["source_id"], name=payload["name"], url=payload["url"])
+    feed = await parse_feed(source, settings)
+    entries = feed_entries(feed, source.id, settings) if feed is not None else []
+
+    async with get_session_factory()() as session:
+        if not await task_queue.complete(session, task):
+            return False
+        stored = await stored_urls(session, [entry.url for entry in entries])
+        new = [entry for entry in entries if entry.url not in stored]
+        await task_queue.enqueue(
+            session,
+            [(TaskKind.EXTRACT, f"extract:{entry.url}", entry.model_dump_json()) for entry in new],
+        )
+        await session.commit()
+    log.info("feed_polled", name=source.name, new_entries=len(new))
+    return True
+
+
+async def _extract_entry(task: ClaimedTask, settings: Settings) -> bool:
+    """Download, extract and store one feed item.
+
+    Returns False if the lease was lost before the article was committed.
+    """
+    entry = FeedEntry.model_validate_json(task.payload)
+    session_factory = get_session_factory()
+
+    # Check before downloading; checked again under the write lock below
+    async with session_factory() as session:
+        with span("fetch.dedup_query"):
+            stored = await session.scalar(select(Article.id).where(Article.url == entry.url))
+    article = None
+    if stored is None:
+        article = new_article(entry, await extract_content(entry.url, settings))
+
+    async with session_factory() as session:
+        if not await task_queue.complete(session, task):
+            return False
+        if article is not None and not await session.scalar(
+            select(Article.id).where(Article.url == entry.url)
+        ):
+            session.add(article)
+            await store_new_articles(session, [article])
+            log.info("article_stored", title=entry.title, url=entry.url)
+        with span("fetch.db_commit"):
+            await session.commit()
+    return True
+
+
+HANDLERS = {TaskKind.FEED_POLL: _poll_feed, TaskKind.EXTRACT: _extract_entry}
+
+
+async def _pending(session, max_attempts: int) -> bool:
+    """Fail abandoned tasks, then report whether any task is still queued or held."""
+    await task_queue.expire_abandoned(session, max_attempts)
+    return await task_queue.has_pending(session)
+
+
+class Worker:
+    """Claims tasks and runs them, `settings.worker_slots` at a time, in this process.
+
+    Each slot holds the lease on its task and renews it every third of the
+    lease while the task runs. A slot whose lease is taken over (it stalled
+    past the visibility timeout) cancels its task and leaves the results to the
+    new holder. With drain=True the worker returns once no task is queued or
+    held by any worker; otherwise it polls for new tasks until cancelled.
+    """
+
+    def __init__(self, name: str, settings: Settings, drain: bool = False) -> None:
+        self.name = name
+        self.settings = settings
+        self.drain = drain
+        self.processed: Counter[str] = Counter()
+
+    async def run(self) -> dict[str, int]:
+        """Run all slots until drained (or forever); returns tasks completed per kind."""
+        slots = max(1, self.settings.worker_slots)
+        await asyncio.gather(*(self._slot(f"{self.name}/{slot}") for slot in range(slots)))
+        return dict(self.processed)
+
+    async def _slot(self, owner: str) -> None:
+        settings = self.settings
+        while True:
+            task = await self._queue_call(
+                task_queue.claim,
+                owner,
+                settings.worker_lease_seconds,
+                settings.worker_max_attempts,
+            )
+            if task is None:
+                if self.drain and not await self._queue_call(
+                    _pending, settings.worker_max_attempts
+                ):
+                    return
+                await asyncio.sleep(settings.worker_poll_seconds)
+                continue
+            await self._execute(task)
+
+    async def _queue_call(self, operation, *args):
+        """Run a task-queue operation in its own session, retrying while the database is locked.
+
+        Another process can hold the SQLite write lock past the busy timeout;
+        the slot backs off (doubling up to a third of the lease) and tries again
+        rather than dying with its task unfinished.
+        """
+        delay = self.settings.worker_poll_seconds
+        while True:
+            try:
+                async with get_session_factory()() as session:
+                    return await operation(session, *args)
+            except OperationalError as e:
+                log.warning(
+                    "task_queue_busy",
+                    operation=operation.__name__,
+                    error=str(e.orig),
+                    retry_in=delay,
+                )
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.settings.worker_lease_seconds / 3)
+
+    async def _execute(self, task: ClaimedTask) -> None:
+        work = asyncio.create_task(HANDLERS[task.kind](task, self.settings))
+        beat = asyncio.create_task(self._heartbeat(task, work))
+        try:
+            completed = await work
+        except asyncio.CancelledError:
+            if asyncio.current_task().cancelling():
+                raise  # the worker itself is shutting down
+            completed = False
+        except Exception as e:
+            log.exception("task_failed", task_id=task.id, kind=task.kind, attempt=task.attempts)
+            await self._queue_call(
+                task_queue.fail, task, str(e) or type(e).__name__, self.settings.worker_max_attempts
+            )
+            return
+        finally:
+            beat.cancel()
+
+        if completed:
+            self.processed[task.kind] += 1
+        else:
+            log.warning("task_lease_lost", task_id=task.id, kind=task.kind, owner=task.owner)
+
+    async def _heartbeat(self, task: ClaimedTask, work: asyncio.Task) -> None:
+        lease = self.settings.worker_lease_seconds
+        while True:
+            await asyncio.sleep(lease / 3)
+            try:
+                async with get_session_factory()() as session:
+                    held = await task_queue.heartbeat(session, task, lease)
+            except Exception:
+                log.exception("task_heartbeat_failed", task_id=task.id)
+                continue  # the lease still has two thirds left; try again
+            if not held:
+                work.cancel()
+                return
+
+
+async def _run_worker(drain: bool) -> dict[str, int]:
+    settings = get_settings()
+    configure(settings.metrics_enabled)
+    name = f"{socket.gethostname()}:{os.getpid()}"
+    await init_db()  # registers compression dictionaries; the schema is already current
+    try:
+        with run_summary("worker", settings.metrics_log_summary):
+            processed = await Worker(name, settings, drain).run()
+    finally:
+        await close_db()
+    log.info("worker_done", worker=name, processed=processed)
+    return processed
+
+
+def _process_main(drain: bool) -> None:
+    asyncio.run(_run_worker(drain))
+
+
+def run_workers(concurrency: int, drain: bool = False) -> list[int]:
+    """Run `concurrency` worker processes against the configured database.
+
+    Processes are spawned fresh and read their settings from the environment,
+    like any other feed-brain process; each claims its own tasks, so they can
+    also run alongside workers started separately. With concurrency 1 the
+    worker runs in this process. Returns the exit code of each process.
+    """
+    if concurrency <= 1:
+        _process_main(drain)
+        return [0]
+
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=_process_main, args=(drain,), name=f"feed-brain-worker-{index}")
+        for index in range(concurrency)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        # The children got the same SIGINT; their leases expire and are reclaimed
+        for process in processes:
+            process.join()
+        raise
+    return [process.exitcode for process in processes]
@@ -0,0 +1,256 @@
+# ABOUTME: Versioned JSON API (/api/v1) for scripts: articles, feeds and stats.
+# ABOUTME: Cursor pagination, fields= projection, orjson when installed, gzip/brotli responses.
+
+import asyncio
+import gzip
+import json
+from datetime import UTC, datetime
+from typing import Annotated
+
+import structlog
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import Response
+from sqlalchemy import Text, and_, cast, select
+
+from feed_brain.db.models import Article, ArticleBody, FeedSource, StatCounter
+from feed_brain.db.queries import as_naive_utc, encode_cursor, filter_articles, keyset_page
+from feed_brain.db.session import get_read_session_factory
+from feed_brain.models import Category, Tier
+from feed_brain.services.stats import COUNTER_FIELDS, load_counters
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on installed extras
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on installed extras
+    brotli = None
+
+log = structlog.get_logger()
+router = APIRouter(prefix="/api/v1")
+
+MIN_COMPRESS_BYTES = 1024
+THREAD_COMPRESS_BYTES = 256 * 1024
+GZIP_LEVEL = 5
+BROTLI_QUALITY = 4
+
+ARTICLE_FIELDS = {
+    "id": Article.id,
+    "url": Article.url,
+    "title": Article.title,
+    "author": Article.author,
+    "source_id": Article.source_id,
+    "source_name": FeedSource.name,
+    "published_date": Article.published_date,
+    "summary": Article.summary,
+    "tier": Article.tier,
+    "category": Article.category,
+    "reason": Article.reason,
+    "confidence": Article.confidence,
+    "money_quote": Article.money_quote,
+    "actionables": Article.actionables,
+    "feedback": Article.feedback,
+    "clipping_created": Article.clipping_created,
+    "fetched_at": Article.fetched_at,
+    "classified_at": Article.classified_at,
+    "updated_at": Article.updated_at,
+    "content": ArticleBody.content,
+}
+# content is by far the largest field, so callers opt in to it
+DEFAULT_ARTICLE_FIELDS = [name for name in ARTICLE_FIELDS if name != "content"]
+
+
+def _default(value):
+    if isinstance(value, datetime):
+        return _isoformat(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _isoformat(value: datetime) -> str:
+    # SQLite hands back naive datetimes that are stored as UTC
+    return (value if value.tzinfo else value.replace(tzinfo=UTC)).isoformat()
+
+
+def dumps(payload) -> bytes:
+    """Serialize to JSON bytes; datetimes become ISO 8601 in UTC."""
+    if orjson is not None:
+        return orjson.dumps(payload, default=_default, option=orjson.OPT_NAIVE_UTC)
+    return json.dumps(payload, default=_default, separators=(",", ":")).encode()
+
+
+def _accepted_encodings(header: str) -> set[str]:
+    accepted = set()
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(name.strip().lower())
+    return accepted
+
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+
+async def json_response(request: Request, payload, status_code: int = 200) -> Response:
+    """JSON response, brotli- or gzip-compressed when the client accepts it."""
+    body = dumps(payload)
+    headers = {"Vary": "Accept-Encoding"}
+    if len(body) >= MIN_COMPRESS_BYTES:
+        accepted = _accepted_encodings(request.headers.get("accept-encoding", ""))
+        encoding = next(
+            (
+                name
+                for name in ("br", "gzip")
+                if name in accepted and (name != "br" or brotli is not None)
+            ),
+            None,
+        )
+        if encoding:
+            if len(body) >= THREAD_COMPRESS_BYTES:
+                body = await asyncio.to_thread(_compress, body, encoding)
+            else:
+                body = _compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+    return Response(body, status_code=status_code, headers=headers, media_type="application/json")
+
+
+def _parse_fields(fields: str | None) -> list[str]:
+    if not fields:
+        return DEFAULT_ARTICLE_FIELDS
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in names if name not in ARTICLE_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return names
+
+
+def _article_query(fields: list[str]):
+    """Select only the requested columns (plus the keyset columns), joining as needed."""
+    names = list(dict.fromkeys(["id", "fetched_at", *fields]))
+    query = select(*(ARTICLE_FIELDS[name].label(name) for name in names)).select_from(Article)
+    if "source_name" in fields:
+        query = query.outerjoin(FeedSource, FeedSource.id == Article.source_id)
+    if "content" in fields:
+        query = query.outerjoin(ArticleBody, ArticleBody.article_id == Article.id)
+    return query
+
+
+def _article_dict(row, fields: list[str]) -> dict:
+    item = {name: row._mapping[name] for name in fields}
+    if "actionables" in item:
+        item["actionables"] = json.loads(item["actionables"]) if item["actionables"] else []
+    return item
+
+
+@router.get("/articles")
+async def list_articles(
+    request: Request,
+    tier: Annotated[Tier | None, Query()] = None,
+    category: Annotated[Category | None, Query()] = None,
+    source_id: Annotated[int | None, Query()] = None,
+    since: Annotated[datetime | None, Query(description="fetched_at >= since (ISO 8601)")] = None,
+    until: Annotated[datetime | None, Query(description="fetched_at < until (ISO 8601)")] = None,
+    cursor: Annotated[str | None, Query()] = None,
+    limit: Annotated[int, Query(ge=1, le=500)] = 50,
+    fields: Annotated[str | None, Query(description="Comma-separated; content is opt-in")] = None,
+):
+    """Articles newest first, one keyset page at a time."""
+    names = _parse_fields(fields)
+    query = filter_articles(
+        _article_query(names),
+        tier,
+        category,
+        source_id=source_id,
+        since=as_naive_utc(since) if since else None,
+        until=as_naive_utc(until) if until else None,
+    )
+    try:
+        query = keyset_page(query, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from e
+
+    async with get_read_session_factory()() as session:
+        rows = (await session.execute(query)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].fetched_at, rows[-1].id)
+    payload = {"data": [_article_dict(row, names) for row in rows], "next_cursor": next_cursor}
+    return await json_response(request, payload)
+
+
+@router.get("/articles/{article_id}")
+async def get_article(
+    request: Request,
+    article_id: int,
+    fields: Annotated[str | None, Query(description="Comma-separated; content is opt-in")] = None,
+):
+    """One article by ID."""
+    names = _parse_fields(fields)
+    async with get_read_session_factory()() as session:
+        result = await session.execute(_article_query(names).where(Article.id == article_id))
+        row = result.one_or_none()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Article not found")
+    return await json_response(request, _article_dict(row, names))
+
+
+@router.get("/feeds")
+async def list_feeds(request: Request, active: Annotated[bool | None, Query()] = None):
+    """Feed sources with their article, high-tier and approval counts."""
+    counts = [getattr(StatCounter, name) for name in COUNTER_FIELDS]
+    query = (
+        select(
+            FeedSource.id,
+            FeedSource.name,
+            FeedSource.url,
+            FeedSource.feed_type,
+            FeedSource.active,
+            FeedSource.created_at,
+            *counts,
+        )
+        .outerjoin(
+            StatCounter,
+            and_(StatCounter.dimension == "source", StatCounter.key == cast(FeedSource.id, Text)),
+        )
+        .order_by(FeedSource.name)
+    )
+    if active is not None:
+        query = query.where(FeedSource.active.is_(active))
+
+    async with get_read_session_factory()() as session:
+        rows = (await session.execute(query)).all()
+
+    data = []
+    for row in rows:
+        item = dict(row._mapping)
+        for name in COUNTER_FIELDS:
+            item[name] = item[name] or 0
+        data.append(item)
+    return await json_response(request, {"data": data})
+
+
+@router.get("/stats")
+async def stats(request: Request):
+    """Aggregate counters: overall totals plus per tier, category and source."""
+    async with get_read_session_factory()() as session:
+        counters = await load_counters(session)
+
+    def counts(counter: StatCounter) -> dict[str, int]:
+        return {name: getattr(counter, name) for name in COUNTER_FIELDS}
+
+    totals = counters.get("all") or []
+    payload = {
+        "totals": counts(totals[0]) if totals else dict.fromkeys(COUNTER_FIELDS, 0),
+        **{
+            dimension: {counter.key: counts(counter) for counter in counters.get(dimension, [])}
+            for dimension in ("tier", "category", "source")
+        },
+    }
+    return await json_response(request, payload)
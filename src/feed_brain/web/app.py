@@ -10,8 +10,14 @@ from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
+from feed_brain.config import get_settings
 from feed_brain.db.session import close_db, init_db
+from feed_brain.metrics import configure as configure_metrics
 from feed_brain.models import Category, Tier
+from feed_brain.services.feed_probe import ProbeBatches
+from feed_brain.services.jobs import JobManager
+from feed_brain.web.caching import FragmentCache
+from feed_brain.web.timing import ServerTimingMiddleware
 
 logger = structlog.get_logger()
 
@@ -35,17 +41,20 @@ CATEGORY_LABELS = {
 
 
 @asynccontextmanager
-async def lifespan(_app: FastAPI) -> AsyncGenerator[None]:
+async def lifespan(app: FastAPI) -> AsyncGenerator[None]:
     """Application lifespan context for database setup/teardown."""
     logger.info("app_startup")
     await init_db()
     yield
     logger.info("app_shutdown")
+    await app.state.jobs.shutdown()
     await close_db()
 
 
 def create_app() -> FastAPI:
     """Create and configure the FastAPI application."""
+    settings = get_settings()
+    configure_metrics(settings.metrics_enabled)
     app = FastAPI(
         title="feed-brain",
         description="AI-powered personal feed aggregator",
@@ -57,15 +66,28 @@ def create_app() -> FastAPI:
     templates.env.filters["tier_label"] = lambda v: TIER_LABELS.get(v, v or "Unclassified")
     templates.env.filters["category_label"] = lambda v: CATEGORY_LABELS.get(v, v or "Unknown")
     app.state.templates = templates
+    app.state.probe_batches = ProbeBatches()  # feed URLs awaiting their SSE stream
+    app.state.jobs = JobManager()
+    app.state.fragments = FragmentCache(settings.fragment_cache_size)
+    if settings.server_timing_enabled:
+        app.add_middleware(ServerTimingMiddleware, warn_queries=settings.request_query_warn)
 
     if STATIC_DIR.exists():
         app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
 
+    from feed_brain.web.api import router as api_router
     from feed_brain.web.routes import router
 
     app.include_router(router)
+    app.include_router(api_router)
 
     return app
 
 
-app = create_app()
+def __getattr__(name: str) -> FastAPI:
+    """`feed_brain.web.app:app` for ASGI servers, built on first access rather than on import."""
+    if name == "app":
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,31 +1,48 @@
 # ABOUTME: FastAPI route handlers for the feed-brain web UI.
-# ABOUTME: Serves feed list, article detail, feedback, fetch trigger, and feed management.
+# ABOUTME: Serves feed list, article detail, feedback, background jobs, and feed management.
 
+import asyncio
 import json
+from typing import Annotated
+from urllib.parse import urlencode
+from xml.etree import ElementTree
 
 import structlog
 from fastapi import APIRouter, Form, HTTPException, Query, Request, UploadFile
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.orm import joinedload
 
 from feed_brain.db.models import Article, FeedSource
-from feed_brain.db.session import get_session_factory
-from feed_brain.models import ArticleView, Feedback
+from feed_brain.db.queries import encode_cursor, filter_articles, keyset_page, neighbors_query
+from feed_brain.db.session import get_read_session_factory, get_session_factory
+from feed_brain.metrics import metrics
+from feed_brain.models import ArticleRow, ArticleView, Feedback, SearchHit
+from feed_brain.services.stats import load_counters, reassign_source, record_changes, snapshot
+from feed_brain.web.caching import (
+    not_modified,
+    not_modified_response,
+    validator_headers,
+    weak_etag,
+)
 
 log = structlog.get_logger()
 router = APIRouter()
 
 
-def _article_to_view(article: Article) -> ArticleView:
-    """Convert ORM article to view model."""
+def _article_to_view(article: Article, include_content: bool = False) -> ArticleView:
+    """Convert ORM article to view model.
+
+    The body is only touched when include_content is set; it must have been
+    loaded with selectinload(Article.body).
+    """
     return ArticleView(
         id=article.id,
         url=article.url,
         title=article.title,
         author=article.author,
         source_name=article.source.name if article.source else None,
-        content=article.content,
+        content=article.content if include_content else None,
         published_date=article.published_date,
         summary=article.summary,
         tier=article.tier,
@@ -41,131 +58,388 @@ def _article_to_view(article: Article) -> ArticleView:
     )
 
 
+# Only the columns article_card.html renders; bodies and JSON fields stay unread
+_CARD_QUERY = select(
+    Article.id,
+    Article.title,
+    Article.summary,
+    Article.tier,
+    Article.category,
+    Article.feedback,
+    Article.fetched_at,
+    Article.updated_at,
+    FeedSource.name,
+).outerjoin(Article.source)
+
+
+async def _feed_page_context(
+    tier: str | None, category: str | None, cursor: str | None, per_page: int
+) -> dict:
+    """Load one keyset page of article cards and build the template context."""
+    query = filter_articles(_CARD_QUERY, tier, category)
+    try:
+        query = keyset_page(query, cursor, per_page)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from e
+
+    session_factory = get_read_session_factory()
+    async with session_factory() as session:
+        result = await session.execute(query)
+        rows = [ArticleRow._make(row) for row in result]
+
+    filters = {key: value for key, value in (("tier", tier), ("category", category)) if value}
+    next_page_url = more_url = None
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        next_params = {**filters, "cursor": encode_cursor(rows[-1].fetched_at, rows[-1].id)}
+        if per_page != 50:
+            next_params["per_page"] = per_page
+        next_page_url = "/?" + urlencode(next_params)
+        more_url = "/partials/articles?" + urlencode(next_params)
+
+    return {
+        "articles": rows,
+        "tier_filter": tier,
+        "category_filter": category,
+        "filter_query": urlencode(filters),
+        "next_page_url": next_page_url,
+        "more_url": more_url,
+    }
+
+
+def _render_feed(request: Request, template_name: str, context: dict) -> Response:
+    """Render a page of cards from the fragment cache, or 304 if the client's copy is current.
+
+    Cards are keyed by everything they show that can change: the row version
+    (updated_at) plus the joined source name and the filter query in links.
+    """
+    rows: list[ArticleRow] = context["articles"]
+    filter_query = context["filter_query"]
+    etag = weak_etag(
+        template_name,
+        filter_query,
+        context["more_url"],
+        [(row.id, row.version, row.source_name) for row in rows],
+    )
+    last_modified = max((row.version for row in rows), default=None)
+    if not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+
+    templates = request.app.state.templates
+    card = templates.get_template("partials/article_card.html")
+    fragments = request.app.state.fragments
+    context["cards"] = [
+        fragments.get_or_render(
+            (row.id, row.version, row.source_name, filter_query),
+            lambda row=row: card.render(article=row, filter_query=filter_query),
+        )
+        for row in rows
+    ]
+    return templates.TemplateResponse(
+        request, template_name, context, headers=validator_headers(etag, last_modified)
+    )
+
+
 @router.get("/", response_class=HTMLResponse)
 async def feed_list(
     request: Request,
     tier: str | None = Query(None),
-    page: int = Query(1, ge=1),
+    category: str | None = Query(None),
+    cursor: str | None = Query(None),
     per_page: int = Query(50, ge=1, le=200),
 ):
-    """Feed list page with article cards, optionally filtered by tier."""
-    session_factory = get_session_factory()
-    async with session_factory() as session:
-        query = (
-            select(Article).options(joinedload(Article.source)).order_by(Article.fetched_at.desc())
-        )
-        if tier:
-            query = query.where(Article.tier == tier)
-        query = query.offset((page - 1) * per_page).limit(per_page)
-        result = await session.execute(query)
-        articles = [_article_to_view(a) for a in result.scalars().all()]
+    """Feed list page with article cards, optionally filtered by tier or category."""
+    context = await _feed_page_context(tier, category, cursor, per_page)
+    return _render_feed(request, "feed.html", context)
 
-    templates = request.app.state.templates
-    return templates.TemplateResponse(
-        "feed.html",
-        {"request": request, "articles": articles, "tier_filter": tier},
-    )
+
+@router.get("/partials/articles", response_class=HTMLResponse)
+async def feed_list_page(
+    request: Request,
+    tier: str | None = Query(None),
+    category: str | None = Query(None),
+    cursor: str | None = Query(None),
+    per_page: int = Query(50, ge=1, le=200),
+):
+    """Next page of article cards for htmx infinite scroll."""
+    context = await _feed_page_context(tier, category, cursor, per_page)
+    return _render_feed(request, "partials/article_page.html", context)
 
 
 @router.get("/article/{article_id}", response_class=HTMLResponse)
-async def article_detail(request: Request, article_id: int, tier: str | None = Query(None)):
+async def article_detail(
+    request: Request,
+    article_id: int,
+    tier: str | None = Query(None),
+    category: str | None = Query(None),
+):
     """Article detail page with full content and next/prev navigation."""
-    session_factory = get_session_factory()
+    session_factory = get_read_session_factory()
     async with session_factory() as session:
+        # One row: join the body too rather than paying a second round trip for selectinload
         result = await session.execute(
-            select(Article).options(joinedload(Article.source)).where(Article.id == article_id)
+            select(Article)
+            .options(joinedload(Article.source), joinedload(Article.body))
+            .where(Article.id == article_id)
         )
         article = result.scalar_one_or_none()
         if not article:
             raise HTTPException(status_code=404, detail="Article not found")
-        view = _article_to_view(article)
-
-        # Find prev/next articles in the same tier context
-        base_query = select(Article.id).order_by(Article.fetched_at.desc())
-        if tier:
-            base_query = base_query.where(Article.tier == tier)
-
-        ids_result = await session.execute(base_query)
-        article_ids = [row[0] for row in ids_result.all()]
-
-        prev_id = None
-        next_id = None
-        if article_id in article_ids:
-            idx = article_ids.index(article_id)
-            if idx > 0:
-                prev_id = article_ids[idx - 1]
-            if idx < len(article_ids) - 1:
-                next_id = article_ids[idx + 1]
-
-    tier_param = f"?tier={tier}" if tier else ""
+
+        # Prev/next within the same filter context, via index seeks
+        neighbors = await session.execute(
+            neighbors_query(article.fetched_at, article.id, tier, category)
+        )
+        prev_id, next_id = neighbors.one()
+
+    filters = {key: value for key, value in (("tier", tier), ("category", category)) if value}
+    version = article.updated_at or article.fetched_at
+    source_name = article.source.name if article.source else None
+    etag = weak_etag("article.html", article.id, version, source_name, prev_id, next_id, filters)
+    if not_modified(request, etag, version):
+        return not_modified_response(etag, version)
+
+    view = _article_to_view(article, include_content=True)
+    if article.body is None and article.archived_at is not None:
+        from feed_brain.services.archive import read_archived_content
+
+        view.content = await read_archived_content(article.id)
+
     templates = request.app.state.templates
     return templates.TemplateResponse(
+        request,
         "article.html",
         {
-            "request": request,
             "article": view,
             "prev_id": prev_id,
             "next_id": next_id,
-            "tier_filter": tier,
-            "tier_param": tier_param,
+            "filter_query": urlencode(filters),
         },
+        headers=validator_headers(etag, version),
     )
 
 
+@router.get("/search", response_class=HTMLResponse)
+async def search_page(
+    request: Request,
+    q: str = Query(""),
+    tier: str | None = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+):
+    """Full-text search page; htmx requests get just the results partial.
+
+    The search box pushes this URL into history, so htmx restoring it after a
+    history cache miss (HX-History-Restore-Request) gets the full page, and
+    caches are told the response depends on HX-Request.
+    """
+    from feed_brain.services.search import search_articles
+
+    session_factory = get_read_session_factory()
+    async with session_factory() as session:
+        hits = await search_articles(session, q, tier=tier, limit=limit)
+
+    partial = request.headers.get("HX-Request") and not request.headers.get(
+        "HX-History-Restore-Request"
+    )
+    template = "partials/search_results.html" if partial else "search.html"
+    templates = request.app.state.templates
+    return templates.TemplateResponse(
+        request,
+        template,
+        {"q": q, "hits": hits, "tier_filter": tier},
+        headers={"Vary": "HX-Request"},
+    )
+
+
+@router.get("/search.json", response_model=list[SearchHit])
+async def search_json(
+    q: str = Query(...),
+    tier: str | None = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+):
+    """Full-text search as JSON, BM25-ranked with highlighted snippets."""
+    from feed_brain.services.search import search_articles
+
+    session_factory = get_read_session_factory()
+    async with session_factory() as session:
+        return await search_articles(session, q, tier=tier, limit=limit)
+
+
+@router.get("/stats", response_class=HTMLResponse)
+async def stats_page(request: Request):
+    """Dashboard of per-tier, per-category and per-source counts and approval rates."""
+    session_factory = get_read_session_factory()
+    async with session_factory() as session:
+        counters = await load_counters(session)
+        result = await session.execute(select(FeedSource.id, FeedSource.name))
+        source_names = {str(source_id): name for source_id, name in result.all()}
+
+    templates = request.app.state.templates
+    return templates.TemplateResponse(
+        request,
+        "stats.html",
+        {
+            "totals": (counters.get("all") or [None])[0],
+            "tiers": counters.get("tier", []),
+            "categories": counters.get("category", []),
+            "sources": counters.get("source", []),
+            "source_names": source_names,
+        },
+    )
+
+
+@router.get("/metrics")
+async def metrics_page():
+    """Stage timing histograms in the Prometheus text exposition format."""
+    if not metrics.enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return Response(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 @router.post("/article/{article_id}/feedback", response_class=HTMLResponse)
-async def article_feedback(request: Request, article_id: int, feedback: str = Query(...)):  # noqa: ARG001
-    """Record feedback (approved/skipped) and optionally create clipping."""
+async def article_feedback(request: Request, article_id: int, feedback: str = Query(...)):
+    """Record feedback (approved/skipped); approvals queue their clipping for the writer job."""
+    from datetime import UTC, datetime
+
     feedback_enum = Feedback(feedback)
     session_factory = get_session_factory()
 
     async with session_factory() as session:
-        result = await session.execute(select(Article).where(Article.id == article_id))
-        article = result.scalar_one_or_none()
+        article = await session.get(Article, article_id)
         if not article:
             raise HTTPException(status_code=404, detail="Article not found")
 
+        before = snapshot(article)
         article.feedback = feedback_enum.value
+        if feedback_enum == Feedback.APPROVED and article.archived_at is not None:
+            from feed_brain.services.archive import restore_article
 
-        if feedback_enum == Feedback.APPROVED:
-            from datetime import UTC, datetime
+            await session.refresh(article, ["body"])
+            await restore_article(article)
+        article.feedback_at = datetime.now(UTC)
+        await record_changes(session, [(before, snapshot(article))])
+        await session.commit()
 
-            from feed_brain.services.clipping import create_clipping
+    # The vault may be slow (cloud-synced), so the file is written in the background
+    if feedback_enum == Feedback.APPROVED and not article.clipping_created:
+        request.app.state.jobs.start("clippings", _clippings_work(), rerun=True)
+        return HTMLResponse('<span class="feedback-done">Approved</span>')
+    elif feedback_enum == Feedback.APPROVED:
+        return HTMLResponse('<span class="feedback-done">Clipping created</span>')
+    else:
+        return HTMLResponse('<span class="feedback-done">Skipped</span>')
 
-            created = await create_clipping(article)
-            article.clipping_created = created
-            article.feedback_at = datetime.now(UTC)
-        else:
-            from datetime import UTC, datetime
 
-            article.feedback_at = datetime.now(UTC)
+def _clippings_work():
+    """Background job body that drains pending clippings, totalled across reruns."""
+    from feed_brain.services.clipping import write_pending_clippings
 
-        await session.commit()
+    written = 0
 
-        # Return partial HTML for htmx swap
-        if feedback_enum == Feedback.APPROVED and article.clipping_created:
-            return HTMLResponse('<span class="feedback-done">Clipping created</span>')
-        elif feedback_enum == Feedback.APPROVED:
-            return HTMLResponse('<span class="feedback-done">Approved (clipping failed)</span>')
-        else:
-            return HTMLResponse('<span class="feedback-done">Skipped</span>')
+    async def work(progress) -> dict:
+        nonlocal written
+        written += await write_pending_clippings(progress)
+        return {"clippings": written}
 
+    return work
 
-@router.post("/fetch")
-async def trigger_fetch():
-    """Trigger feed fetch + classification."""
+
+@router.post("/articles/feedback")
+async def bulk_article_feedback(
+    request: Request,
+    ids: Annotated[list[int], Form()],
+    feedback: Annotated[Feedback, Form()],
+):
+    """Approve or skip many articles at once.
+
+    Feedback is one UPDATE; clippings for approvals are written by a background
+    job whose progress streams back to the page.
+    """
+    from feed_brain.services.feedback import bulk_feedback
+
+    session_factory = get_session_factory()
+    async with session_factory() as session:
+        updated = await bulk_feedback(session, ids, feedback)
+
+    job = None
+    if feedback == Feedback.APPROVED and updated:
+        job, _ = request.app.state.jobs.start("clippings", _clippings_work(), rerun=True)
+
+    if not request.headers.get("HX-Request"):
+        return {"updated": updated, "job_id": job.id if job else None}
+    templates = request.app.state.templates
+    return templates.TemplateResponse(
+        request,
+        "partials/bulk_feedback.html",
+        {"updated": updated, "feedback": feedback, "job": job.view() if job else None},
+    )
+
+
+def _sse(event: str, data: str) -> str:
+    """Format one server-sent event; multi-line data becomes several data fields."""
+    lines = "".join(f"data: {line}\n" for line in data.splitlines() or [""])
+    return f"event: {event}\n{lines}\n"
+
+
+async def _fetch_and_classify(progress) -> dict:
+    """Background job body for a refresh: fetch all feeds, then classify."""
     from feed_brain.services.classifier import classify_unclassified
     from feed_brain.services.fetcher import fetch_all_feeds
 
-    new_articles = await fetch_all_feeds()
-    classified = await classify_unclassified()
-    log.info("fetch_triggered", new_articles=new_articles, classified=classified)
+    new_articles = await fetch_all_feeds(progress)
+    classified = await classify_unclassified(progress=progress)
     return {"new_articles": new_articles, "classified": classified}
 
 
+@router.post("/fetch")
+async def trigger_fetch(request: Request):
+    """Start (or join) the background fetch + classification job.
+
+    Returns immediately with the job ID; a refresh already in flight is
+    reused rather than started twice. htmx requests get a live progress panel.
+    """
+    job, started = request.app.state.jobs.start("fetch", _fetch_and_classify)
+    log.info("fetch_triggered", job_id=job.id, started=started)
+    if request.headers.get("HX-Request"):
+        return request.app.state.templates.TemplateResponse(
+            request, "partials/job_progress.html", {"job": job.view(), "stream": True}
+        )
+    return JSONResponse({"job_id": job.id, "started": started}, status_code=202)
+
+
+def _get_job(request: Request, job_id: str):
+    job = request.app.state.jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get("/jobs/{job_id}")
+async def job_status(request: Request, job_id: str):
+    """Current state of a background job as JSON."""
+    return _get_job(request, job_id).view()
+
+
+@router.get("/jobs/{job_id}/events")
+async def job_events(request: Request, job_id: str):
+    """Stream job progress as server-sent events until the job finishes."""
+    job = _get_job(request, job_id)
+    panel = request.app.state.templates.get_template("partials/job_progress_body.html")
+
+    async def events():
+        async for view in job.watch():
+            yield _sse("progress", panel.render(job=view))
+        yield _sse("done", "")
+
+    return StreamingResponse(
+        events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"}
+    )
+
+
 @router.get("/feeds", response_class=HTMLResponse)
 async def feeds_page(request: Request):
     """Feed source management page."""
-    session_factory = get_session_factory()
+    session_factory = get_read_session_factory()
     async with session_factory() as session:
         result = await session.execute(
             select(FeedSource).where(FeedSource.active.is_(True)).order_by(FeedSource.name)
@@ -173,7 +447,7 @@ async def feeds_page(request: Request):
         sources = result.scalars().all()
 
     templates = request.app.state.templates
-    return templates.TemplateResponse("feeds.html", {"request": request, "sources": sources})
+    return templates.TemplateResponse(request, "feeds.html", {"sources": sources})
 
 
 @router.post("/feeds", response_class=HTMLResponse)
@@ -209,6 +483,7 @@ async def delete_feed(feed_id: int):
         await session.execute(
             Article.__table__.update().where(Article.source_id == feed_id).values(source_id=None)
         )
+        await reassign_source(session, feed_id)
         await session.delete(source)
         await session.commit()
 
@@ -243,36 +518,72 @@ async def edit_feed(request: Request, feed_id: int, name: str = Form(...), url:
 
 
 @router.post("/feeds/import", response_class=HTMLResponse)
-async def import_opml(request: Request, opml_file: UploadFile):
-    """Import feeds from an OPML file."""
-    from feed_brain.services.opml import parse_opml
+async def import_opml(request: Request, opml_file: UploadFile, probe: bool = Form(False)):
+    """Import feeds from an OPML file, optionally probing each feed afterwards."""
+    from feed_brain.services.opml import import_feeds, iter_opml
 
-    content = await opml_file.read()
-    feeds = parse_opml(content.decode("utf-8"))
+    try:
+        feeds = await asyncio.to_thread(lambda: list(iter_opml(opml_file.file)))
+    except ElementTree.ParseError as e:
+        log.error("opml_parse_error", error=str(e))
+        return HTMLResponse("<p>Invalid OPML file.</p>", status_code=400)
 
     session_factory = get_session_factory()
-    imported = 0
     async with session_factory() as session:
-        for feed in feeds:
-            existing = await session.execute(
-                select(FeedSource.id).where(FeedSource.url == feed["url"])
-            )
-            if existing.scalar_one_or_none() is not None:
-                continue
+        imported = await import_feeds(session, feeds)
 
-            source = FeedSource(name=feed["name"], url=feed["url"], feed_type="rss")
-            session.add(source)
-            imported += 1
+    log.info("opml_imported", imported=imported, total=len(feeds))
+    urls = [feed["url"] for feed in feeds] if probe else []
+    return await _render_feed_list(request, probe_urls=urls)
 
-        await session.commit()
 
-    log.info("opml_imported", imported=imported, total=len(feeds))
-    return await _render_feed_list(request)
+@router.post("/feeds/probe", response_class=HTMLResponse)
+async def probe_all_feeds(request: Request):
+    """Start a reachability check of every active feed."""
+    session_factory = get_read_session_factory()
+    async with session_factory() as session:
+        urls = (
+            (await session.execute(select(FeedSource.url).where(FeedSource.active.is_(True))))
+            .scalars()
+            .all()
+        )
 
+    return await _render_feed_list(request, probe_urls=urls)
 
-async def _render_feed_list(request: Request) -> HTMLResponse:
-    """Re-render the feed list partial for htmx swaps."""
-    session_factory = get_session_factory()
+
+@router.get("/feeds/probe/{token}")
+async def probe_stream(request: Request, token: str):
+    """Stream probe results as server-sent events, one table row per feed."""
+    from feed_brain.services.feed_probe import probe_feeds
+
+    urls = request.app.state.probe_batches.pop(token)
+    if urls is None:
+        raise HTTPException(status_code=404, detail="Unknown probe")
+
+    row = request.app.state.templates.get_template("partials/feed_probe_row.html")
+
+    async def events():
+        ok = failed = 0
+        async for result in probe_feeds(urls):
+            ok += result.ok
+            failed += not result.ok
+            yield _sse("probe", row.render(probe=result))
+            yield _sse("summary", f"{ok + failed}/{len(urls)} checked, {failed} failing")
+        log.info("feeds_probe_done", ok=ok, failed=failed)
+        yield _sse("done", "")
+
+    return StreamingResponse(
+        events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"}
+    )
+
+
+async def _render_feed_list(request: Request, probe_urls: list[str] | None = None) -> HTMLResponse:
+    """Re-render the feed list partial for htmx swaps.
+
+    With probe_urls, the response also carries an out-of-band probe panel that
+    streams results from /feeds/probe/{token}.
+    """
+    session_factory = get_read_session_factory()
     async with session_factory() as session:
         result = await session.execute(
             select(FeedSource).where(FeedSource.active.is_(True)).order_by(FeedSource.name)
@@ -280,6 +591,11 @@ async def _render_feed_list(request: Request) -> HTMLResponse:
         sources = result.scalars().all()
 
     templates = request.app.state.templates
+    probe_token = None
+    if probe_urls:
+        probe_token = request.app.state.probe_batches.add(probe_urls)
     return templates.TemplateResponse(
-        "partials/feed_list_table.html", {"request": request, "sources": sources}
+        request,
+        "partials/feed_list_table.html",
+        {"sources": sources, "probe_token": probe_token, "probe_total": len(probe_urls or [])},
     )
@@ -0,0 +1,68 @@
+# ABOUTME: ASGI middleware reporting per-request SQL query counts and DB time.
+# ABOUTME: Adds a Server-Timing header and logs requests that run too many statements.
+
+import time
+
+import structlog
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from feed_brain.db.profiling import QueryStats, track_queries
+
+log = structlog.get_logger()
+
+
+def server_timing(stats: QueryStats, elapsed: float) -> str:
+    """Server-Timing value: DB statements and time, plus total app time so far."""
+    return (
+        f'db;dur={stats.seconds * 1000:.2f};desc="{stats.count} queries", '
+        f"app;dur={elapsed * 1000:.2f}"
+    )
+
+
+class ServerTimingMiddleware:
+    """Count the SQL each HTTP request runs and report it.
+
+    The header reflects the statements run before the response starts; for
+    streamed responses the log line, written when the request finishes, has
+    the full count. Requests over `warn_queries` statements log a warning,
+    which is how an N+1 query shows up in production.
+    """
+
+    def __init__(self, app: ASGIApp, warn_queries: int) -> None:
+        self.app = app
+        self.warn_queries = warn_queries
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+        with track_queries() as stats:
+
+            async def send_with_timing(message: Message) -> None:
+                nonlocal status
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    headers = MutableHeaders(scope=message)
+                    headers.append(
+                        "Server-Timing", server_timing(stats, time.perf_counter() - started)
+                    )
+                await send(message)
+
+            await self.app(scope, receive, send_with_timing)
+
+        fields = {
+            "method": scope["method"],
+            "path": scope["path"],
+            "status": status,
+            "queries": stats.count,
+            "db_ms": round(stats.seconds * 1000, 2),
+            "total_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+        if stats.count > self.warn_queries:
+            log.warning("request_query_budget_exceeded", budget=self.warn_queries, **fields)
+        else:
+            log.debug("request_timing", **fields)
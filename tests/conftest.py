@@ -1,12 +1,17 @@
 # ABOUTME: Shared test fixtures for feed-brain.
-# ABOUTME: Provides async DB session, test client, and sample data factories.
+# ABOUTME: Provides async DB session, test client, query budgets and sample data factories.
 
+import contextlib
 from collections.abc import AsyncGenerator
 
+import httpx
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
+from feed_brain.config import get_settings
 from feed_brain.db.models import Article, Base, FeedSource
+from feed_brain.db.profiling import track_queries
+from feed_brain.db.session import close_db, init_db
 
 
 @pytest.fixture
@@ -23,6 +28,43 @@ async def db_session() -> AsyncGenerator[AsyncSession]:
     await engine.dispose()
 
 
+@pytest.fixture
+def session_factory(db_session) -> async_sessionmaker[AsyncSession]:
+    """Factory for further short sessions on db_session's in-memory database."""
+    return async_sessionmaker(db_session.bind, expire_on_commit=False)
+
+
+@pytest.fixture
+async def app_client(tmp_path, monkeypatch) -> AsyncGenerator[httpx.AsyncClient]:
+    """HTTP client for the web app, backed by a temporary on-disk database."""
+    from feed_brain.web.app import create_app
+
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "feed_brain.db"))
+    monkeypatch.setenv("ARCHIVE_DB_PATH", str(tmp_path / "feed_brain_archive.db"))
+    get_settings.cache_clear()
+    await init_db()
+
+    transport = httpx.ASGITransport(app=create_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+    await close_db()
+    get_settings.cache_clear()
+
+
+@pytest.fixture
+def assert_queries():
+    """`with assert_queries(n):` fails the test if the block runs more than n SQL statements."""
+
+    @contextlib.contextmanager
+    def check(budget: int):
+        with track_queries() as stats:
+            yield stats
+        assert stats.count <= budget, f"ran {stats.count} SQL statements, budget is {budget}"
+
+    return check
+
+
 @pytest.fixture
 def sample_feed_source() -> FeedSource:
     """Sample feed source for tests."""
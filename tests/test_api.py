@@ -0,0 +1,157 @@
+# ABOUTME: Tests for the versioned JSON API under /api/v1.
+# ABOUTME: Covers cursor pagination, field projection, filters, compression and stats.
+
+from datetime import UTC, datetime, timedelta
+
+from feed_brain.db.models import Article, FeedSource
+from feed_brain.db.session import get_session_factory
+from feed_brain.services.stats import repair_stats
+from feed_brain.web.api import brotli
+
+
+async def _seed(count: int, **fields) -> list[int]:
+    now = datetime.now(UTC)
+    async with get_session_factory()() as session:
+        articles = [
+            Article(
+                url=f"https://example.com/{i}",
+                title=f"Article {i}",
+                content=f"<p>Body {i}</p>" + "x" * 400,
+                fetched_at=now - timedelta(hours=i),
+                **fields,
+            )
+            for i in range(count)
+        ]
+        session.add_all(articles)
+        await session.commit()
+        return [article.id for article in articles]
+
+
+async def test_articles_cursor_pagination(app_client):
+    """Pages follow next_cursor newest first until the last page returns null."""
+    ids = await _seed(5)
+
+    first = (await app_client.get("/api/v1/articles", params={"limit": 2})).json()
+    assert [item["id"] for item in first["data"]] == ids[:2]
+    second = (
+        await app_client.get(
+            "/api/v1/articles", params={"limit": 2, "cursor": first["next_cursor"]}
+        )
+    ).json()
+    assert [item["id"] for item in second["data"]] == ids[2:4]
+    last = (
+        await app_client.get(
+            "/api/v1/articles", params={"limit": 2, "cursor": second["next_cursor"]}
+        )
+    ).json()
+    assert [item["id"] for item in last["data"]] == ids[4:]
+    assert last["next_cursor"] is None
+
+
+async def test_articles_field_projection(app_client):
+    """fields= limits the keys; content is only returned on request."""
+    ids = await _seed(1, actionables='["Try it"]')
+
+    default = (await app_client.get("/api/v1/articles")).json()["data"][0]
+    assert "content" not in default
+    assert default["actionables"] == ["Try it"]
+    assert default["fetched_at"].endswith("+00:00")
+
+    slim = (await app_client.get("/api/v1/articles", params={"fields": "id,title,content"})).json()
+    assert slim["data"] == [
+        {"id": ids[0], "title": "Article 0", "content": slim["data"][0]["content"]}
+    ]
+    assert slim["data"][0]["content"].startswith("<p>Body 0</p>")
+
+    detail = await app_client.get(f"/api/v1/articles/{ids[0]}", params={"fields": "title"})
+    assert detail.json() == {"title": "Article 0"}
+    assert (await app_client.get("/api/v1/articles/999")).status_code == 404
+
+
+async def test_articles_filters(app_client):
+    """tier, source_id and since/until narrow the result."""
+    async with get_session_factory()() as session:
+        source = FeedSource(name="Simon", url="https://simonwillison.net/atom/")
+        session.add(source)
+        await session.commit()
+    ids = await _seed(3, tier="high", source_id=source.id)
+    async with get_session_factory()() as session:
+        session.add(Article(url="https://example.com/low", title="Low", tier="low"))
+        await session.commit()
+
+    by_tier = (await app_client.get("/api/v1/articles", params={"tier": "high"})).json()
+    assert [item["id"] for item in by_tier["data"]] == ids
+    by_source = (
+        await app_client.get(
+            "/api/v1/articles", params={"source_id": source.id, "fields": "id,source_name"}
+        )
+    ).json()
+    assert {item["source_name"] for item in by_source["data"]} == {"Simon"}
+
+    since = (datetime.now(UTC) - timedelta(minutes=90)).isoformat()
+    recent = (
+        await app_client.get("/api/v1/articles", params={"tier": "high", "since": since})
+    ).json()
+    assert [item["id"] for item in recent["data"]] == ids[:2]
+
+
+async def test_articles_bad_requests(app_client):
+    """Unknown fields, bad cursors and invalid enums are rejected."""
+    assert (await app_client.get("/api/v1/articles?fields=id,nope")).status_code == 400
+    assert (await app_client.get("/api/v1/articles?cursor=%%%")).status_code == 400
+    assert (await app_client.get("/api/v1/articles?tier=urgent")).status_code == 422
+
+
+async def test_responses_are_compressed_when_accepted(app_client):
+    """Large payloads are gzip- or brotli-encoded; small ones are sent as is."""
+    await _seed(10)
+
+    gzipped = await app_client.get(
+        "/api/v1/articles", params={"fields": "id,content"}, headers={"Accept-Encoding": "gzip"}
+    )
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert gzipped.headers["vary"] == "Accept-Encoding"
+    assert len(gzipped.json()["data"]) == 10
+
+    refused = await app_client.get(
+        "/api/v1/articles",
+        params={"fields": "id,content"},
+        headers={"Accept-Encoding": "br;q=0, gzip"},
+    )
+    assert refused.headers["content-encoding"] == "gzip"
+
+    if brotli is not None:
+        br = await app_client.get(
+            "/api/v1/articles",
+            params={"fields": "id,content"},
+            headers={"Accept-Encoding": "gzip, br"},
+        )
+        assert br.headers["content-encoding"] == "br"
+
+    small = await app_client.get(
+        "/api/v1/articles", params={"fields": "id", "limit": 1}, headers={"Accept-Encoding": "gzip"}
+    )
+    assert "content-encoding" not in small.headers
+
+
+async def test_feeds_and_stats(app_client):
+    """Feeds carry their per-source counters; stats break totals down by dimension."""
+    async with get_session_factory()() as session:
+        source = FeedSource(name="Simon", url="https://simonwillison.net/atom/")
+        session.add(source)
+        await session.commit()
+    await _seed(2, tier="high", category="ai_agents", source_id=source.id, feedback="approved")
+    async with get_session_factory()() as session:
+        await repair_stats(session)
+
+    feeds = (await app_client.get("/api/v1/feeds")).json()["data"]
+    assert feeds[0]["name"] == "Simon"
+    assert feeds[0]["articles"] == 2
+    assert (await app_client.get("/api/v1/feeds", params={"active": "false"})).json() == {
+        "data": []
+    }
+
+    stats = (await app_client.get("/api/v1/stats")).json()
+    assert stats["totals"]["articles"] == 2
+    assert stats["tier"]["high"]["articles"] == 2
+    assert stats["source"][str(source.id)]["articles"] == 2
@@ -0,0 +1,113 @@
+# ABOUTME: Tests for retention, compressed cold archive, and lazy restore.
+# ABOUTME: Verifies policy selection, body moves, compression, and archived reads.
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from feed_brain.config import Settings
+from feed_brain.db import compression
+from feed_brain.db.compression import compress, decompress
+from feed_brain.db.models import ArchiveBase, ArchivedBody, Article, ArticleBody
+from feed_brain.services.archive import archive_expired, count_expired
+
+
+@pytest.fixture
+async def archive_session():
+    """In-memory archive database session."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(ArchiveBase.metadata.create_all)
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        yield session
+    await engine.dispose()
+
+
+def test_compression_roundtrip_with_zlib(monkeypatch):
+    """zlib fallback output decompresses to the original text."""
+    monkeypatch.setattr(compression, "zstandard", None)
+    text = "<p>café " * 500
+    data = compress(text)
+    assert data[0] == compression.CODEC_ZLIB
+    assert len(data) < len(text) / 5
+    assert decompress(data) == text
+
+
+def test_decompress_rejects_unknown_codec():
+    """Unknown codec headers raise instead of returning garbage."""
+    with pytest.raises(ValueError):
+        decompress(b"\x7fgarbage")
+
+
+async def _seed_policy_cases(db_session) -> dict[str, Article]:
+    now = datetime.now(UTC)
+    old = now - timedelta(days=60)
+    cases = {
+        "old_low": Article(url="https://x.com/1", title="1", tier="low", fetched_at=old),
+        "fresh_low": Article(url="https://x.com/2", title="2", tier="low", fetched_at=now),
+        "old_high": Article(url="https://x.com/3", title="3", tier="high", fetched_at=old),
+        "old_medium_skipped": Article(
+            url="https://x.com/4", title="4", tier="medium", feedback="skipped", fetched_at=old
+        ),
+        "old_low_approved": Article(
+            url="https://x.com/5", title="5", tier="low", feedback="approved", fetched_at=old
+        ),
+    }
+    for name, article in cases.items():
+        article.content = f"<p>{name} body</p>" * 20
+    db_session.add_all(cases.values())
+    await db_session.commit()
+    return cases
+
+
+async def test_archive_expired_applies_policy(db_session, archive_session):
+    """Only bodies past their tier/feedback limits move; approved ones stay."""
+    cases = await _seed_policy_cases(db_session)
+    settings = Settings()
+
+    assert await count_expired(db_session, settings) == 2
+    archived = await archive_expired(db_session, archive_session, settings)
+
+    assert archived == 2
+    hot = await db_session.execute(select(ArticleBody.article_id))
+    assert set(hot.scalars().all()) == {
+        cases["fresh_low"].id,
+        cases["old_high"].id,
+        cases["old_low_approved"].id,
+    }
+    stubs = await db_session.execute(
+        select(Article.id).where(Article.archived_at.isnot(None)).order_by(Article.id)
+    )
+    assert stubs.scalars().all() == [cases["old_low"].id, cases["old_medium_skipped"].id]
+
+    stored = await archive_session.execute(
+        select(ArchivedBody.content).where(ArchivedBody.article_id == cases["old_low"].id)
+    )
+    assert decompress(stored.scalar_one()) == "<p>old_low body</p>" * 20
+    assert await count_expired(db_session, settings) == 0
+
+
+async def test_incremental_vacuum_reclaims_pages(tmp_path):
+    """New databases use incremental auto-vacuum, so freed pages can be returned."""
+    from sqlalchemy import text
+
+    from feed_brain.db.session import create_engine
+    from feed_brain.services.archive import vacuum
+
+    engine = create_engine(Settings(db_path=tmp_path / "vacuum.db"))
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE blobs (data TEXT)"))
+        await conn.execute(
+            text(
+                "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 200) "
+                "INSERT INTO blobs SELECT hex(randomblob(4000)) FROM n"
+            )
+        )
+        await conn.execute(text("DELETE FROM blobs"))
+
+    reclaimed = await vacuum(engine)
+    await engine.dispose()
+
+    assert reclaimed > 100
@@ -0,0 +1,32 @@
+# ABOUTME: Tests for the offline pipeline benchmark and its synthetic server.
+# ABOUTME: Runs a tiny fetch → classify pass end to end against the local server.
+
+from feed_brain.bench import BenchConfig, percentiles, run_pipeline_bench
+
+
+def test_pipeline_bench_runs_offline(tmp_path):
+    """Every synthetic article is fetched and classified through the fake API."""
+    config = BenchConfig(
+        feeds=2, articles_per_feed=3, article_bytes=2000, latency_ms=0, classifier_latency_ms=0
+    )
+
+    report = run_pipeline_bench(config, workdir=tmp_path)
+
+    assert report["stages"]["fetch"]["articles"] == 6
+    assert report["stages"]["classify"]["articles"] == 6
+    assert report["stages"]["classify"]["unclassified_left"] == 0
+    assert report["server"]["requests"] == {"feed": 2, "article": 6, "classify": 6}
+    assert set(report["stages"]["fetch"]["per_feed"]) == {"p50_ms", "p90_ms", "p99_ms", "max_ms"}
+    assert report["peak_rss_mb"] > 0
+
+
+def test_percentiles_nearest_rank():
+    """Percentiles are reported in milliseconds."""
+    samples = [i / 1000 for i in range(1, 101)]
+    assert percentiles(samples) == {
+        "p50_ms": 51.0,
+        "p90_ms": 91.0,
+        "p99_ms": 100.0,
+        "max_ms": 100.0,
+    }
+    assert percentiles([]) == {}
@@ -0,0 +1,54 @@
+# ABOUTME: Tests for the rendered-fragment cache and HTTP validator helpers.
+# ABOUTME: Verifies LRU eviction, hit counting, and conditional request evaluation.
+
+from datetime import datetime
+
+from starlette.requests import Request
+
+from feed_brain.web.caching import FragmentCache, not_modified, weak_etag
+
+
+def _request(headers: dict[str, str]) -> Request:
+    raw = [(key.lower().encode(), value.encode()) for key, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+
+def test_fragment_cache_lru_eviction():
+    """Least recently used fragments are evicted first; hits skip rendering."""
+    cache = FragmentCache(maxsize=2)
+    renders = []
+
+    def render(name):
+        return lambda: renders.append(name) or f"<p>{name}</p>"
+
+    cache.get_or_render("a", render("a"))
+    cache.get_or_render("b", render("b"))
+    assert cache.get_or_render("a", render("a")) == "<p>a</p>"
+    cache.get_or_render("c", render("c"))  # evicts b
+    cache.get_or_render("b", render("b"))
+
+    assert renders == ["a", "b", "c", "b"]
+    assert (cache.hits, cache.misses, len(cache)) == (1, 4, 2)
+
+
+def test_not_modified_prefers_etag():
+    """If-None-Match decides when present; If-Modified-Since is the fallback."""
+    etag = weak_etag("page", 1)
+    modified = datetime(2026, 2, 8, 12, 0, 0, 500)
+
+    assert not_modified(_request({"If-None-Match": etag}), etag, modified)
+    assert not_modified(_request({"If-None-Match": f'"x", {etag[2:]}'}), etag, modified)
+    assert not not_modified(
+        _request(
+            {"If-None-Match": '"other"', "If-Modified-Since": "Sun, 08 Feb 2026 13:00:00 GMT"}
+        ),
+        etag,
+        modified,
+    )
+    assert not_modified(
+        _request({"If-Modified-Since": "Sun, 08 Feb 2026 12:00:00 GMT"}), etag, modified
+    )
+    assert not not_modified(
+        _request({"If-Modified-Since": "Sun, 08 Feb 2026 11:59:59 GMT"}), etag, modified
+    )
+    assert not not_modified(_request({"If-Modified-Since": "garbage"}), etag, modified)
@@ -2,11 +2,23 @@
 # ABOUTME: Verifies classification parsing, error handling, and tier assignment.
 
 import json
+from datetime import UTC, datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock
 
-from feed_brain.db.models import Article
-from feed_brain.models import Category, Tier
-from feed_brain.services.classifier import classify_article
+from sqlalchemy import select
+
+from feed_brain.config import Settings
+from feed_brain.db.models import Article, FeedSource
+from feed_brain.models import Category, ClassificationBudget, Tier
+from feed_brain.services.classifier import _classify_queue, _rank_unclassified, classify_article
+
+VALID_RESPONSE = {
+    "tier": "medium",
+    "category": "development",
+    "summary": "A summary.",
+    "reason": "A reason.",
+    "confidence": 0.5,
+}
 
 
 def _mock_anthropic_response(data: dict) -> MagicMock:
@@ -84,3 +96,171 @@ async def test_classify_article_missing_key():
 
     result = await classify_article(article, client=client)
     assert result is None
+
+
+async def _seed_queue(db_session) -> dict[str, int]:
+    """Store a high-yield and a low-yield source with unclassified articles."""
+    now = datetime.now(UTC)
+    good = FeedSource(name="Good", url="https://good.com/feed.xml")
+    noisy = FeedSource(name="Noisy", url="https://noisy.com/feed.xml")
+    db_session.add_all([good, noisy])
+    await db_session.flush()
+
+    # Classification history: Good yields high-tier articles, Noisy never does
+    for i in range(4):
+        db_session.add_all(
+            [
+                Article(
+                    url=f"https://good.com/old-{i}",
+                    title="Old",
+                    source_id=good.id,
+                    tier="high",
+                    classified_at=now,
+                ),
+                Article(
+                    url=f"https://noisy.com/old-{i}",
+                    title="Old",
+                    source_id=noisy.id,
+                    tier="low",
+                    classified_at=now,
+                ),
+            ]
+        )
+
+    pending = {
+        "stale": Article(
+            url="https://good.com/stale",
+            title="Stale",
+            source_id=good.id,
+            content="x",
+            fetched_at=now - timedelta(days=7),
+        ),
+        "fresh_noisy": Article(
+            url="https://noisy.com/fresh",
+            title="Fresh noisy",
+            source_id=noisy.id,
+            content="x",
+            fetched_at=now,
+        ),
+        "fresh_good": Article(
+            url="https://good.com/fresh",
+            title="Fresh good",
+            source_id=good.id,
+            content="x",
+            fetched_at=now,
+        ),
+        "no_content": Article(
+            url="https://good.com/empty", title="Empty", source_id=good.id, fetched_at=now
+        ),
+    }
+    db_session.add_all(pending.values())
+    await db_session.commit()
+    return {name: article.id for name, article in pending.items()}
+
+
+async def test_rank_unclassified_prefers_fresh_high_yield_sources(db_session):
+    """Recency and source high-tier rate decide the queue order."""
+    import heapq
+
+    ids = await _seed_queue(db_session)
+
+    heap = await _rank_unclassified(db_session)
+    order = [heapq.heappop(heap)[1] for _ in range(len(heap))]
+
+    assert order == [ids["fresh_good"], ids["fresh_noisy"], ids["stale"]]
+
+
+async def test_classify_queue_stops_at_article_budget(db_session, session_factory):
+    """Exhausting max_articles leaves the lowest-priority articles unclassified."""
+    ids = await _seed_queue(db_session)
+    client = AsyncMock()
+    client.messages.create = AsyncMock(return_value=_mock_anthropic_response(VALID_RESPONSE))
+
+    classified = await _classify_queue(
+        session_factory, client, Settings(), ClassificationBudget(max_articles=2)
+    )
+
+    assert classified == 2
+    result = await db_session.execute(
+        select(Article.id).where(Article.classified_at.is_(None), Article.content.isnot(None))
+    )
+    assert result.scalars().all() == [ids["stale"]]
+
+
+async def test_classify_queue_stops_at_cost_budget(db_session, session_factory):
+    """A spend budget smaller than one article's estimate classifies nothing."""
+    await _seed_queue(db_session)
+    client = AsyncMock()
+    client.messages.create = AsyncMock(return_value=_mock_anthropic_response(VALID_RESPONSE))
+
+    classified = await _classify_queue(
+        session_factory, client, Settings(), ClassificationBudget(max_cost_usd=0.000001)
+    )
+
+    assert classified == 0
+    client.messages.create.assert_not_called()
+
+
+async def test_reclassify_only_touches_outdated_rows_in_scope(db_session, session_factory):
+    """Rows on the current profile or outside the tier filter are left alone."""
+    from feed_brain.services.classifier import _reclassify_outdated, classifier_version
+
+    settings = Settings()
+    current = classifier_version(settings)
+    now = datetime.now(UTC)
+    articles = {
+        "old_high": Article(
+            url="https://x.com/1",
+            title="1",
+            content="x",
+            tier="high",
+            classified_at=now,
+            classifier_version="old-model:abc",
+        ),
+        "legacy_high": Article(
+            url="https://x.com/2", title="2", content="x", tier="high", classified_at=now
+        ),
+        "current_high": Article(
+            url="https://x.com/3",
+            title="3",
+            content="x",
+            tier="high",
+            classified_at=now,
+            classifier_version=current,
+        ),
+        "old_low": Article(
+            url="https://x.com/4",
+            title="4",
+            content="x",
+            tier="low",
+            classified_at=now,
+            classifier_version="old-model:abc",
+        ),
+    }
+    db_session.add_all(articles.values())
+    await db_session.commit()
+
+    client = AsyncMock()
+    client.messages.create = AsyncMock(return_value=_mock_anthropic_response(VALID_RESPONSE))
+
+    count = await _reclassify_outdated(
+        session_factory, client, settings, since=None, tiers=["high"], concurrency=2, limit=None
+    )
+
+    assert count == 2
+    assert client.messages.create.await_count == 2
+    for article in articles.values():
+        await db_session.refresh(article)
+    assert articles["old_high"].classifier_version == current
+    assert articles["legacy_high"].classifier_version == current
+    assert articles["old_low"].classifier_version == "old-model:abc"
+
+
+def test_classifier_version_tracks_model():
+    """Switching the model changes the profile version."""
+    from feed_brain.services.classifier import classifier_version
+
+    haiku = classifier_version(Settings(classifier_model="model-a"))
+    sonnet = classifier_version(Settings(classifier_model="model-b"))
+    assert haiku != sonnet
+    assert haiku.startswith("model-a:")
@@ -1,10 +1,15 @@
 # ABOUTME: Tests for the Obsidian clipping generator.
-# ABOUTME: Verifies markdown file creation, format, and edge cases.
+# ABOUTME: Verifies markdown file creation, format, name collisions and atomic writes.
 
 from datetime import UTC, datetime
 
 from feed_brain.db.models import Article
-from feed_brain.services.clipping import _sanitize_filename, create_clipping
+from feed_brain.services.clipping import (
+    ClippingWriter,
+    _sanitize_filename,
+    create_clipping,
+    render_clipping,
+)
 
 
 async def test_create_clipping_writes_file(tmp_path):
@@ -32,6 +37,20 @@ async def test_create_clipping_writes_file(tmp_path):
     assert "This is the full article content" in content
 
 
+async def test_create_clipping_uses_stored_markdown(tmp_path):
+    """The Markdown converted at extraction is used as is; older bodies are converted."""
+    stored = Article(
+        id=1, url="https://example.com/a", title="Stored", content="<p>html</p>", markdown="md"
+    )
+    legacy = Article(id=2, url="https://example.com/b", title="Legacy", content="<p><b>old</b></p>")
+
+    assert await create_clipping(stored, clippings_dir=tmp_path)
+    assert await create_clipping(legacy, clippings_dir=tmp_path)
+
+    assert (tmp_path / "Stored.md").read_text().endswith("\nmd\n")
+    assert (tmp_path / "Legacy.md").read_text().endswith("\n**old**\n")
+
+
 async def test_create_clipping_missing_dir():
     """Returns False when clippings directory doesn't exist."""
     from pathlib import Path
@@ -41,17 +60,62 @@ async def test_create_clipping_missing_dir():
     assert result is False
 
 
-async def test_create_clipping_existing_file(tmp_path):
-    """Returns True without overwriting if file already exists."""
-    article = Article(url="https://example.com/dup", title="Dup Article", content="new content")
+async def test_create_clipping_name_collision(tmp_path):
+    """A title already taken in the vault gets the article ID as suffix; nothing is overwritten."""
+    article = Article(
+        id=7, url="https://example.com/dup", title="Dup Article", content="new content"
+    )
 
-    existing = tmp_path / "Dup Article.md"
+    existing = tmp_path / "dup article.md"
     existing.write_text("original content")
 
     result = await create_clipping(article, clippings_dir=tmp_path)
 
     assert result is True
     assert existing.read_text() == "original content"
+    assert "new content" in (tmp_path / "Dup Article (7).md").read_text()
+
+
+def test_clipping_writer_scans_once_and_writes_atomically(tmp_path, monkeypatch):
+    """The vault is listed once per writer; reruns recognise their own files; no temp files remain."""
+    import os
+
+    scans = []
+    real_scandir = os.scandir
+    monkeypatch.setattr(
+        "feed_brain.services.clipping.os.scandir",
+        lambda path: scans.append(path) or real_scandir(path),
+    )
+    (tmp_path / "Same.md").write_text("someone else's note")
+    articles = [
+        Article(id=i, url=f"https://example.com/{i}", title=title, content="body")
+        for i, title in [(1, "Same"), (2, "Same"), (3, "Other")]
+    ]
+    writer = ClippingWriter(tmp_path)
+
+    clipped = writer.write_batch([(article, f"clip {article.id}") for article in articles])
+
+    assert clipped == [1, 2, 3]
+    assert len(scans) == 1
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "Other.md",
+        "Same (1).md",
+        "Same (2).md",
+        "Same.md",
+    ]
+    assert (tmp_path / "Same.md").read_text() == "someone else's note"
+    assert ClippingWriter(tmp_path).write_batch([(articles[0], "again")]) == [1]
+    assert (tmp_path / "Same (1).md").read_text() == "clip 1"
+
+
+def test_clipping_writer_recognises_unflagged_own_clipping(tmp_path):
+    """A clipping written by a run that never flagged it is reused, not duplicated."""
+    article = Article(id=4, url="https://example.com/4", title="Mine", content="body")
+    (tmp_path / "Mine.md").write_text(render_clipping(article))
+
+    assert ClippingWriter(tmp_path).write_batch([(article, "rewritten")]) == [4]
+    assert [p.name for p in tmp_path.iterdir()] == ["Mine.md"]
+    assert (tmp_path / "Mine.md").read_text() != "rewritten"
 
 
 async def test_create_clipping_special_yaml_chars(tmp_path):
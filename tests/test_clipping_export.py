@@ -0,0 +1,102 @@
+# ABOUTME: Tests for reconciling approved articles with the clippings vault.
+# ABOUTME: Covers missing, stale and foreign files, dry runs and zip export.
+
+import zipfile
+from datetime import UTC, datetime
+
+from sqlalchemy import select
+
+from feed_brain.db.models import Article
+from feed_brain.services.clipping_export import export_clippings, export_clippings_zip
+
+
+async def _approved(db_session, *titles: str) -> list[Article]:
+    articles = [
+        Article(
+            url=f"https://example.com/{i}",
+            title=title,
+            content=f"<p>Body {i}</p>",
+            markdown=f"Body {i}",
+            feedback="approved",
+            feedback_at=datetime(2026, 3, 1, tzinfo=UTC),
+        )
+        for i, title in enumerate(titles)
+    ]
+    db_session.add_all([*articles, Article(url="https://example.com/skip", title="Skipped")])
+    await db_session.commit()
+    return articles
+
+
+async def test_export_reconciles_vault(db_session, tmp_path):
+    """Missing clippings are written, stale ones rewritten, other notes left alone."""
+    _, stale, taken, _ = await _approved(db_session, "Fresh", "Stale", "Taken", "New")
+    await export_clippings(db_session, tmp_path)
+    stale.summary = "Revised summary"
+    await db_session.commit()
+    (tmp_path / "New.md").unlink()
+    (tmp_path / "Taken.md").unlink()
+    (tmp_path / "taken.md").write_text("my own note")
+
+    result = await export_clippings(db_session, tmp_path, concurrency=2, mark_created=True)
+
+    assert (result.written, result.updated, result.unchanged, result.conflicts) == (2, 1, 1, 0)
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "Fresh.md",
+        "New.md",
+        "Stale.md",
+        f"Taken ({taken.id}).md",
+        "taken.md",
+    ]
+    assert "Revised summary" in (tmp_path / "Stale.md").read_text()
+    assert "created: 2026-03-01" in (tmp_path / "New.md").read_text()
+    assert (tmp_path / "taken.md").read_text() == "my own note"
+    flags = (await db_session.execute(select(Article.clipping_created).order_by(Article.id))).all()
+    assert [flag for (flag,) in flags] == [True, True, True, True, False]
+
+    again = await export_clippings(db_session, tmp_path)
+    assert (again.written, again.updated, again.unchanged) == (0, 0, 4)
+
+
+async def test_export_keeps_edited_clippings_unless_forced(db_session, tmp_path):
+    """A stale clipping edited in the vault is kept and reported; --force rewrites it."""
+    (article,) = await _approved(db_session, "Edited")
+    await export_clippings(db_session, tmp_path)
+    path = tmp_path / "Edited.md"
+    edited = path.read_text() + "\nMy notes\n"
+    path.write_text(edited)
+
+    assert (await export_clippings(db_session, tmp_path)).unchanged == 1
+
+    article.summary = "Revised summary"
+    await db_session.commit()
+    result = await export_clippings(db_session, tmp_path)
+    assert (result.updated, result.edited) == (0, 1)
+    assert path.read_text() == edited
+
+    forced = await export_clippings(db_session, tmp_path, force=True)
+    assert (forced.updated, forced.edited) == (1, 0)
+    assert "Revised summary" in path.read_text()
+    assert "My notes" not in path.read_text()
+
+
+async def test_export_dry_run_writes_nothing(db_session, tmp_path):
+    """A dry run reports what would change without touching the folder."""
+    await _approved(db_session, "One", "Two")
+
+    result = await export_clippings(db_session, tmp_path, dry_run=True)
+
+    assert result.written == 2
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test_export_zip(db_session, tmp_path):
+    """All approved clippings go into one zip; duplicate titles get the ID suffix."""
+    _, second = await _approved(db_session, "Same", "Same")
+    zip_path = tmp_path / "clippings.zip"
+
+    result = await export_clippings_zip(db_session, zip_path, batch_size=1)
+
+    assert result.written == 2
+    with zipfile.ZipFile(zip_path) as archive:
+        assert archive.namelist() == ["Same.md", f"Same ({second.id}).md"]
+        assert "Body 0" in archive.read("Same.md").decode()
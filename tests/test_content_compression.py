@@ -0,0 +1,108 @@
+# ABOUTME: Tests for transparent body compression and the compress-content migration.
+# ABOUTME: Verifies BLOB storage, legacy plain-text reads, rewrites, and trained dictionaries.
+
+import random
+
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.orm import selectinload
+
+from feed_brain.db import compression
+from feed_brain.db.models import Article, ArticleBody, CompressionDictionary
+from feed_brain.services.content_compression import compress_existing, train_content_dictionary
+
+BODY = "<p>Agents need context windows and careful prompt caching.</p>" * 40
+
+
+async def _stored(db_session, article_id: int) -> tuple[str, int]:
+    row = await db_session.execute(
+        text("SELECT typeof(content), length(content) FROM article_bodies WHERE article_id = :id"),
+        {"id": article_id},
+    )
+    return tuple(row.one())
+
+
+async def test_content_stored_compressed(db_session):
+    """Bodies are written as compressed BLOBs and read back as the original text."""
+    article = Article(url="https://x.com/1", title="One", content=BODY)
+    db_session.add(article)
+    await db_session.commit()
+
+    storage, size = await _stored(db_session, article.id)
+    assert storage == "blob"
+    assert size < len(BODY) / 5
+
+    db_session.expunge_all()
+    loaded = await db_session.scalar(
+        select(Article).options(selectinload(Article.body)).where(Article.id == article.id)
+    )
+    assert loaded.content == BODY
+
+
+async def test_legacy_text_readable_and_migrated(db_session):
+    """Plain TEXT rows from older databases read unchanged and compress_existing rewrites them."""
+    article = Article(url="https://x.com/2", title="Two")
+    db_session.add(article)
+    await db_session.flush()
+    await db_session.execute(
+        text("INSERT INTO article_bodies (article_id, content) VALUES (:id, :content)"),
+        {"id": article.id, "content": BODY},
+    )
+    await db_session.commit()
+    assert (await _stored(db_session, article.id))[0] == "text"
+    assert await db_session.scalar(select(ArticleBody.content)) == BODY
+
+    assert await compress_existing(db_session, batch_size=1) == 1
+    assert (await _stored(db_session, article.id))[0] == "blob"
+    assert await db_session.scalar(select(ArticleBody.content)) == BODY
+    assert await compress_existing(db_session) == 0
+
+
+@pytest.mark.skipif(compression.zstandard is None, reason="zstandard not installed")
+async def test_trained_dictionary_shrinks_small_bodies(db_session):
+    """A trained dictionary is stored, used for new rows, and keeps old rows readable."""
+    rng = random.Random(0)
+    words = ["agent", "cache", "model", "latency", "review", "schema", "token", "prompt"]
+    for i in range(300):
+        sentence = " ".join(rng.choice(words) for _ in range(30))
+        db_session.add(
+            Article(url=f"https://x.com/d{i}", title=str(i), content=f"<p>{sentence}</p>")
+        )
+    await db_session.commit()
+    before = (await _stored(db_session, 1))[1]
+
+    try:
+        dict_id = await train_content_dictionary(db_session, samples=300)
+        assert await db_session.get(CompressionDictionary, dict_id) is not None
+        assert await compress_existing(db_session, recompress=True) == 300
+        assert (await _stored(db_session, 1))[1] < before
+        assert "<p>" in await db_session.scalar(select(ArticleBody.content).limit(1))
+    finally:
+        compression.reset_dictionaries()
+
+
+@pytest.mark.skipif(compression.zstandard is None, reason="zstandard not installed")
+async def test_dictionary_trained_by_another_process_is_loaded_on_demand(app_client):
+    """Bodies compressed with a dictionary trained after startup still render."""
+    from feed_brain.db.session import get_session_factory
+
+    rng = random.Random(0)
+    async with get_session_factory()() as session:
+        article = Article(url="https://x.com/late", title="Late", content=BODY)
+        session.add(article)
+        for i in range(300):
+            sentence = " ".join(rng.choice(["agent", "cache", "model", "token"]) for _ in range(30))
+            session.add(Article(url=f"https://x.com/s{i}", title=str(i), content=sentence))
+        await session.commit()
+        try:
+            await train_content_dictionary(session, samples=300)
+            await compress_existing(session, recompress=True)
+        finally:
+            compression.reset_dictionaries()  # this process never saw the new dictionary
+
+    try:
+        response = await app_client.get(f"/article/{article.id}")
+        assert response.status_code == 200
+        assert "prompt caching" in response.text
+    finally:
+        compression.reset_dictionaries()
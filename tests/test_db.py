@@ -1,6 +1,7 @@
 # ABOUTME: Tests for database models and session management.
 # ABOUTME: Verifies table creation, article/feed CRUD, and relationships.
 
+import pytest
 from sqlalchemy import select
 
 from feed_brain.db.models import Article, FeedSource
@@ -48,3 +49,92 @@ async def test_unique_url_constraint(db_session):
 
     with pytest.raises(IntegrityError):
         await db_session.flush()
+
+
+async def test_migrate_schema_adds_missing_columns():
+    """Databases created before a column existed get it added in place."""
+    from sqlalchemy import inspect, text
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    from feed_brain.db.models import Base
+    from feed_brain.db.session import _migrate_schema
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(text("DROP INDEX ix_articles_tier_fetched_at_id"))
+        await conn.execute(text("CREATE INDEX ix_articles_tier ON articles (tier)"))
+        await conn.execute(text("CREATE INDEX ix_articles_author ON articles (author)"))
+        await conn.execute(text("ALTER TABLE articles DROP COLUMN classifier_version"))
+
+        await conn.run_sync(_migrate_schema)
+
+        columns = await conn.run_sync(
+            lambda c: {col["name"] for col in inspect(c).get_columns("articles")}
+        )
+        indexes = await conn.run_sync(
+            lambda c: {ix["name"] for ix in inspect(c).get_indexes("articles")}
+        )
+    await engine.dispose()
+
+    assert "classifier_version" in columns
+    assert "ix_articles_tier_fetched_at_id" in indexes
+    assert "ix_articles_tier" not in indexes
+    assert "ix_articles_author" in indexes  # not ours to drop
+
+
+async def test_article_content_stored_in_body_table(db_session, sample_article):
+    """Content goes to article_bodies and is only loaded on request."""
+    from sqlalchemy.exc import InvalidRequestError
+    from sqlalchemy.orm import selectinload
+
+    from feed_brain.db.models import ArticleBody
+
+    db_session.add(sample_article)
+    await db_session.commit()
+    db_session.expunge_all()
+
+    body = (await db_session.execute(select(ArticleBody))).scalar_one()
+    assert body.content.startswith("This is test article content")
+
+    db_session.expunge_all()
+    article = (await db_session.execute(select(Article))).scalar_one()
+    with pytest.raises(InvalidRequestError):
+        _ = article.content
+
+    db_session.expunge_all()
+    article = (
+        await db_session.execute(select(Article).options(selectinload(Article.body)))
+    ).scalar_one()
+    assert article.content == sample_article.content
+
+
+async def test_split_article_bodies_moves_legacy_content():
+    """Databases with articles.content get it moved into article_bodies."""
+    from sqlalchemy import inspect, text
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    from feed_brain.db.models import Base
+    from feed_brain.db.session import _split_article_bodies
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(text("ALTER TABLE articles ADD COLUMN content TEXT"))
+        await conn.execute(
+            text(
+                "INSERT INTO articles (url, title, content, clipping_created, fetched_at) "
+                "VALUES ('https://example.com/a', 'A', '<p>legacy</p>', 0, '2026-01-01')"
+            )
+        )
+
+        await conn.run_sync(_split_article_bodies)
+
+        bodies = (await conn.execute(text("SELECT content FROM article_bodies"))).all()
+        columns = await conn.run_sync(
+            lambda c: {col["name"] for col in inspect(c).get_columns("articles")}
+        )
+    await engine.dispose()
+
+    assert bodies == [("<p>legacy</p>",)]
+    assert "content" not in columns
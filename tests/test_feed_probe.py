@@ -0,0 +1,73 @@
+# ABOUTME: Tests for concurrent feed reachability probing.
+# ABOUTME: Uses a mock HTTP transport to check format sniffing and error reporting.
+
+import httpx
+
+from feed_brain.config import Settings
+from feed_brain.services.feed_probe import ProbeBatches, probe_feeds, sniff_format
+
+RSS = b'<?xml version="1.0"?><rss version="2.0"><channel><title>t</title></channel></rss>'
+ATOM = b'<?xml version="1.0"?><feed xmlns="http://www.w3.org/2005/Atom"><title>t</title></feed>'
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    routes = {
+        "/rss.xml": httpx.Response(200, content=RSS),
+        "/atom.xml": httpx.Response(200, content=ATOM),
+        "/page.html": httpx.Response(200, content=b"<html><body>hi</body></html>"),
+    }
+    return routes.get(request.url.path, httpx.Response(404))
+
+
+def test_sniff_format():
+    """Feed formats are recognised from the document start."""
+    assert sniff_format(RSS) == "rss"
+    assert sniff_format(ATOM) == "atom"
+    assert sniff_format(b"<html>") is None
+
+
+async def test_probe_feeds_reports_each_url():
+    """Every URL gets a result; broken and non-feed URLs are flagged."""
+    urls = [f"https://x.com/{path}" for path in ("rss.xml", "atom.xml", "page.html", "gone")]
+    results = {
+        probe.url: probe
+        async for probe in probe_feeds(
+            urls, concurrency=2, settings=Settings(), transport=httpx.MockTransport(_handler)
+        )
+    }
+
+    assert set(results) == set(urls)
+    assert results[urls[0]].ok and results[urls[0]].feed_format == "rss"
+    assert results[urls[1]].ok and results[urls[1]].feed_format == "atom"
+    assert not results[urls[2]].ok and results[urls[2]].status == 200
+    assert not results[urls[3]].ok and results[urls[3]].status == 404
+
+
+async def test_malformed_urls_fail_their_probe_only():
+    """A URL httpx can't parse is reported as failed instead of aborting the batch."""
+    urls = ["http://a:xx/", "http://[::1/feed", "https://x.com/rss.xml"]
+    results = {
+        probe.url: probe
+        async for probe in probe_feeds(
+            urls, settings=Settings(), transport=httpx.MockTransport(_handler)
+        )
+    }
+
+    assert not results[urls[0]].ok and results[urls[0]].error
+    assert not results[urls[1]].ok and results[urls[1]].error
+    assert results[urls[2]].ok
+
+
+def test_probe_batches_are_taken_once_and_expire():
+    """Tokens hand out their URLs once; unopened batches expire or are capped."""
+    batches = ProbeBatches(ttl=60, maxsize=2)
+    token = batches.add(["https://x.com/rss.xml"])
+    assert batches.pop(token) == ["https://x.com/rss.xml"]
+    assert batches.pop(token) is None
+
+    tokens = [batches.add([f"https://x.com/{i}"]) for i in range(3)]
+    assert len(batches) == 2 and batches.pop(tokens[0]) is None
+
+    batches.ttl = 0
+    assert batches.pop(tokens[2]) is None
+    assert len(batches) == 0
@@ -4,7 +4,8 @@
 from datetime import UTC, datetime
 from unittest.mock import AsyncMock, patch
 
-from sqlalchemy import select
+from sqlalchemy import select, text
+from sqlalchemy.orm import selectinload
 
 from feed_brain.db.models import Article, FeedSource
 from feed_brain.services.fetcher import _fetch_single_feed
@@ -37,11 +38,11 @@ def _make_parsed_feed(entries):
     return feed
 
 
-async def test_fetch_stores_new_article(db_session):
+async def test_fetch_stores_new_article(db_session, session_factory):
     """New articles are extracted and stored in the database."""
     source = FeedSource(name="Test", url="https://test.com/feed.xml")
     db_session.add(source)
-    await db_session.flush()
+    await db_session.commit()
 
     entries = [_make_feed_entry()]
     mock_feed = _make_parsed_feed(entries)
@@ -56,24 +57,27 @@ async def test_fetch_stores_new_article(db_session):
         patch(
             "feed_brain.services.fetcher.extract_content",
             new_callable=AsyncMock,
-            return_value="Extracted content here.",
+            return_value="<p>Extracted <em>content</em> here.</p>",
         ),
     ):
-        count = await _fetch_single_feed(db_session, source, MockSettings())
+        count = await _fetch_single_feed(session_factory, source, MockSettings())
 
     assert count == 1
-    result = await db_session.execute(select(Article))
+    result = await db_session.execute(select(Article).options(selectinload(Article.body)))
     article = result.scalar_one()
     assert article.title == "Test Post"
-    assert article.content == "Extracted content here."
+    assert article.content == "<p>Extracted <em>content</em> here.</p>"
+    assert article.markdown == "Extracted *content* here."
     assert article.source_id == source.id
+    indexed = await db_session.execute(text("SELECT rowid FROM articles_fts"))
+    assert indexed.scalars().all() == [article.id]
 
 
-async def test_fetch_skips_existing_url(db_session):
+async def test_fetch_skips_existing_url(db_session, session_factory):
     """Articles with URLs already in DB are skipped."""
     source = FeedSource(name="Test", url="https://test.com/feed.xml")
     db_session.add(source)
-    await db_session.flush()
+    await db_session.commit()
 
     existing = Article(
         url="https://example.com/post-1",
@@ -82,7 +86,7 @@ async def test_fetch_skips_existing_url(db_session):
         fetched_at=datetime.now(UTC),
     )
     db_session.add(existing)
-    await db_session.flush()
+    await db_session.commit()
 
     entries = [_make_feed_entry(url="https://example.com/post-1")]
     mock_feed = _make_parsed_feed(entries)
@@ -93,16 +97,16 @@ async def test_fetch_skips_existing_url(db_session):
         feed_timeout = 5
 
     with patch("feed_brain.services.fetcher.feedparser.parse", return_value=mock_feed):
-        count = await _fetch_single_feed(db_session, source, MockSettings())
+        count = await _fetch_single_feed(session_factory, source, MockSettings())
 
     assert count == 0
 
 
-async def test_fetch_handles_bozo_feed(db_session):
+async def test_fetch_handles_bozo_feed(db_session, session_factory):
     """Malformed feeds return 0 new articles without crashing."""
     source = FeedSource(name="Bad", url="https://bad.com/feed.xml")
     db_session.add(source)
-    await db_session.flush()
+    await db_session.commit()
 
     mock_feed = _make_parsed_feed([])
     mock_feed.bozo = True
@@ -114,6 +118,6 @@ async def test_fetch_handles_bozo_feed(db_session):
         feed_timeout = 5
 
     with patch("feed_brain.services.fetcher.feedparser.parse", return_value=mock_feed):
-        count = await _fetch_single_feed(db_session, source, MockSettings())
+        count = await _fetch_single_feed(session_factory, source, MockSettings())
 
     assert count == 0
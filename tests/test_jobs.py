@@ -0,0 +1,101 @@
+# ABOUTME: Tests for the in-process background job manager.
+# ABOUTME: Verifies single-flight per kind, progress watching, and failure capture.
+
+import asyncio
+
+from feed_brain.models import JobStatus
+from feed_brain.services.jobs import JobManager
+
+
+async def test_single_flight_per_kind():
+    """Starting a kind that is already running returns the running job."""
+    manager = JobManager()
+    release = asyncio.Event()
+
+    async def work(_progress):
+        await release.wait()
+        return {"ok": True}
+
+    first, started = manager.start("fetch", work)
+    second, started_again = manager.start("fetch", work)
+    other, other_started = manager.start("clippings", work)
+    assert started and other_started and not started_again
+    assert second is first and other is not first
+
+    release.set()
+    await first.task
+    assert first.status == JobStatus.DONE
+    assert first.result == {"ok": True}
+    third, started = manager.start("fetch", work)
+    assert started and third is not first
+    release.set()
+    await third.task
+
+
+async def test_watch_follows_progress_until_done():
+    """Watchers see stage progress and a final snapshot when the job ends."""
+    manager = JobManager()
+    step = asyncio.Event()
+
+    async def work(progress):
+        progress("feeds", 0, 2)
+        await step.wait()
+        progress("feeds", 2)
+        progress("articles", 5)
+        return {"new_articles": 5}
+
+    job, _ = manager.start("fetch", work)
+    await asyncio.sleep(0)
+    seen = []
+
+    async def collect():
+        async for view in job.watch():
+            seen.append(view)
+
+    watcher = asyncio.create_task(collect())
+    await asyncio.sleep(0)
+    step.set()
+    await asyncio.wait_for(watcher, timeout=1)
+
+    assert seen[0].stages["feeds"].done == 0
+    assert seen[-1].status == JobStatus.DONE
+    assert seen[-1].stages["feeds"].done == 2
+    assert seen[-1].stages["feeds"].total == 2
+    assert seen[-1].stages["articles"].done == 5
+
+
+async def test_failed_job_records_error():
+    """Exceptions mark the job failed instead of escaping the task."""
+    manager = JobManager()
+
+    async def work(_progress):
+        raise RuntimeError("feed server exploded")
+
+    job, _ = manager.start("fetch", work)
+    await job.task
+    assert job.status == JobStatus.FAILED
+    assert job.error == "feed server exploded"
+    assert manager.running("fetch") is None
+
+
+async def test_rerun_runs_work_again_before_finishing():
+    """start(rerun=True) on a running job makes it run its work once more."""
+    manager = JobManager()
+    calls = []
+    gate = asyncio.Event()
+
+    async def work(_progress):
+        calls.append(len(calls) + 1)
+        await gate.wait()
+        return {"runs": len(calls)}
+
+    job, _ = manager.start("clippings", work)
+    await asyncio.sleep(0)  # first run is now waiting on the gate
+    again, started = manager.start("clippings", work, rerun=True)
+    assert again is job and not started
+
+    gate.set()
+    await job.task
+    assert calls == [1, 2]
+    assert job.result == {"runs": 2}
+    assert job.rerun is False
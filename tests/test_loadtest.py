@@ -0,0 +1,57 @@
+# ABOUTME: Tests for the synthetic database generator and the web-tier load test.
+# ABOUTME: Generates a small database, checks its shape, then load-tests it in-process.
+
+import sqlite3
+
+import pytest
+
+from feed_brain.loadtest import GenConfig, LoadTestConfig, generate_database, run_loadtest
+
+
+@pytest.fixture(scope="module")
+def generated_db(tmp_path_factory):
+    path = tmp_path_factory.mktemp("loadtest") / "synthetic.db"
+    generate_database(path, GenConfig(articles=3000, sources=20, body_bytes=1500, bodies=10))
+    return path
+
+
+def test_generate_database_shape(generated_db):
+    """Rows, bodies, indexes and dashboard counters all look like a real database."""
+    conn = sqlite3.connect(generated_db)
+    count = lambda sql: conn.execute(sql).fetchone()[0]  # noqa: E731
+
+    assert count("SELECT count(*) FROM articles") == 3000
+    assert count("SELECT count(DISTINCT source_id) FROM articles") > 10
+    assert count("SELECT count(*) FROM articles WHERE tier IS NULL") == 60
+    assert count("SELECT count(DISTINCT category) FROM articles") > 5
+    assert 2800 < count("SELECT count(*) FROM article_bodies") < 3000
+    assert count("SELECT count(*) FROM articles_fts") == 3000
+    # IDs follow fetch order, as they do when articles arrive over time
+    out_of_order = (
+        "SELECT count(*) FROM articles a JOIN articles b ON b.id = a.id + 1 "
+        "WHERE b.fetched_at < a.fetched_at"
+    )
+    assert count(out_of_order) == 0
+    indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='index'")}
+    assert "ix_articles_tier_fetched_at_id" in indexes
+    assert count("SELECT articles FROM stat_counters WHERE dimension = 'all'") == 3000
+    assert count("SELECT sum(approved) FROM stat_counters WHERE dimension = 'tier'") == count(
+        "SELECT count(*) FROM articles WHERE feedback = 'approved'"
+    )
+    conn.close()
+
+    with pytest.raises(FileExistsError):
+        generate_database(generated_db, GenConfig(articles=1))
+
+
+def test_loadtest_reports_each_route(generated_db):
+    """Every route in the mix is exercised without errors and gets RPS and p99."""
+    report = run_loadtest(generated_db, LoadTestConfig(requests=60, concurrency=4))
+
+    assert report["requests"] == 60
+    assert set(report["routes"]) == {"feed_list", "article_detail", "feedback"}
+    for route in report["routes"].values():
+        assert route["errors"] == 0
+        assert route["rps"] > 0
+        assert route["p99_ms"] >= route["p50_ms"]
+    assert sum(route["requests"] for route in report["routes"].values()) == 60
@@ -0,0 +1,72 @@
+# ABOUTME: Tests for the HTML-to-Markdown converter used for clippings.
+# ABOUTME: Covers every tag the extractor keeps, escaping and malformed nesting.
+
+from feed_brain.services.extractor import ALLOWED_TAGS
+from feed_brain.services.markdown import BLOCKS, SPANS, VOID, html_to_markdown
+
+
+def test_every_allowed_tag_has_a_rendering():
+    """The converter handles each tag the sanitizer lets through."""
+    table_parts = {"thead", "tbody", "tr", "th", "td"}
+    assert set(ALLOWED_TAGS) <= BLOCKS | SPANS | VOID | table_parts
+
+
+def test_inline_formatting_and_links():
+    """Emphasis, links, images and inline code; whitespace stays outside markers."""
+    html = (
+        '<p>Read <strong>this </strong>and <em>that</em>: <a href="https://x.com/a">the post</a>,'
+        ' <code>a`b</code> <img src="https://x.com/i.png" alt="chart"></p>'
+    )
+    assert html_to_markdown(html) == (
+        "Read **this** and *that*: [the post](https://x.com/a), ``a`b`` "
+        "![chart](https://x.com/i.png)"
+    )
+
+
+def test_block_structure():
+    """Headings, nested and ordered lists, quotes, code blocks and paragraphs."""
+    html = (
+        "<h2>Title</h2><p>Intro<br>second line</p>"
+        "<ul><li>one</li><li>two<ol><li>a</li><li>b</li></ol></li></ul>"
+        "<blockquote><p>quoted</p><p>more</p></blockquote>"
+        "<pre><code>x = 1\n  y = [2]</code></pre>"
+    )
+    assert html_to_markdown(html) == (
+        "## Title\n\nIntro  \nsecond line\n\n"
+        "- one\n- two\n  1. a\n  2. b\n\n"
+        "> quoted\n>\n> more\n\n"
+        "```\nx = 1\n  y = [2]\n```"
+    )
+
+
+def test_tables():
+    """Tables become GFM tables; pipes are escaped and short rows padded."""
+    html = (
+        "<table><thead><tr><th>Name</th><th>a|b</th></tr></thead>"
+        "<tbody><tr><td>x</td><td><p>y</p></td></tr><tr><td>z</td></tr></tbody></table>"
+    )
+    assert html_to_markdown(html) == ("| Name | a\\|b |\n| --- | --- |\n| x | y |\n| z |  |")
+
+
+def test_list_item_paragraphs_stay_separate():
+    """Paragraphs in one item are blank-line separated and indented; nested lists stay tight."""
+    html = "<ol><li><p>one</p><p>two</p></li></ol><ul><li>x<ul><li>y</li></ul><p>z</p></li></ul>"
+    assert html_to_markdown(html) == "1. one\n\n   two\n\n- x\n  - y\n\n  z"
+
+
+def test_cells_outside_rows_keep_their_text():
+    """A <td> straight in <table> joins an implicit row; one outside any table is a paragraph."""
+    html = "<table><td>a</td><td>b</td><tr><td>c</td></tr></table><td>loose</td>"
+    assert html_to_markdown(html) == "| a | b |\n| --- | --- |\n| c |  |\n\nloose"
+
+
+def test_escaping_and_unknown_tags():
+    """Markdown syntax in text is escaped; tags outside ALLOWED_TAGS are unwrapped."""
+    html = (
+        "<p># not a heading</p><p>2. not a list</p><div>*stars* and <span>[brackets]</span></div>"
+    )
+    assert html_to_markdown(html) == (
+        "\\# not a heading\n\n2\\. not a list\n\n\\*stars\\* and \\[brackets\\]"
+    )
+    assert html_to_markdown("") == ""
+    assert html_to_markdown("plain text") == "plain text"
@@ -0,0 +1,80 @@
+# ABOUTME: Tests for stage timing spans, their Prometheus rendering and per-run summaries.
+# ABOUTME: Covers histogram buckets, the disabled no-op path and the /metrics endpoint.
+
+import asyncio
+
+import pytest
+from structlog.testing import capture_logs
+
+from feed_brain.metrics import configure, metrics, run_summary, span
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics():
+    metrics.reset()
+    configure(True)
+    yield
+    metrics.reset()
+    configure(True)
+
+
+def test_histogram_renders_cumulative_buckets():
+    """Observations land in the first bucket whose bound they don't exceed."""
+    metrics.observe("extract.readability", 0.002)
+    metrics.observe("extract.readability", 0.002)
+    metrics.observe("extract.readability", 40.0)
+
+    text = metrics.render()
+
+    assert "# TYPE feed_brain_stage_seconds histogram" in text
+    assert 'feed_brain_stage_seconds_bucket{stage="extract.readability",le="0.001"} 0' in text
+    assert 'feed_brain_stage_seconds_bucket{stage="extract.readability",le="0.0025"} 2' in text
+    assert 'feed_brain_stage_seconds_bucket{stage="extract.readability",le="30.0"} 2' in text
+    assert 'feed_brain_stage_seconds_bucket{stage="extract.readability",le="+Inf"} 3' in text
+    assert 'feed_brain_stage_seconds_count{stage="extract.readability"} 3' in text
+    assert metrics.snapshot() == {"extract.readability": {"count": 3, "seconds": 40.004}}
+
+
+async def test_run_summary_collects_spans_from_tasks_and_threads():
+    """One stage_timings line covers spans in tasks and worker threads started in the run."""
+
+    def in_thread():
+        with span("clipping.write"):
+            pass
+
+    async def in_task():
+        with span("classify.llm_call"):
+            await asyncio.sleep(0)
+
+    with capture_logs() as logs, run_summary("refresh"):
+        await asyncio.gather(in_task(), in_task())
+        await asyncio.to_thread(in_thread)
+    with span("fetch.feed"):  # outside the run
+        pass
+
+    (summary,) = [entry for entry in logs if entry["event"] == "stage_timings"]
+    assert summary["run"] == "refresh"
+    assert {stage: s["count"] for stage, s in summary["stages"].items()} == {
+        "classify.llm_call": 2,
+        "clipping.write": 1,
+    }
+    assert metrics.snapshot()["fetch.feed"]["count"] == 1
+
+
+async def test_disabled_metrics_are_a_noop(app_client):
+    """Disabled spans record nothing, log no summary, and /metrics is gone."""
+    with span("fetch.feed"):
+        pass
+    response = await app_client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'stage="fetch.feed"' in response.text
+
+    configure(False)
+    metrics.reset()
+    with capture_logs() as logs, run_summary("fetch"), span("fetch.feed"):
+        pass
+
+    assert metrics.snapshot() == {}
+    assert logs == []
+    assert (await app_client.get("/metrics")).status_code == 404
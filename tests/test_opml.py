@@ -1,7 +1,12 @@
-# ABOUTME: Tests for OPML feed import parsing.
-# ABOUTME: Verifies standard OPML format, edge cases, and invalid XML handling.
+# ABOUTME: Tests for OPML parsing and bulk feed import.
+# ABOUTME: Verifies standard OPML format, edge cases, invalid XML, streaming and upserts.
 
-from feed_brain.services.opml import parse_opml
+import io
+
+from sqlalchemy import select
+
+from feed_brain.db.models import FeedSource
+from feed_brain.services.opml import import_feeds, iter_opml, parse_opml
 
 SAMPLE_OPML = """\
 <?xml version="1.0" encoding="UTF-8"?>
@@ -75,3 +80,57 @@ def test_parse_opml_uses_text_fallback():
     feeds = parse_opml(opml)
     assert len(feeds) == 1
     assert feeds[0]["name"] == "My Blog"
+
+
+def _big_opml(count: int) -> bytes:
+    outlines = "".join(
+        f'<outline text="Feed {i}" xmlUrl="https://feeds.example.com/{i}.xml" />'
+        for i in range(count)
+    )
+    return f'<?xml version="1.0"?><opml><body><outline text="All">{outlines}</outline></body></opml>'.encode()
+
+
+def test_iter_opml_streams_nested_outlines():
+    """iter_opml yields every feed from a file object without building the tree."""
+    feeds = list(iter_opml(io.BytesIO(_big_opml(5000))))
+    assert len(feeds) == 5000
+    assert feeds[-1] == {"name": "Feed 4999", "url": "https://feeds.example.com/4999.xml"}
+
+
+def test_iter_opml_memory_stays_flat():
+    """Read outlines are dropped from the tree, so peak memory doesn't grow with the file."""
+    import tracemalloc
+
+    def peak(count: int) -> int:
+        outlines = b"".join(
+            b'<outline text="F%d" xmlUrl="https://e.com/%d.xml" />' % (i, i) for i in range(count)
+        )
+        source = io.BytesIO(b"<opml><body>%s</body></opml>" % outlines)
+        tracemalloc.start()
+        try:
+            assert sum(1 for _ in iter_opml(source)) == count
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    assert peak(40_000) < 2 * peak(5_000)
+
+
+async def test_import_feeds_bulk_skips_existing(db_session):
+    """Bulk import inserts new URLs once and ignores ones already stored."""
+    db_session.add(FeedSource(name="Existing", url="https://feeds.example.com/0.xml"))
+    await db_session.commit()
+
+    feeds = list(iter_opml(io.BytesIO(_big_opml(5000))))
+    assert await import_feeds(db_session, feeds + feeds[:10], batch_size=700) == 4999
+    assert await import_feeds(db_session, feeds) == 0
+
+    existing = await db_session.scalar(
+        select(FeedSource).where(FeedSource.url == "https://feeds.example.com/0.xml")
+    )
+    assert existing.name == "Existing"
+    imported = await db_session.scalar(
+        select(FeedSource).where(FeedSource.url == "https://feeds.example.com/1.xml")
+    )
+    assert imported.active is True
+    assert imported.created_at is not None
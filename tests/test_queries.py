@@ -0,0 +1,106 @@
+# ABOUTME: Tests for reusable article queries.
+# ABOUTME: Verifies cursor encoding, keyset paging order, and index usage.
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select, text
+
+from feed_brain.db.models import Article
+from feed_brain.db.queries import (
+    decode_cursor,
+    encode_cursor,
+    filter_articles,
+    keyset_page,
+    neighbors_query,
+)
+
+
+def test_cursor_roundtrip():
+    """Cursors decode back to the same keyset position."""
+    position = (datetime(2026, 2, 8, 12, 0, 0), 42)
+    assert decode_cursor(encode_cursor(*position)) == position
+
+
+def test_decode_cursor_rejects_garbage():
+    """Malformed cursors raise ValueError."""
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+async def test_keyset_pages_cover_all_rows_in_order(db_session):
+    """Walking cursors visits every row once, newest first, ties broken by id."""
+    base = datetime(2026, 2, 8, 12, 0, 0)
+    # Pairs of articles share a timestamp to exercise the id tie-breaker
+    db_session.add_all(
+        Article(
+            url=f"https://example.com/{i}", title=str(i), fetched_at=base + timedelta(hours=i // 2)
+        )
+        for i in range(7)
+    )
+    await db_session.flush()
+
+    seen, cursor = [], None
+    while True:
+        rows = (await db_session.execute(keyset_page(select(Article), cursor, 3))).scalars().all()
+        seen.extend(rows[:3])
+        if len(rows) <= 3:
+            break
+        cursor = encode_cursor(rows[2].fetched_at, rows[2].id)
+
+    expected = sorted(seen, key=lambda a: (a.fetched_at, a.id), reverse=True)
+    assert [a.id for a in seen] == [a.id for a in expected]
+    assert len({a.id for a in seen}) == 7
+
+
+async def test_filtered_keyset_page_uses_composite_index(db_session):
+    """Tier-filtered seeks are served by the (tier, fetched_at, id) index."""
+    query = keyset_page(
+        filter_articles(select(Article.id), tier="high"),
+        encode_cursor(datetime(2026, 2, 8), 10),
+        50,
+    )
+    compiled = query.compile(compile_kwargs={"literal_binds": True})
+
+    plan = await db_session.execute(text(f"EXPLAIN QUERY PLAN {compiled}"))
+    details = " ".join(row[-1] for row in plan.all())
+
+    assert "ix_articles_tier_fetched_at_id" in details
+    assert "TEMP B-TREE" not in details
+
+
+async def test_neighbors_follow_feed_order_within_filter(db_session):
+    """Prev is the next newer article and next the next older one, per tier."""
+    base = datetime(2026, 2, 8, 12, 0, 0)
+    tiers = ["high", "low", "high", "high", "low"]
+    articles = [
+        Article(url=f"https://example.com/{i}", title=str(i), tier=tier,
+                fetched_at=base + timedelta(hours=i))
+        for i, tier in enumerate(tiers)
+    ]  # fmt: skip
+    db_session.add_all(articles)
+    await db_session.flush()
+    middle = articles[2]
+
+    unfiltered = (await db_session.execute(neighbors_query(middle.fetched_at, middle.id))).one()
+    high = (
+        await db_session.execute(neighbors_query(middle.fetched_at, middle.id, tier="high"))
+    ).one()
+    newest = articles[4]
+    edge = (await db_session.execute(neighbors_query(newest.fetched_at, newest.id))).one()
+
+    assert tuple(unfiltered) == (articles[3].id, articles[1].id)
+    assert tuple(high) == (articles[3].id, articles[0].id)
+    assert tuple(edge) == (None, articles[3].id)
+
+
+async def test_neighbors_query_seeks_index(db_session):
+    """Neighbor lookups never scan or sort the articles table."""
+    query = neighbors_query(datetime(2026, 2, 8), 10, tier="high")
+    compiled = query.compile(compile_kwargs={"literal_binds": True})
+
+    plan = await db_session.execute(text(f"EXPLAIN QUERY PLAN {compiled}"))
+    details = [row[-1] for row in plan.all()]
+
+    assert any("ix_articles_tier_fetched_at_id" in detail for detail in details)
+    assert not any("SCAN articles" in detail or "TEMP B-TREE" in detail for detail in details)
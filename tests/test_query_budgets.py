@@ -0,0 +1,113 @@
+# ABOUTME: SQL query budgets per route, so an N+1 regression fails CI.
+# ABOUTME: Budgets hold however many articles, sources and OPML outlines a request touches.
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from feed_brain.db.models import Article, FeedSource
+from feed_brain.db.session import get_session_factory
+from feed_brain.services.stats import repair_stats
+
+# (method, path, max SQL statements); {id} is an article in the middle of the feed
+BUDGETS = [
+    ("GET", "/", 1),
+    ("GET", "/?tier=high&category=development", 1),
+    ("GET", "/partials/articles?per_page=10", 1),
+    ("GET", "/article/{id}", 2),
+    ("GET", "/article/{id}?tier=high", 2),
+    ("POST", "/article/{id}/feedback?feedback=skipped", 3),
+    ("GET", "/stats", 2),
+    ("GET", "/feeds", 1),
+    ("GET", "/search?q=agents", 1),
+    ("GET", "/api/v1/articles?limit=50&fields=id,title,content", 1),
+    ("GET", "/api/v1/feeds", 1),
+    ("GET", "/api/v1/stats", 1),
+]
+
+
+async def _seed(articles: int = 40, sources: int = 5) -> list[int]:
+    now = datetime.now(UTC)
+    async with get_session_factory()() as session:
+        feeds = [
+            FeedSource(name=f"Source {i}", url=f"https://s{i}.example.com/feed")
+            for i in range(sources)
+        ]
+        session.add_all(feeds)
+        await session.flush()
+        rows = [
+            Article(
+                url=f"https://example.com/{i}",
+                title=f"Article {i} about agents",
+                content=f"<p>Body {i}</p>",
+                source_id=feeds[i % sources].id,
+                tier=("high", "medium", "low")[i % 3],
+                category="development",
+                feedback="approved" if i % 7 == 0 else None,
+                fetched_at=now - timedelta(hours=i),
+            )
+            for i in range(articles)
+        ]
+        session.add_all(rows)
+        await session.commit()
+        await repair_stats(session)
+        return [row.id for row in rows]
+
+
+@pytest.mark.parametrize(("method", "path", "budget"), BUDGETS)
+async def test_route_query_budget(app_client, assert_queries, method, path, budget):
+    """Each route stays within its statement budget on a populated database."""
+    ids = await _seed()
+
+    with assert_queries(budget):
+        response = await app_client.request(method, path.format(id=ids[len(ids) // 2]))
+
+    assert response.status_code == 200
+
+
+async def test_opml_import_queries_do_not_grow_with_outlines(app_client, assert_queries):
+    """Importing 300 feeds costs the same handful of statements as importing one."""
+    outlines = "".join(
+        f'<outline type="rss" text="Feed {i}" xmlUrl="https://f{i}.example.com/rss"/>'
+        for i in range(300)
+    )
+    opml = f'<?xml version="1.0"?><opml><body>{outlines}</body></opml>'.encode()
+
+    with assert_queries(4):
+        response = await app_client.post(
+            "/feeds/import", files={"opml_file": ("feeds.opml", opml, "text/xml")}
+        )
+
+    assert response.status_code == 200
+    assert "Feed 299" in response.text
+
+
+async def test_server_timing_header_reports_queries(app_client):
+    """Responses carry the statement count and DB time in Server-Timing."""
+    ids = await _seed(articles=3, sources=1)
+
+    response = await app_client.get(f"/article/{ids[1]}")
+
+    db, app = response.headers["server-timing"].split(", ")
+    assert db.startswith("db;dur=") and db.endswith(';desc="2 queries"')
+    assert app.startswith("app;dur=")
+
+
+async def test_server_timing_is_independent_of_stage_metrics(app_client, monkeypatch):  # noqa: ARG001
+    """Turning off the stage histograms keeps the Server-Timing header and query warnings."""
+    import httpx
+
+    from feed_brain.config import get_settings
+    from feed_brain.metrics import configure
+    from feed_brain.web.app import create_app
+
+    monkeypatch.setenv("METRICS_ENABLED", "false")
+    get_settings.cache_clear()
+    transport = httpx.ASGITransport(app=create_app())
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/")
+    finally:
+        configure(True)
+
+    assert response.headers["server-timing"].startswith("db;dur=")
@@ -0,0 +1,465 @@
+# ABOUTME: Tests for the web UI route handlers.
+# ABOUTME: Exercises feed list, article detail and feedback against an on-disk database.
+
+import asyncio
+import re
+import threading
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+import respx
+from sqlalchemy import select
+
+from feed_brain.config import get_settings
+from feed_brain.db.models import Article, FeedSource
+from feed_brain.db.session import get_session_factory
+from feed_brain.models import ArticleRow
+from feed_brain.web.routes import _clippings_work, _feed_page_context
+
+
+async def _seed_articles(count: int, **fields) -> list[int]:
+    """Insert `count` articles, newest first by fetched_at, and return their IDs."""
+    now = datetime.now(UTC)
+    session_factory = get_session_factory()
+    async with session_factory() as session:
+        articles = [
+            Article(
+                url=f"https://example.com/{i}",
+                title=f"Article {i}",
+                content=f"<p>Body of article {i}</p>",
+                fetched_at=now - timedelta(minutes=i),
+                **fields,
+            )
+            for i in range(count)
+        ]
+        session.add_all(articles)
+        await session.commit()
+        return [article.id for article in articles]
+
+
+async def test_feed_list_renders_cards_without_content(app_client):
+    """List cards show titles but never the article body."""
+    await _seed_articles(3)
+
+    response = await app_client.get("/")
+
+    assert response.status_code == 200
+    assert "Article 0" in response.text
+    assert "Body of article" not in response.text
+
+
+@pytest.mark.usefixtures("app_client")
+async def test_feed_page_uses_slim_rows():
+    """The list path builds ArticleRow tuples with the source name joined in."""
+    session_factory = get_session_factory()
+    async with session_factory() as session:
+        source = FeedSource(name="Simon", url="https://simonwillison.net/atom/")
+        session.add(source)
+        await session.commit()
+    await _seed_articles(2, source_id=source.id, tier="high")
+
+    context = await _feed_page_context(None, None, None, 50)
+
+    assert all(isinstance(row, ArticleRow) for row in context["articles"])
+    assert [row.source_name for row in context["articles"]] == ["Simon", "Simon"]
+    assert context["articles"][0].tier == "high"
+
+
+async def test_article_detail_renders_content(app_client):
+    """Detail page loads the body from article_bodies."""
+    ids = await _seed_articles(1)
+
+    response = await app_client.get(f"/article/{ids[0]}")
+
+    assert response.status_code == 200
+    assert "<p>Body of article 0</p>" in response.text
+
+
+async def test_article_detail_missing_returns_404(app_client):
+    """Unknown article IDs return 404."""
+    response = await app_client.get("/article/999")
+    assert response.status_code == 404
+
+
+async def test_feed_list_infinite_scroll_partials(app_client):
+    """The first page links to a partial that continues where it stopped."""
+    await _seed_articles(5)
+
+    first = await app_client.get("/?per_page=2")
+    assert "Article 0" in first.text and "Article 1" in first.text
+    more_url = re.search(r'hx-get="([^"]+)"', first.text).group(1).replace("&amp;", "&")
+    assert more_url.startswith("/partials/articles?")
+
+    second = await app_client.get(more_url)
+    assert "Article 2" in second.text and "Article 3" in second.text
+    assert "Article 1<" not in second.text
+    assert "<html" not in second.text
+
+
+async def test_feed_list_filters_by_category(app_client):
+    """Category filter narrows the list."""
+    await _seed_articles(2, category="devops_cloud")
+    session_factory = get_session_factory()
+    async with session_factory() as session:
+        session.add(Article(url="https://example.com/ai", title="AI only", category="ai_agents"))
+        await session.commit()
+
+    response = await app_client.get("/?category=ai_agents")
+
+    assert "AI only" in response.text
+    assert "Article 0" not in response.text
+
+
+async def test_feed_list_invalid_cursor_returns_400(app_client):
+    """Garbage cursors are rejected."""
+    response = await app_client.get("/?cursor=%%%")
+    assert response.status_code == 400
+
+
+async def test_article_detail_prev_next_links(app_client):
+    """Detail page links to neighbors in feed order, keeping the filter."""
+    ids = await _seed_articles(3, tier="high")
+
+    response = await app_client.get(f"/article/{ids[1]}?tier=high")
+
+    assert f'href="/article/{ids[0]}?tier=high"' in response.text
+    assert f'href="/article/{ids[2]}?tier=high"' in response.text
+
+
+async def test_search_json_and_htmx_partial(app_client):
+    """Fetched articles are searchable through JSON and the htmx partial."""
+    from feed_brain.services.search import index_articles
+
+    session_factory = get_session_factory()
+    async with session_factory() as session:
+        article = Article(
+            url="https://example.com/mcp", title="MCP servers", content="<p>Model context</p>"
+        )
+        session.add(article)
+        await session.flush()
+        await index_articles(session, [article])
+        await session.commit()
+
+    data = (await app_client.get("/search.json", params={"q": "mcp"})).json()
+    partial = await app_client.get("/search", params={"q": "mcp"}, headers={"HX-Request": "true"})
+
+    assert [hit["id"] for hit in data] == [article.id]
+    assert "<mark>MCP</mark>" in data[0]["snippet"]
+    assert "MCP servers" in partial.text
+    assert "<html" not in partial.text
+    assert partial.headers["vary"] == "HX-Request"
+
+    # Back/forward after a history cache miss re-requests the pushed URL
+    restored = await app_client.get(
+        "/search",
+        params={"q": "mcp"},
+        headers={"HX-Request": "true", "HX-History-Restore-Request": "true"},
+    )
+    assert "<html" in restored.text and "MCP servers" in restored.text
+
+
+async def test_feedback_updates_stats_dashboard(app_client):
+    """Skipping an article is reflected on the stats page without a rebuild."""
+    from feed_brain.services.stats import repair_stats
+
+    ids = await _seed_articles(2, tier="high", category="ai_agents")
+    async with get_session_factory()() as session:
+        await repair_stats(session)
+
+    await app_client.post(f"/article/{ids[0]}/feedback", params={"feedback": "skipped"})
+    response = await app_client.get("/stats")
+
+    assert response.status_code == 200
+    assert "2 articles" in response.text
+    assert "approval rate 0%" in response.text
+
+
+async def test_archived_article_detail_reads_cold_storage(app_client):
+    """Archived bodies are shown on the detail page and restored on approval."""
+    from sqlalchemy.orm import selectinload
+
+    from feed_brain.config import Settings
+    from feed_brain.db.session import get_archive_session_factory, init_archive_db
+    from feed_brain.services.archive import archive_expired
+
+    ids = await _seed_articles(1, tier="low")
+    async with get_session_factory()() as session:
+        article = await session.get(Article, ids[0])
+        article.fetched_at = datetime.now(UTC) - timedelta(days=365)
+        await session.commit()
+
+    await init_archive_db()
+    async with get_session_factory()() as session, get_archive_session_factory()() as archive:
+        assert await archive_expired(session, archive, Settings()) == 1
+
+    response = await app_client.get(f"/article/{ids[0]}")
+    assert "<p>Body of article 0</p>" in response.text
+
+    await app_client.post(f"/article/{ids[0]}/feedback", params={"feedback": "approved"})
+    async with get_session_factory()() as session:
+        result = await session.execute(
+            select(Article).options(selectinload(Article.body)).where(Article.id == ids[0])
+        )
+        restored = result.scalar_one()
+    assert restored.archived_at is None
+    assert restored.content == "<p>Body of article 0</p>"
+
+
+async def test_opml_import_with_probe_streams_results(app_client):
+    """Importing with probe returns an SSE panel whose stream reports each feed."""
+    opml = (
+        b'<?xml version="1.0"?><opml><body>'
+        b'<outline text="Good" xmlUrl="https://feeds.example.com/good.xml" />'
+        b'<outline text="Bad" xmlUrl="https://feeds.example.com/bad.xml" />'
+        b"</body></opml>"
+    )
+    response = await app_client.post(
+        "/feeds/import",
+        files={"opml_file": ("feeds.opml", opml, "text/xml")},
+        data={"probe": "true"},
+    )
+    assert response.status_code == 200
+    assert "Good" in response.text
+    stream_url = re.search(r'sse-connect="([^"]+)"', response.text).group(1)
+
+    with respx.mock:
+        respx.get("https://feeds.example.com/good.xml").respond(200, content=b"<rss></rss>")
+        respx.get("https://feeds.example.com/bad.xml").respond(500)
+        stream = await app_client.get(stream_url)
+
+    assert stream.headers["content-type"].startswith("text/event-stream")
+    assert stream.text.count("event: probe") == 2
+    assert "2/2 checked, 1 failing" in stream.text
+    assert stream.text.rstrip().endswith("event: done\ndata:")
+    assert (await app_client.get(stream_url)).status_code == 404
+
+
+async def test_fetch_runs_as_single_flight_job(app_client, monkeypatch):
+    """POST /fetch returns a job ID at once and joins a run already in flight."""
+    release = asyncio.Event()
+
+    async def fake_fetch(progress=None):
+        progress("feeds", 1, 1)
+        await release.wait()
+        return 3
+
+    async def fake_classify(_budget=None, progress=None):
+        progress("classified", 2, 3)
+        return 2
+
+    monkeypatch.setattr("feed_brain.services.fetcher.fetch_all_feeds", fake_fetch)
+    monkeypatch.setattr("feed_brain.services.classifier.classify_unclassified", fake_classify)
+
+    first = await app_client.post("/fetch")
+    second = await app_client.post("/fetch")
+    assert first.status_code == 202
+    assert first.json()["started"] is True
+    assert second.json() == {"job_id": first.json()["job_id"], "started": False}
+
+    job_id = first.json()["job_id"]
+    panel = await app_client.post("/fetch", headers={"HX-Request": "true"})
+    assert f'sse-connect="/jobs/{job_id}/events"' in panel.text
+
+    release.set()
+    stream = await app_client.get(f"/jobs/{job_id}/events")
+    assert "Classified 2/3" in stream.text
+    assert stream.text.rstrip().endswith("event: done\ndata:")
+    status = (await app_client.get(f"/jobs/{job_id}")).json()
+    assert status["status"] == "done"
+    assert status["result"] == {"new_articles": 3, "classified": 2}
+
+
+async def test_refresh_job_holds_no_connection_during_io(app_client, monkeypatch):
+    """Feedback goes through while a refresh waits on a feed download or on the classifier."""
+    from feed_brain.models import Category, ClassificationResult, Tier
+
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    get_settings.cache_clear()
+    ids = await _seed_articles(1)
+    async with get_session_factory()() as session:
+        session.add(FeedSource(name="Feed", url="https://feed.example/rss"))
+        await session.commit()
+    entry = SimpleNamespace(
+        link="https://feed.example/1", title="New", author=None, published_parsed=None
+    )
+    feed = SimpleNamespace(bozo=False, entries=[entry])
+    downloading, downloaded = asyncio.Event(), asyncio.Event()
+    classifying, classified = asyncio.Event(), asyncio.Event()
+
+    async def slow_extract(*_):
+        downloading.set()
+        await downloaded.wait()
+        return "<p>New body</p>"
+
+    async def slow_classify(*_):
+        classifying.set()
+        await classified.wait()
+        return ClassificationResult(
+            tier=Tier.HIGH, category=Category.AI_AGENTS, summary="s", reason="r", confidence=1
+        )
+
+    monkeypatch.setattr("feed_brain.services.fetcher.feedparser.parse", lambda *_, **__: feed)
+    monkeypatch.setattr("feed_brain.services.fetcher.extract_content", slow_extract)
+    monkeypatch.setattr("feed_brain.services.classifier.anthropic_client", lambda _: None)
+    monkeypatch.setattr("feed_brain.services.classifier.classify_article", slow_classify)
+
+    async def skip() -> None:
+        response = await asyncio.wait_for(
+            app_client.post(f"/article/{ids[0]}/feedback", params={"feedback": "skipped"}), 5
+        )
+        assert "Skipped" in response.text
+
+    job_id = (await app_client.post("/fetch")).json()["job_id"]
+    await asyncio.wait_for(downloading.wait(), 5)
+    await skip()
+    downloaded.set()
+    await asyncio.wait_for(classifying.wait(), 5)
+    await skip()
+    classified.set()
+
+    await app_client._transport.app.state.jobs.get(job_id).task
+    status = (await app_client.get(f"/jobs/{job_id}")).json()
+    assert status["result"] == {"new_articles": 1, "classified": 2}
+    async with get_session_factory()() as session:
+        article = await session.get(Article, ids[0])
+    assert (article.feedback, article.tier) == ("skipped", "high")
+
+
+async def test_feed_list_conditional_get_and_fragment_cache(app_client):
+    """Unchanged pages answer 304; feedback changes the ETag and re-renders one card."""
+    ids = await _seed_articles(3)
+    first = await app_client.get("/")
+    etag = first.headers["etag"]
+    assert first.headers["last-modified"]
+
+    cached = await app_client.get("/", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+    fragments = app_client._transport.app.state.fragments
+    misses = fragments.misses
+    await app_client.post(f"/article/{ids[1]}/feedback", params={"feedback": "skipped"})
+    changed = await app_client.get("/", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert fragments.misses == misses + 1
+
+
+async def test_article_detail_conditional_get(app_client):
+    """The detail page sends validators and honours If-None-Match."""
+    ids = await _seed_articles(2)
+    first = await app_client.get(f"/article/{ids[0]}")
+    cached = await app_client.get(
+        f"/article/{ids[0]}", headers={"If-None-Match": first.headers["etag"]}
+    )
+    assert cached.status_code == 304
+
+    filtered = await app_client.get(
+        f"/article/{ids[0]}?tier=high", headers={"If-None-Match": first.headers["etag"]}
+    )
+    assert filtered.status_code == 200
+
+
+async def test_bulk_feedback_updates_and_writes_clippings(app_client, tmp_path, monkeypatch):
+    """Bulk approve flags all articles at once and a background job writes the clippings."""
+    clippings = tmp_path / "Clippings"
+    clippings.mkdir()
+    monkeypatch.setenv("CLIPPINGS_DIR", str(clippings))
+    get_settings.cache_clear()
+    ids = await _seed_articles(4, tier="high")
+
+    skipped = await app_client.post(
+        "/articles/feedback", data={"ids": [ids[3]], "feedback": "skipped"}
+    )
+    assert skipped.json() == {"updated": [ids[3]], "job_id": None}
+
+    response = await app_client.post(
+        "/articles/feedback",
+        data={"ids": [ids[0], ids[1], ids[2], 999], "feedback": "approved"},
+        headers={"HX-Request": "true"},
+    )
+    assert "3 approved" in response.text
+    assert f'id="feedback-{ids[0]}" hx-swap-oob="innerHTML"' in response.text
+    job_id = re.search(r'sse-connect="/jobs/([^/]+)/events"', response.text).group(1)
+
+    stream = await app_client.get(f"/jobs/{job_id}/events")
+    assert "Clippings 3/3" in stream.text
+    assert len(list(clippings.glob("*.md"))) == 3
+
+    async with get_session_factory()() as session:
+        rows = (await session.execute(select(Article).order_by(Article.id))).scalars().all()
+    assert [a.feedback for a in rows] == ["approved", "approved", "approved", "skipped"]
+    assert [a.clipping_created for a in rows] == [True, True, True, False]
+    assert all(a.feedback_at is not None for a in rows)
+
+    stats = await app_client.get("/stats")
+    assert stats.status_code == 200
+
+
+async def test_single_approval_returns_before_clipping_is_written(
+    app_client, tmp_path, monkeypatch
+):
+    """Approving answers without touching the vault; the clippings job writes the file."""
+    clippings = tmp_path / "Clippings"
+    clippings.mkdir()
+    monkeypatch.setenv("CLIPPINGS_DIR", str(clippings))
+    get_settings.cache_clear()
+    ids = await _seed_articles(1, tier="high")
+    release = asyncio.Event()
+
+    def slow_vault_work():
+        work = _clippings_work()
+
+        async def gated(progress):
+            await release.wait()
+            return await work(progress)
+
+        return gated
+
+    monkeypatch.setattr("feed_brain.web.routes._clippings_work", slow_vault_work)
+
+    response = await app_client.post(f"/article/{ids[0]}/feedback", params={"feedback": "approved"})
+    assert "Approved" in response.text
+    assert list(clippings.iterdir()) == []
+
+    jobs = app_client._transport.app.state.jobs
+    job = jobs.running("clippings")
+    release.set()
+    await job.task
+    assert [p.name for p in clippings.iterdir()] == ["Article 0.md"]
+    async with get_session_factory()() as session:
+        assert (await session.get(Article, ids[0])).clipping_created is True
+
+
+async def test_approvals_are_not_blocked_by_a_slow_vault(app_client, tmp_path, monkeypatch):
+    """While the clippings job waits on the vault it holds no connection, so writes go through."""
+    from feed_brain.services.clipping import ClippingWriter
+
+    clippings = tmp_path / "Clippings"
+    clippings.mkdir()
+    monkeypatch.setenv("CLIPPINGS_DIR", str(clippings))
+    get_settings.cache_clear()
+    ids = await _seed_articles(2, tier="high")
+    writing, release = threading.Event(), threading.Event()
+    write_batch = ClippingWriter.write_batch
+
+    def slow_write_batch(self, items):
+        writing.set()
+        release.wait(10)
+        return write_batch(self, items)
+
+    monkeypatch.setattr(ClippingWriter, "write_batch", slow_write_batch)
+
+    await app_client.post(f"/article/{ids[0]}/feedback", params={"feedback": "approved"})
+    assert await asyncio.to_thread(writing.wait, 5)
+    try:
+        response = await asyncio.wait_for(
+            app_client.post(f"/article/{ids[1]}/feedback", params={"feedback": "skipped"}), 5
+        )
+    finally:
+        release.set()
+    assert "Skipped" in response.text
+
+    await app_client._transport.app.state.jobs.running("clippings").task
+    assert [p.name for p in clippings.iterdir()] == ["Article 0.md"]
@@ -0,0 +1,119 @@
+# ABOUTME: Tests for the FTS5 full-text search service.
+# ABOUTME: Verifies indexing, BM25 ranking, snippet escaping, and index rebuilds.
+
+from sqlalchemy import text
+
+from feed_brain.db.models import Article
+from feed_brain.services.search import (
+    index_articles,
+    match_expression,
+    rebuild_index,
+    search_articles,
+)
+
+
+async def _store(db_session, **fields) -> Article:
+    article = Article(**fields)
+    db_session.add(article)
+    await db_session.flush()
+    return article
+
+
+def test_match_expression_quotes_terms_and_prefixes_last():
+    """User input cannot inject FTS5 syntax; the last word is a prefix."""
+    assert match_expression('agents NEAR("x") OR') == '"agents" "NEAR" "x" "OR"*'
+    assert match_expression("  ") is None
+
+
+async def test_search_ranks_title_matches_first(db_session):
+    """Title hits outrank body-only hits."""
+    body_hit = await _store(
+        db_session,
+        url="https://example.com/body",
+        title="Weekly notes",
+        content="<p>Some thoughts on terraform modules.</p>",
+    )
+    title_hit = await _store(
+        db_session,
+        url="https://example.com/title",
+        title="Terraform at scale",
+        content="<p>Infrastructure as code.</p>",
+    )
+    await index_articles(db_session, [body_hit, title_hit])
+
+    hits = await search_articles(db_session, "terraf")
+
+    assert [hit.id for hit in hits] == [title_hit.id, body_hit.id]
+
+
+async def test_search_snippet_escapes_html(db_session):
+    """Indexed text is escaped; only our <mark> tags survive."""
+    article = await _store(
+        db_session,
+        url="https://example.com/xss",
+        title="Escaping",
+        content="<p>Never trust &lt;script&gt;alert(1)&lt;/script&gt; in kubernetes docs</p>",
+    )
+    await index_articles(db_session, [article])
+
+    hits = await search_articles(db_session, "kubernetes")
+
+    assert "<script>" not in hits[0].snippet
+    assert "&lt;script&gt;" in hits[0].snippet
+    assert "<mark>kubernetes</mark>" in hits[0].snippet
+
+
+async def test_reindex_replaces_stale_entries(db_session):
+    """Re-indexing an article replaces its previous row."""
+    article = await _store(db_session, url="https://example.com/a", title="Golang", content="x")
+    await index_articles(db_session, [article])
+    article.title = "Rust"
+    await index_articles(db_session, [article])
+
+    assert await search_articles(db_session, "golang") == []
+    assert len(await search_articles(db_session, "rust")) == 1
+
+
+async def test_rebuild_index_covers_existing_articles(db_session):
+    """Rebuild indexes articles that were stored before search existed."""
+    await _store(db_session, url="https://example.com/1", title="Observability", content="<p>x</p>")
+    await _store(db_session, url="https://example.com/2", title="Other", content="<p>y</p>")
+    await db_session.execute(text("DELETE FROM articles_fts"))
+
+    indexed = await rebuild_index(db_session)
+
+    assert indexed == 2
+    assert len(await search_articles(db_session, "observability")) == 1
+
+
+async def test_rebuild_index_reads_archived_bodies(app_client):  # noqa: ARG001
+    """Archived articles stay findable by body text after a rebuild."""
+    from datetime import UTC, datetime, timedelta
+
+    from feed_brain.config import Settings
+    from feed_brain.db.session import (
+        get_archive_session_factory,
+        get_session_factory,
+        init_archive_db,
+    )
+    from feed_brain.services.archive import archive_expired
+
+    async with get_session_factory()() as session:
+        session.add(
+            Article(
+                url="https://example.com/old",
+                title="Old news",
+                content="<p>Notes on zeppelins</p>",
+                tier="low",
+                fetched_at=datetime.now(UTC) - timedelta(days=365),
+            )
+        )
+        await session.commit()
+    await init_archive_db()
+    async with get_session_factory()() as session, get_archive_session_factory()() as archive:
+        assert await archive_expired(session, archive, Settings()) == 1
+
+    async with get_session_factory()() as session:
+        assert await rebuild_index(session) == 1
+        hits = await search_articles(session, "zeppelins")
+    assert [hit.title for hit in hits] == ["Old news"]
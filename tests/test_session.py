@@ -0,0 +1,83 @@
+# ABOUTME: Tests for the SQLite engine profile and read/write engine split.
+# ABOUTME: Includes a concurrent load test of UI latency during an open fetch write.
+
+import asyncio
+import time
+from datetime import UTC, datetime
+
+import pytest
+from sqlalchemy import text
+
+from feed_brain.config import Settings
+from feed_brain.db.models import Article
+from feed_brain.db.session import create_engine, get_read_engine, get_session_factory
+
+
+async def test_engine_applies_sqlite_profile(tmp_path):
+    """Writer connections get WAL and the configured pragmas."""
+    settings = Settings(db_path=tmp_path / "profile.db", sqlite_busy_timeout_ms=1234)
+    engine = create_engine(settings)
+    async with engine.connect() as conn:
+        journal_mode = (await conn.execute(text("PRAGMA journal_mode"))).scalar_one()
+        synchronous = (await conn.execute(text("PRAGMA synchronous"))).scalar_one()
+        busy_timeout = (await conn.execute(text("PRAGMA busy_timeout"))).scalar_one()
+    await engine.dispose()
+
+    assert journal_mode == "wal"
+    assert synchronous == 1  # NORMAL
+    assert busy_timeout == 1234
+
+
+async def test_read_engine_is_query_only(app_client):  # noqa: ARG001
+    """The UI engine refuses writes."""
+    from sqlalchemy.exc import OperationalError
+
+    async with get_read_engine().connect() as conn:
+        with pytest.raises(OperationalError):
+            await conn.execute(text("DELETE FROM articles"))
+
+
+async def test_feed_list_latency_during_open_fetch_transaction(app_client):
+    """UI reads stay fast and isolated while a fetch holds the write lock."""
+    session_factory = get_session_factory()
+    async with session_factory() as session:
+        session.add_all(
+            Article(url=f"https://example.com/{i}", title=f"Seed {i}") for i in range(50)
+        )
+        await session.commit()
+
+    write_open = asyncio.Event()
+    reads_done = asyncio.Event()
+
+    async def long_fetch() -> None:
+        """Simulate a fetch: write rows, then keep the transaction open."""
+        async with session_factory() as session:
+            session.add_all(
+                Article(
+                    url=f"https://example.com/new-{i}",
+                    title=f"Uncommitted {i}",
+                    fetched_at=datetime.now(UTC),
+                )
+                for i in range(200)
+            )
+            await session.flush()
+            write_open.set()
+            await asyncio.wait_for(reads_done.wait(), timeout=10)
+            await session.commit()
+
+    fetch_task = asyncio.create_task(long_fetch())
+    await write_open.wait()
+
+    latencies = []
+    for _ in range(20):
+        started = time.perf_counter()
+        response = await app_client.get("/")
+        latencies.append(time.perf_counter() - started)
+        assert response.status_code == 200
+        assert "Uncommitted" not in response.text
+    reads_done.set()
+    await fetch_task
+
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    assert p99 < 1.0, f"feed_list p99 {p99:.3f}s while fetch transaction open"
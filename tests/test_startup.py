@@ -0,0 +1,59 @@
+# ABOUTME: Startup budget for the CLI, measured with `python -X importtime` in a subprocess.
+# ABOUTME: Keeps the web stack and the Anthropic SDK off the import path of cron-driven commands.
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import feed_brain
+
+SRC = str(Path(feed_brain.__file__).resolve().parents[1])
+
+# Modules `feed-brain fetch` imports before it has anything to classify
+FETCH_PATH = [
+    "feed_brain.__main__",
+    "feed_brain.db.session",
+    "feed_brain.services.fetcher",
+    "feed_brain.services.classifier",
+]
+# Generous next to the ~0.7s measured, but well under the ~2s with eager imports
+FETCH_BUDGET_SECONDS = 1.5
+
+
+def _import_times(*modules: str) -> dict[str, int]:
+    """Cumulative import time in microseconds of every module loaded importing `modules`."""
+    env = {**os.environ, "PYTHONPATH": SRC}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {', '.join(modules)}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        times.setdefault(name.strip(), int(cumulative))
+    return times
+
+
+def test_cli_entry_point_skips_heavy_imports():
+    """Parsing arguments loads neither the web stack, the database layer nor the SDK."""
+    loaded = _import_times("feed_brain.__main__")
+
+    assert "feed_brain.__main__" in loaded
+    for heavy in ("uvicorn", "fastapi", "jinja2", "anthropic", "sqlalchemy"):
+        assert heavy not in loaded, f"{heavy} imported by feed_brain.__main__"
+
+
+def test_fetch_path_stays_within_budget():
+    """The fetch command's modules load without web or Anthropic imports, inside the budget."""
+    loaded = _import_times(*FETCH_PATH)
+
+    for heavy in ("uvicorn", "fastapi", "jinja2", "anthropic"):
+        assert heavy not in loaded, f"{heavy} imported on the fetch path"
+    total = sum(loaded[module] for module in FETCH_PATH) / 1_000_000
+    assert total < FETCH_BUDGET_SECONDS, f"fetch path imports took {total:.2f}s"
@@ -0,0 +1,82 @@
+# ABOUTME: Tests for the incrementally maintained stats counters.
+# ABOUTME: Verifies write-path deltas, source reassignment, and consistency repair.
+
+from sqlalchemy import select
+
+from feed_brain.db.models import Article, FeedSource, StatCounter
+from feed_brain.services.stats import (
+    ArticleState,
+    reassign_source,
+    record_changes,
+    repair_stats,
+)
+
+
+async def _counters(db_session) -> dict[tuple[str, str], tuple[int, ...]]:
+    result = await db_session.execute(select(StatCounter))
+    return {
+        (c.dimension, c.key): (c.articles, c.classified, c.high, c.approved, c.skipped)
+        for c in result.scalars().all()
+    }
+
+
+async def test_record_changes_moves_counts_between_keys(db_session):
+    """Classifying and approving an article shifts counts, not totals."""
+    new = ArticleState(source_id=1, tier=None, category=None, feedback=None)
+    classified = ArticleState(source_id=1, tier="high", category="ai_agents", feedback=None)
+    approved = classified._replace(feedback="approved")
+
+    await record_changes(db_session, [(None, new)])
+    await record_changes(db_session, [(new, classified)])
+    await record_changes(db_session, [(classified, approved)])
+    counters = await _counters(db_session)
+
+    assert counters[("all", "all")] == (1, 1, 1, 1, 0)
+    assert counters[("tier", "high")] == (1, 1, 1, 1, 0)
+    assert counters[("tier", "none")] == (0, 0, 0, 0, 0)
+    assert counters[("category", "ai_agents")] == (1, 1, 1, 1, 0)
+    assert counters[("source", "1")] == (1, 1, 1, 1, 0)
+
+
+async def test_reassign_source_folds_into_unset_bucket(db_session):
+    """Deleting a feed moves its counters to the 'none' source."""
+    await record_changes(
+        db_session,
+        [
+            (None, ArticleState(7, "low", "marketing", "skipped")),
+            (None, ArticleState(None, None, None, None)),
+        ],
+    )
+
+    await reassign_source(db_session, 7)
+    counters = await _counters(db_session)
+
+    assert ("source", "7") not in counters
+    assert counters[("source", "none")] == (2, 1, 0, 0, 1)
+
+
+async def test_repair_stats_matches_articles_and_reports_drift(db_session):
+    """Repair recomputes counters from articles and counts drifted rows."""
+    source = FeedSource(name="Feed", url="https://example.com/feed.xml")
+    db_session.add(source)
+    await db_session.flush()
+    db_session.add_all(
+        [
+            Article(url="https://example.com/1", title="1", source_id=source.id, tier="high",
+                    category="ai_agents", feedback="approved"),
+            Article(url="https://example.com/2", title="2", source_id=source.id, tier="low",
+                    category="marketing", feedback="skipped"),
+            Article(url="https://example.com/3", title="3"),
+        ]
+    )  # fmt: skip
+    await db_session.flush()
+
+    drifted = await repair_stats(db_session)
+    counters = await _counters(db_session)
+
+    assert drifted == len(counters)  # table started empty
+    assert counters[("all", "all")] == (3, 2, 1, 1, 1)
+    assert counters[("source", str(source.id))] == (2, 2, 1, 1, 1)
+    assert counters[("source", "none")] == (1, 0, 0, 0, 0)
+    assert counters[("tier", "none")] == (1, 0, 0, 0, 0)
+    assert await repair_stats(db_session) == 0
@@ -0,0 +1,174 @@
+# ABOUTME: Tests for the durable task queue and the multi-process fetch workers.
+# ABOUTME: Covers lease claiming, visibility timeouts, retries, and draining with several processes.
+
+import asyncio
+import contextlib
+import functools
+from collections import Counter
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import func, select
+
+from feed_brain.bench import BenchConfig, SyntheticServer
+from feed_brain.config import get_settings
+from feed_brain.db.models import Article, FeedSource
+from feed_brain.models import TaskKind, TaskStatus
+from feed_brain.services.task_queue import (
+    claim,
+    complete,
+    enqueue,
+    fail,
+    has_pending,
+    heartbeat,
+    queue_counts,
+)
+
+# Claims take an explicit clock; tasks enqueued now are due at T0
+T0 = datetime.now(UTC) + timedelta(minutes=1)
+
+
+async def test_lease_is_exclusive_until_it_expires(db_session):
+    """A held task can't be claimed; once its heartbeat stops, another worker takes it over."""
+    await enqueue(db_session, [(TaskKind.FEED_POLL, "feed:1", "{}")])
+    await db_session.commit()
+
+    first = await claim(db_session, "a", 60, 3, now=T0)
+    assert first is not None and first.attempts == 1
+    assert await claim(db_session, "b", 60, 3, now=T0) is None
+    assert await heartbeat(db_session, first, 60, now=T0 + timedelta(seconds=50))
+    assert await claim(db_session, "b", 60, 3, now=T0 + timedelta(seconds=100)) is None
+
+    second = await claim(db_session, "b", 60, 3, now=T0 + timedelta(seconds=120))
+    assert second is not None and second.id == first.id and second.attempts == 2
+    # The stalled worker's writes are fenced off
+    assert not await heartbeat(db_session, first, 60)
+    assert not await complete(db_session, first)
+    assert await complete(db_session, second)
+    await db_session.commit()
+    assert await queue_counts(db_session) == {}
+
+
+async def test_failures_back_off_then_fail_until_requeued(db_session):
+    """Failed attempts retry with a growing delay; the last one parks the task as failed."""
+    await enqueue(db_session, [(TaskKind.EXTRACT, "extract:https://x/1", "{}")])
+    await db_session.commit()
+
+    task = await claim(db_session, "a", 60, 3, now=T0)
+    assert await fail(db_session, task, "boom", 3, now=T0) == TaskStatus.QUEUED
+    assert await claim(db_session, "a", 60, 3, now=T0 + timedelta(seconds=29)) is None
+    task = await claim(db_session, "a", 60, 3, now=T0 + timedelta(seconds=31))
+    assert await fail(db_session, task, "boom", 3, now=T0 + timedelta(seconds=31)) == "queued"
+    task = await claim(db_session, "a", 60, 3, now=T0 + timedelta(seconds=92))
+    assert task.attempts == 3
+    assert await fail(db_session, task, "boom", 3) == TaskStatus.FAILED
+    assert await queue_counts(db_session) == {"failed": 1}
+    assert not await has_pending(db_session)
+
+    # Enqueueing the same key again gives the task a fresh set of attempts
+    await enqueue(db_session, [(TaskKind.EXTRACT, "extract:https://x/1", "{}")])
+    await db_session.commit()
+    task = await claim(db_session, "a", 60, 3)
+    assert task is not None and task.attempts == 1
+
+
+def test_worker_processes_drain_queue_without_double_processing(tmp_path, monkeypatch):
+    """Three worker processes share the feeds and store every article exactly once."""
+    from feed_brain.db.session import close_db, get_session_factory, init_db
+    from feed_brain.services.worker import enqueue_feed_polls, run_workers
+
+    config = BenchConfig(feeds=6, articles_per_feed=5, latency_ms=5, article_bytes=2_000)
+    with SyntheticServer(config) as server:
+        monkeypatch.setenv("DB_PATH", str(tmp_path / "feed_brain.db"))
+        monkeypatch.setenv("ARCHIVE_DB_PATH", str(tmp_path / "feed_brain_archive.db"))
+        monkeypatch.setenv("MAX_ARTICLES_PER_FEED", str(config.articles_per_feed))
+        monkeypatch.setenv("WORKER_SLOTS", "2")
+        monkeypatch.setenv("WORKER_POLL_SECONDS", "0.05")
+        get_settings.cache_clear()
+
+        async def prepare():
+            await init_db()
+            async with get_session_factory()() as session:
+                session.add_all(
+                    FeedSource(name=f"Feed {i}", url=f"{server.url}/feeds/{i}.xml")
+                    for i in range(config.feeds)
+                )
+                await session.commit()
+            await enqueue_feed_polls()
+            await close_db()
+
+        async def inspect():
+            await init_db()
+            async with get_session_factory()() as session:
+                stored = await session.scalar(select(func.count()).select_from(Article))
+                counts = await queue_counts(session)
+            await close_db()
+            return stored, counts
+
+        try:
+            asyncio.run(prepare())
+            assert run_workers(3, drain=True) == [0, 0, 0]
+            stored, counts = asyncio.run(inspect())
+        finally:
+            get_settings.cache_clear()
+
+    articles = config.feeds * config.articles_per_feed
+    assert stored == articles
+    assert counts == {}
+    assert server.requests["feed"] == config.feeds
+    assert server.requests["article"] == articles
+
+
+async def test_worker_backs_off_while_database_is_locked(tmp_path, monkeypatch):
+    """A locked database during claim or fail is retried instead of killing the slot."""
+    from sqlalchemy.exc import OperationalError
+
+    from feed_brain.db.session import close_db, get_session_factory, init_db
+    from feed_brain.services import worker
+
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "feed_brain.db"))
+    monkeypatch.setenv("ARCHIVE_DB_PATH", str(tmp_path / "feed_brain_archive.db"))
+    monkeypatch.setenv("WORKER_SLOTS", "1")
+    monkeypatch.setenv("WORKER_POLL_SECONDS", "0.01")
+    get_settings.cache_clear()
+    await init_db()
+    async with get_session_factory()() as session:
+        await enqueue(session, [(TaskKind.EXTRACT, "extract:https://x/1", "{}")])
+        await session.commit()
+
+    locked = OperationalError("UPDATE tasks", {}, Exception("database is locked"))
+    calls = Counter()
+    failed = asyncio.Event()
+
+    def flaky(operation):
+        @functools.wraps(operation)
+        async def call(*args, **kwargs):
+            calls[operation.__name__] += 1
+            if calls[operation.__name__] == 1:
+                raise locked
+            result = await operation(*args, **kwargs)
+            if operation is fail:
+                failed.set()
+            return result
+
+        return call
+
+    async def broken(*_):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(worker.task_queue, "claim", flaky(claim))
+    monkeypatch.setattr(worker.task_queue, "fail", flaky(fail))
+    monkeypatch.setitem(worker.HANDLERS, TaskKind.EXTRACT, broken)
+    try:
+        slot = asyncio.create_task(worker.Worker("w", get_settings())._slot("w/0"))
+        await asyncio.wait_for(failed.wait(), 5)
+        slot.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await slot
+        async with get_session_factory()() as session:
+            counts = await queue_counts(session)
+    finally:
+        await close_db()
+        get_settings.cache_clear()
+
+    assert calls["claim"] >= 2 and calls["fail"] == 2
+    assert counts == {"queued": 1}